@@ -113,7 +113,7 @@ class FeedbackFormRepository:
 class FeedbackResponseRepository:
     @staticmethod
     def get_feedback_responses_by_user_ids(user_ids):
-        feedback_responses = FeedbackResponse.objects.filter(user_id__in=user_ids)
+        feedback_responses = FeedbackResponse.objects.filter(user_id__in=user_ids).select_related('course_feedback_entry')
         return feedback_responses
 
     @staticmethod
@@ -1,3 +1,4 @@
+import time
 from firebase_admin import auth
 from rest_framework import authentication
 from rest_framework import exceptions
@@ -5,7 +6,24 @@ from accounts.models import Student, User
 from custom_auth.repositories import UserProfileRepository
 from accounts.usecases import RoleAssignmentUsecase
 from accounts.utils import generate_password
+from django.conf import settings
 from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.utils import timezone
+from custom_auth.token_cache import CachedUser, VerifiedTokenCache
+
+verified_token_cache = VerifiedTokenCache(namespace="accounts")
+
+LAST_LOGIN_UPDATED_KEY = "last_login_updated:{user_id}"
+
+
+def update_cached_user_last_login(user_id):
+    """
+    Refreshes last_login of a user authenticated from the verified token cache, at most once every
+    LAST_LOGIN_UPDATE_INTERVAL_SECONDS. A queryset update doesn't invalidate the cached identity.
+    """
+    if cache.add(LAST_LOGIN_UPDATED_KEY.format(user_id=user_id), True, timeout=settings.LAST_LOGIN_UPDATE_INTERVAL_SECONDS):
+        User.objects.filter(id=user_id).update(last_login=timezone.now())
 
 
 class FirebaseAuthentication(authentication.BaseAuthentication):
@@ -15,6 +33,12 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
         if not id_token or id_token == "":
             return None
 
+        # A token seen before resolves to its cached identity, without verification nor queries
+        identity = verified_token_cache.get(id_token)
+        if identity is not None:
+            update_cached_user_last_login(identity["id"])
+            return (CachedUser(identity), None)
+
         try:
             decoded_token = auth.verify_id_token(id_token)
             uid = decoded_token["uid"]
@@ -33,9 +57,17 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
                 user.set_password(generate_password())
                 user.save()
             user_profile = UserProfileRepository.create_user_profile(user_id=user.id)
+            user_saved = created
             if (not user.is_student and not user.is_lecturer and not user.is_course_provider_admin) or (user.needs_role_assignment):
                 RoleAssignmentUsecase.assign_role_from_config(user)
+                user_saved = True
+            # Taken after the saves above, which invalidate the tokens of the user verified before them
+            verified_at = time.time()
+            if user_saved:
+                # Read again after verified_at, so a role change made meanwhile still invalidates the token
+                user.refresh_from_db()
             update_last_login(None, user)
+            verified_token_cache.set(id_token, user, decoded_token["exp"], verified_at)
             return (user, None)
         except Exception as e:
             print(str(e))
@@ -9,6 +9,7 @@ from accounts.models import (
 from course.repositories import BatchRepository
 from django.db.models import F
 from django.db.models import Q
+from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,6 +45,36 @@ class StudentRepository:
     def get_all_students():
         return Student.objects.all()
 
+    @staticmethod
+    def get_all_students_with_batches():
+        return Student.objects.select_related('student').prefetch_related('batches__course')
+
+    @staticmethod
+    def get_unique_student_enrollments(lecturer_id=None, course_provider_id=None):
+        """
+        One enrollment per student, in their most recently created batch, among the batches of the lecturer
+        or the courses of the course provider. Students are deduplicated by the database.
+        """
+        enrollments = Student.batches.through.objects.all()
+        if lecturer_id is not None:
+            enrollments = enrollments.filter(batch__lecturer_id=lecturer_id)
+        if course_provider_id is not None:
+            enrollments = enrollments.filter(batch__course__course_provider_id=course_provider_id)
+        return (
+            enrollments.select_related("student__student", "batch__course")
+            .order_by("student__student_id", "-batch__created_at", "-batch_id")
+            .distinct("student__student_id")
+        )
+
+    @staticmethod
+    def get_batch_memberships_by_student_ids(student_ids):
+        """
+        Returns (student_id, batch_id, course_id) for every batch the students are enrolled in
+        """
+        return Student.batches.through.objects.filter(
+            student__student_id__in=student_ids
+        ).values_list('student__student_id', 'batch_id', 'batch__course_id')
+
     @staticmethod
     def get_active_students():
         """Get all students with active status"""
@@ -272,6 +303,18 @@ class UserConfigMappingRepository:
     def bulk_create_user_config_mappings(config_mappings: list):
         return UserConfigMapping.objects.bulk_create(config_mappings)
 
+    @staticmethod
+    def bulk_update_user_config_mappings(config_mappings: list):
+        # auto_now is not applied by bulk_update
+        now = timezone.now()
+        for mapping in config_mappings:
+            mapping.updated_at = now
+        return UserConfigMapping.objects.bulk_update(config_mappings, ["config", "updated_at"])
+
+    @staticmethod
+    def get_user_config_mappings_by_emails(emails: list):
+        return UserConfigMapping.objects.filter(email__in=emails)
+
     @staticmethod
     def get_configs_by_course_code(course_code: str):
         # Match course_code exactly (between commas or at the start/end of the string)
@@ -23,6 +23,7 @@ from Feedback.repositories import FeedbackFormRepository
 import logging
 from meetings.repositories import MeetingRepository
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from custom_auth.services.custom_auth_service import CustomAuth
 from custom_auth.services.sendgrid_service import SendgridService
 from evaluation.management.register.utils import Utils
@@ -96,8 +97,9 @@ class RoleAssignmentUsecase:
     COURSE_PROVIDER_ADMIN_ROLE = "course_provider_admin"
 
     @staticmethod
-    def assign_role_from_config(user):
-        config = UserConfigMappingUsecase.get_user_config_mapping(user.email)
+    def assign_role_from_config(user, config=None):
+        if config is None:
+            config = UserConfigMappingUsecase.get_user_config_mapping(user.email)
 
         if config is None:
             return
@@ -498,78 +500,73 @@ class UserSyncUsecase:
         """
         Creates users and assigns/updates roles for all users in config mappings.
         Creates new users in Firebase if they don't exist and saves passwords to CSV.
+
+        Firebase lookups and user creation are done in bulk (get_users/import_users), Django users are created
+        with a single bulk insert (one insert per user if it conflicts) and password emails are queued on celery.
         """
+        from custom_auth.tasks import send_password_email_task
+
         try:
-            config_mappings = UserConfigMappingRepository.get_configs_for_day(
-                datetime.now().date()
+            config_mappings = list(
+                UserConfigMappingRepository.get_configs_for_day(datetime.now().date())
             )
 
             processed_users = []
             failed_users = []
-            csv_path = Path("user_credentials.csv")
-            file_exists = csv_path.exists()
+
+            emails = [mapping.email for mapping in config_mappings]
+            users_by_email = {}
+            for user in User.objects.filter(email__in=emails):
+                users_by_email.setdefault(user.email, user)
+
+            missing_emails = list(dict.fromkeys(email for email in emails if email not in users_by_email))
+            firebase_uids = CustomAuth.get_uids_by_emails(missing_emails)
+            passwords = {
+                email: Utils.generate_random_password()
+                for email in missing_emails
+                if email.lower() not in firebase_uids
+            }
+            created_uids, import_errors, existing_uids = CustomAuth.import_users(passwords)
+            # Created meanwhile by a bulk enrollment
+            firebase_uids.update({email.lower(): uid for email, uid in existing_uids.items()})
+            UserSyncUsecase._write_credentials(created_uids, passwords)
+            for email in created_uids:
+                send_password_email_task.delay(email, passwords[email])
+                logger.info(f"Queued password email to: {email}")
+
+            mappings_by_email = {mapping.email: mapping for mapping in config_mappings}
+            new_users = []
+            for email in missing_emails:
+                if email in import_errors:
+                    failed_users.append({"email": email, "error": import_errors[email]})
+                    continue
+                firebase_uid = firebase_uids.get(email.lower()) or created_uids[email]
+                config = mappings_by_email[email].config
+                new_users.append(
+                    User(
+                        email=email,
+                        username=firebase_uid,
+                        firebase_uid=firebase_uid,
+                        first_name=config.get("first_name", ""),
+                        last_name=config.get("last_name", ""),
+                    )
+                )
+            created_users, creation_errors = UserSyncUsecase._create_users(new_users)
+            for user in created_users:
+                users_by_email[user.email] = user
+            for email, error in creation_errors.items():
+                failed_users.append({"email": email, "error": error})
+                logger.error(f"Failed to create user {email}: {error}")
+            logger.info(f"Created {len(created_users)} new users")
 
             for mapping in config_mappings:
+                user = users_by_email.get(mapping.email)
+                if user is None:
+                    continue
                 try:
-                    user = User.objects.filter(email=mapping.email).first()
-
-                    if not user:
-                        try:
-                            # Try to get from Firebase first
-                            firebase_uid = CustomAuth.get_user_by_email(mapping.email)
-                            # Create user with Firebase data
-                            user = User.objects.create(
-                                email=mapping.email,
-                                username=firebase_uid,
-                                firebase_uid=firebase_uid,
-                                first_name=mapping.config.get("first_name", ""),
-                                last_name=mapping.config.get("last_name", ""),
-                            )
-                            logger.info(
-                                f"Created new user from Firebase: {mapping.email}"
-                            )
-
-                        except firebase_admin.auth.UserNotFoundError:
-                            # Generate password and create user in Firebase
-                            password = Utils.generate_random_password()
-                            firebase_uid = CustomAuth.create_user(
-                                email=mapping.email, password=password
-                            )
-
-                            # Create user in Django
-                            user = User.objects.create(
-                                email=mapping.email,
-                                username=firebase_uid,
-                                firebase_uid=firebase_uid,
-                                first_name=mapping.config.get("first_name", ""),
-                                last_name=mapping.config.get("last_name", ""),
-                            )
-
-                            # Immediately write credentials to CSV
-                            with open(csv_path, "a", newline="") as f:
-                                writer = csv.DictWriter(
-                                    f, fieldnames=["email", "password", "created_at"]
-                                )
-                                if not file_exists:
-                                    writer.writeheader()
-                                    file_exists = True
-                                writer.writerow(
-                                    {
-                                        "email": mapping.email,
-                                        "password": password,
-                                        "created_at": datetime.now().strftime(
-                                            "%Y-%m-%d %H:%M:%S"
-                                        ),
-                                    }
-                                )
-                            logger.info(f"Saved credentials for: {mapping.email}")
-                            # Send password email
-                            SendgridService.send_password_email(mapping.email, password)
-                            logger.info(f"Sent password email to: {mapping.email}")
-
                     # Assign role
                     user_profile = UserProfileRepository.create_user_profile(user_id=user.id)
-                    RoleAssignmentUsecase.assign_role_from_config(user)
+                    RoleAssignmentUsecase.assign_role_from_config(user, config=mapping.config)
                     processed_users.append(mapping.email)
                     logger.info(f"Processed role assignment for: {mapping.email}")
 
@@ -588,3 +585,44 @@ class UserSyncUsecase:
         except Exception as e:
             logger.error(f"Error in sync_users_from_config: {str(e)}")
             return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _create_users(users):
+        """
+        Creates the users with a single insert. If any of them conflicts with an existing user (e.g. username or
+        firebase_uid taken under another email), falls back to one insert per user, so only the conflicting ones fail.
+
+        Returns:
+            tuple: (created users, dict email -> error of the users which couldn't be created)
+        """
+        try:
+            with transaction.atomic():
+                return User.objects.bulk_create(users), {}
+        except IntegrityError:
+            logger.warning("Bulk user creation conflicted, creating users one by one")
+
+        created_users, errors = [], {}
+        for user in users:
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+                created_users.append(user)
+            except IntegrityError as e:
+                user.pk = None
+                errors[user.email] = str(e)
+        return created_users, errors
+
+    @staticmethod
+    def _write_credentials(emails, passwords):
+        if not emails:
+            return
+        csv_path = Path("user_credentials.csv")
+        file_exists = csv_path.exists()
+        with open(csv_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["email", "password", "created_at"])
+            if not file_exists:
+                writer.writeheader()
+            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for email in emails:
+                writer.writerow({"email": email, "password": passwords[email], "created_at": created_at})
+                logger.info(f"Saved credentials for: {email}")
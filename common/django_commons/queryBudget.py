@@ -0,0 +1,135 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    from ddtrace import tracer
+except ImportError:
+    tracer = None
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_sql_fingerprint(sql):
+    """
+    Shape of the query with parameters, literals and IN lists collapsed, so the queries issued by one
+    line of code inside a loop share a fingerprint
+    """
+    sql = _WHITESPACE_RE.sub(" ", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _STRING_RE.sub("?", sql)
+    return _NUMBER_RE.sub("?", sql)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting the queries, their total time and their fingerprints
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self._connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.monotonic() - started_at
+            self.query_count += 1
+            self.fingerprints[get_sql_fingerprint(sql)] += 1
+
+    def start(self):
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+            self._connections.append(connection)
+
+    def stop(self):
+        for connection in self._connections:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+        self._connections = []
+
+    def get_repeated_queries(self):
+        threshold = settings.QUERY_BUDGET_N_PLUS_ONE_THRESHOLD
+        return [
+            {"count": count, "sql": fingerprint[:500]}
+            for fingerprint, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+def report_queries(recorder, kind, name, budget=None):
+    """
+    Logs the queries of a request or task and tags the current trace with them. Likely N+1 patterns
+    and exceeded budgets are logged as warnings.
+    """
+    repeated_queries = recorder.get_repeated_queries()
+    summary = {
+        "kind": kind,
+        "name": name,
+        "query_count": recorder.query_count,
+        "db_time_ms": round(recorder.duration * 1000, 2),
+        "budget": budget,
+        "repeated_queries": repeated_queries,
+    }
+    over_budget = budget is not None and recorder.query_count > budget
+    if repeated_queries or over_budget:
+        logger.warning(f"query_budget {json.dumps(summary)}")
+    else:
+        logger.info(f"query_budget {json.dumps(summary)}")
+
+    span = tracer.current_root_span() if tracer else None
+    if span is not None:
+        span.set_tag("db.query_count", recorder.query_count)
+        span.set_tag("db.time_ms", summary["db_time_ms"])
+        span.set_tag("db.n_plus_one", bool(repeated_queries))
+        if repeated_queries:
+            span.set_tag("db.n_plus_one.sql", repeated_queries[0]["sql"])
+
+    if over_budget and settings.QUERY_BUDGET_ENFORCE:
+        raise QueryBudgetExceeded(
+            f"{kind} {name} made {recorder.query_count} queries, over its budget of {budget}"
+        )
+
+
+class QueryBudgetMiddleware(MiddlewareMixin):
+    """
+    Opt-in with QUERY_BUDGET_ENABLED. Budgets are set per view name in QUERY_BUDGETS, and raise
+    QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is set, as in tests.
+    """
+
+    def process_request(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return
+        request.query_recorder = QueryRecorder()
+        request.query_recorder.start()
+
+    def process_response(self, request, response):
+        recorder = getattr(request, "query_recorder", None)
+        if recorder is None:
+            return response
+        recorder.stop()
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else request.path_info
+        report_queries(
+            recorder, "request", view_name, budget=settings.QUERY_BUDGETS.get(view_name)
+        )
+        return response
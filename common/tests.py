@@ -1,3 +1,63 @@
-from django.test import TestCase
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
 
-# Create your tests here.
+from accounts.models import User
+from common.django_commons.queryBudget import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+    get_sql_fingerprint,
+)
+
+
+def count_users_view(request):
+    for _ in range(3):
+        User.objects.count()
+    return HttpResponse()
+
+
+urlpatterns = [
+    path("query-budget/", count_users_view, name="query_budget_test_view"),
+]
+
+
+@override_settings(
+    ROOT_URLCONF="common.tests",
+    QUERY_BUDGET_ENABLED=True,
+    QUERY_BUDGET_ENFORCE=True,
+    QUERY_BUDGET_N_PLUS_ONE_THRESHOLD=3,
+)
+class QueryBudgetTestCase(TestCase):
+    @override_settings(QUERY_BUDGETS={"query_budget_test_view": 2})
+    def test_view_over_its_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/query-budget/")
+
+    @override_settings(QUERY_BUDGETS={"query_budget_test_view": 3})
+    def test_view_within_its_budget_passes(self):
+        response = self.client.get("/query-budget/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_fingerprint_collapses_parameters_and_in_lists(self):
+        self.assertEqual(
+            get_sql_fingerprint("SELECT * FROM users WHERE id IN (%s, %s, %s) AND name = 'a'"),
+            get_sql_fingerprint("SELECT * FROM users   WHERE id IN (%s) AND name = 'b'"),
+        )
+
+    def test_looped_query_is_reported_as_repeated(self):
+        users = [
+            User.objects.create(username=f"user{index}", email=f"user{index}@example.com")
+            for index in range(4)
+        ]
+        recorder = QueryRecorder()
+        recorder.start()
+        try:
+            for user in users:
+                User.objects.filter(id=user.id).first()
+        finally:
+            recorder.stop()
+
+        self.assertEqual(recorder.query_count, 4)
+        self.assertEqual(len(recorder.fingerprints), 1)
+        self.assertEqual([query["count"] for query in recorder.get_repeated_queries()], [4])
@@ -7,8 +7,9 @@ from celery.signals import setup_logging
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
-from celery.signals import before_task_publish, task_prerun
+from celery.signals import before_task_publish, task_postrun, task_prerun
 from common.django_commons import local
+from common.django_commons.queryBudget import QueryRecorder, report_queries
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,10 @@ def task_sending_handler(body=None, *args, **kwargs):
     body_kwargs["user_id"] = user_id
 
 
+# Query recorders of the tasks running in this worker process, by task id
+_task_query_recorders = {}
+
+
 @task_prerun.connect
 def task_prerun_handler(*args, **kwargs):
     """
@@ -55,6 +60,20 @@ def task_prerun_handler(*args, **kwargs):
     setattr(local, "request_id", request_id)
     setattr(local, "user_id", user_id)
 
+    if settings.QUERY_BUDGET_ENABLED:
+        recorder = QueryRecorder()
+        recorder.start()
+        _task_query_recorders[kwargs.get("task_id")] = recorder
+
+
+@task_postrun.connect
+def task_postrun_handler(task_id=None, task=None, **kwargs):
+    recorder = _task_query_recorders.pop(task_id, None)
+    if recorder is None:
+        return
+    recorder.stop()
+    report_queries(recorder, "task", task.name, budget=settings.QUERY_BUDGETS.get(task.name))
+
 
 @setup_logging.connect
 def config_loggers(*args, **kwags):
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from decouple import config
 from django.utils.translation import gettext_lazy as _
 import ssl
@@ -136,6 +137,7 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "common.django_commons.queryBudget.QueryBudgetMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -145,6 +147,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
+    # Disabled, its onboarding redirect target is commented out in custom_auth/urls.py
     #'custom_auth.middleware.OnboardingMiddleware',
 ]
 
@@ -180,6 +183,9 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Connections are per thread and per greenlet. Closing them after each request or task keeps gevent workers
+        # (evaluation llm-io) at one connection per running task instead of one per greenlet ever started
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 0)),
     }
 }
 
@@ -413,6 +419,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "meetings.tasks.process_completed_meetings_task",
         "schedule": crontab(hour="*", minute=0),  # Executes every 1 hour
     },
+    "flush-buffered-page-events-every-minute": {
+        "task": "events_logger.tasks.flush_buffered_page_events",
+        "schedule": crontab(minute="*"),
+    },
+    "report-evaluation-queue-depths-every-minute": {
+        "task": "evaluation.tasks.report_evaluation_queue_depths",
+        "schedule": crontab(minute="*"),
+    },
     "process-activity-aggregations": {
         "task": "reports.tasks.process_aggregation",
         "schedule": crontab(hour=17, minute=30),  # Executes at 5:30 PM UTC (11 PM IST)
@@ -491,10 +505,74 @@ MS_TEAMS_ADMIN_UPN = config("MS_TEAMS_ADMIN_UPN")
 STORAGE_ACCOUNT_NAME = os.environ.get("STORAGE_ACCOUNT_NAME", "stspeechaistage")
 STORAGE_ACCOUNT_KEY = os.environ.get("STORAGE_ACCOUNT_KEY")
 
+# Block size and parallelism used for streaming transfers to/from azure storage
+AZURE_STORAGE_CHUNK_SIZE = int(os.environ.get("AZURE_STORAGE_CHUNK_SIZE", 4 * 1024 * 1024))
+AZURE_STORAGE_MAX_CONCURRENCY = int(os.environ.get("AZURE_STORAGE_MAX_CONCURRENCY", 4))
+
+# Load vocab lexicons and spaCy model when a celery worker process starts
+WARM_UP_VOCAB_LEXICON = os.environ.get("WARM_UP_VOCAB_LEXICON", "TRUE") == "TRUE"
+
+# Keep-alive connection pools shared by BaseRestService subclasses, per process
+REST_SERVICE_POOL_CONNECTIONS = int(os.environ.get("REST_SERVICE_POOL_CONNECTIONS", 10))
+REST_SERVICE_POOL_MAXSIZE = int(os.environ.get("REST_SERVICE_POOL_MAXSIZE", 20))
+REST_SERVICE_METRICS_LOG_INTERVAL_SECONDS = int(os.environ.get("REST_SERVICE_METRICS_LOG_INTERVAL_SECONDS", 60))
+
+# Query counts, DB time and repeated query shapes per request and celery task (opt-in)
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "FALSE") == "TRUE"
+# Raise instead of logging when a view or task goes over its budget, meant for tests
+QUERY_BUDGET_ENFORCE = os.environ.get("QUERY_BUDGET_ENFORCE", "FALSE") == "TRUE"
+# Query budgets by view name or task name, e.g. {"get_students_list": 5}
+QUERY_BUDGETS = literal_eval(os.environ.get("QUERY_BUDGETS", "{}"))
+# A query shape repeated this many times is reported as a likely N+1
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = int(os.environ.get("QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", 10))
+
+# Meeting recordings pipeline
+RECORDING_DOWNLOAD_CONCURRENCY = int(os.environ.get("RECORDING_DOWNLOAD_CONCURRENCY", 4))
+RECORDING_DOWNLOAD_MAX_ATTEMPTS = int(os.environ.get("RECORDING_DOWNLOAD_MAX_ATTEMPTS", 5))
+RECORDING_DOWNLOAD_CONNECT_TIMEOUT_SECONDS = int(os.environ.get("RECORDING_DOWNLOAD_CONNECT_TIMEOUT_SECONDS", 10))
+RECORDING_DOWNLOAD_READ_TIMEOUT_SECONDS = int(os.environ.get("RECORDING_DOWNLOAD_READ_TIMEOUT_SECONDS", 60))
+
+# Nightly reports are computed for chunks of this many students per celery task
+REPORTS_BULK_CHUNK_SIZE = int(os.environ.get("REPORTS_BULK_CHUNK_SIZE", 1000))
+REPORTS_BULK_WRITE_BATCH_SIZE = int(os.environ.get("REPORTS_BULK_WRITE_BATCH_SIZE", 1000))
+# Each incremental run re-reads rows changed this long before the previous watermark, to pick up late commits
+REPORTS_WATERMARK_OVERLAP_SECONDS = int(os.environ.get("REPORTS_WATERMARK_OVERLAP_SECONDS", 600))
+# Changes read by a single incremental run at most, a larger backlog is caught up over several runs
+REPORTS_WATERMARK_MAX_WINDOW_SECONDS = int(os.environ.get("REPORTS_WATERMARK_MAX_WINDOW_SECONDS", 7 * 24 * 3600))
+# After rebuild_reports, the first incremental run re-reads the changes of this period
+REPORTS_WATERMARK_SEED_LOOKBACK_SECONDS = int(os.environ.get("REPORTS_WATERMARK_SEED_LOOKBACK_SECONDS", 2 * 24 * 3600))
+
+# LogEvent heartbeats are buffered in redis and flushed into PageEvent periodically (opt-in, LogEvent then returns
+# no event_id)
+PAGE_EVENT_WRITE_BEHIND_ENABLED = os.environ.get("PAGE_EVENT_WRITE_BEHIND_ENABLED", "FALSE") == "TRUE"
+PAGE_EVENT_FLUSH_BATCH_SIZE = int(os.environ.get("PAGE_EVENT_FLUSH_BATCH_SIZE", 1000))
+# Renewed before every batch, so it only has to outlast the flush of a single batch
+PAGE_EVENT_FLUSH_LOCK_TIMEOUT_SECONDS = int(os.environ.get("PAGE_EVENT_FLUSH_LOCK_TIMEOUT_SECONDS", 300))
+
+# Cache of audio blobs shared by the audio processors. The audio and cpu workers mount the same directory so Pitch
+# reads the audio converted by SpeechToText, otherwise each worker only hits its own downloads
+AUDIO_ARTIFACT_CACHE_DIR = os.environ.get(
+    "AUDIO_ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "audio_artifact_cache")
+)
+AUDIO_ARTIFACT_CACHE_MAX_BYTES = int(
+    os.environ.get("AUDIO_ARTIFACT_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+)
+
 # Firebase Settings
 FIREBASE_API_KEY = os.environ["FIREBASE_API_KEY"]
 FIREBASE_UNIVERSE_DOMAIN = os.environ["FIREBASE_UNIVERSE_DOMAIN"]
 FIREBASE_ENABLED = os.environ.get("FIREBASE_ENABLED") == "TRUE"
+# Verified ID tokens are cached until they expire, a process only trusts its local copy for the TTL
+VERIFIED_TOKEN_LOCAL_CACHE_SIZE = int(os.environ.get("VERIFIED_TOKEN_LOCAL_CACHE_SIZE", 10000))
+VERIFIED_TOKEN_LOCAL_CACHE_TTL_SECONDS = int(os.environ.get("VERIFIED_TOKEN_LOCAL_CACHE_TTL_SECONDS", 30))
+# Verified tokens and revocations are only shared between processes through redis, LocMem is per process
+VERIFIED_TOKEN_SHARED_CACHE_ENABLED = CACHES["default"]["BACKEND"] == "django_redis.cache.RedisCache"
+# last_login of users authenticated from the cache is refreshed at most this often
+LAST_LOGIN_UPDATE_INTERVAL_SECONDS = int(os.environ.get("LAST_LOGIN_UPDATE_INTERVAL_SECONDS", 300))
+# Bulk enrollment provisions this many emails per chunk (firebase import_users takes up to 1000)
+BULK_ENROLLMENT_CHUNK_SIZE = int(os.environ.get("BULK_ENROLLMENT_CHUNK_SIZE", 1000))
+# Rounds of the PBKDF2 hash used for passwords of bulk imported firebase users
+FIREBASE_IMPORT_PBKDF2_ROUNDS = int(os.environ.get("FIREBASE_IMPORT_PBKDF2_ROUNDS", 10000))
 FIREBASE_ACCOUNT_TYPE = os.environ.get("FIREBASE_ACCOUNT_TYPE")
 FIREBASE_PROJECT_ID = os.environ.get("FIREBASE_PROJECT_ID")
 FIREBASE_PRIVATE_KEY_ID = os.environ.get("FIREBASE_PRIVATE_KEY_ID")
@@ -559,6 +637,11 @@ FEEDBACK_FORM_URL = os.environ.get("FEEDBACK_FORM_URL")
 
 # Word of the day cache TTL - 1 day in seconds
 WORD_OF_DAY_CACHE_TTL = 86400
+# Course modules and resources tree, invalidated by content changes. With the local memory cache other
+# processes only see a change once their copy expires
+COURSE_TREE_CACHE_TTL = int(os.environ.get("COURSE_TREE_CACHE_TTL", 600))
+# Per user live class calendar, not invalidated on changes
+LIVE_CLASS_CALENDAR_CACHE_TTL = int(os.environ.get("LIVE_CLASS_CALENDAR_CACHE_TTL", 60))
 
 
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", REDIS_URL)
@@ -600,6 +683,10 @@ TEST_EMAILS = os.environ.get("TEST_EMAILS", [])
 REPORT_SPEADSHEET_ID_WITHOUT_TEST_EMAILS = os.environ.get(
     "REPORT_SPEADSHEET_ID_WITHOUT_TEST_EMAILS"
 )
+# Row index and content hashes of synced google sheets, so unchanged rows are never re-sent
+GD_SYNC_CACHE_DIR = os.environ.get(
+    "GD_SYNC_CACHE_DIR", os.path.join(BASE_DIR, ".gd_sync_cache")
+)
 
 MEETING_PROVIDER = os.environ.get("MEETING_PROVIDER", "teams")
 # Initialize meeting service
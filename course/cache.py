@@ -0,0 +1,63 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class CourseTreeCache:
+    """
+    Versioned cache of the modules and resources tree of a course.
+
+    Trees are stored under the current version of their course. Changing the course content bumps the
+    version, so the stale tree is never read again and simply expires. Versions are random, so a version
+    key that got evicted can't bring an old tree back.
+
+    Version keys expire after COURSE_TREE_CACHE_TTL like the trees. With a per-process cache (LocMem), a
+    process which didn't handle an edit keeps its version, and answers its ETag with 304, for at most that long.
+    """
+
+    VERSION_KEY = "course_tree_version:{course_id}"
+    TREE_KEY = "course_tree:{course_id}:{version}"
+
+    @classmethod
+    def get_version(cls, course_id) -> str:
+        key = cls.VERSION_KEY.format(course_id=course_id)
+        version = cache.get(key)
+        if version is None:
+            # add() keeps the version of a concurrent request that got there first
+            cache.add(key, uuid.uuid4().hex, timeout=settings.COURSE_TREE_CACHE_TTL)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def get_etag(cls, course_id, version) -> str:
+        return f'"{course_id}-{version}"'
+
+    @classmethod
+    def get_tree(cls, course_id, version):
+        return cache.get(cls.TREE_KEY.format(course_id=course_id, version=version))
+
+    @classmethod
+    def set_tree(cls, course_id, version, tree):
+        cache.set(
+            cls.TREE_KEY.format(course_id=course_id, version=version),
+            tree,
+            timeout=settings.COURSE_TREE_CACHE_TTL,
+        )
+
+    @classmethod
+    def bump_version(cls, course_id):
+        """
+        Invalidates the cached tree once the current transaction commits, so a request can't cache the
+        content read before the commit under the new version.
+        """
+        if course_id is None:
+            return
+        transaction.on_commit(
+            lambda: cache.set(
+                cls.VERSION_KEY.format(course_id=course_id),
+                uuid.uuid4().hex,
+                timeout=settings.COURSE_TREE_CACHE_TTL,
+            )
+        )
@@ -2,11 +2,12 @@ from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import pre_save, post_delete, post_save
+from django.db.models.signals import m2m_changed, pre_delete, pre_save, post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from course.cache import CourseTreeCache
 from course.utils import unique_slug_generator
 from meetings.models import MeetingSeries, Meeting
 from storage_service.azure_storage import AzureStorageService
@@ -207,3 +208,33 @@ class UploadVideo(models.Model):
 def video_pre_save_receiver(sender, instance, **kwargs):
     if not instance.slug:
         instance.slug = unique_slug_generator(instance)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+@receiver(post_save, sender=Upload)
+@receiver(post_delete, sender=Upload)
+@receiver(post_save, sender=UploadVideo)
+@receiver(post_delete, sender=UploadVideo)
+def course_content_changed_receiver(sender, instance, **kwargs):
+    CourseTreeCache.bump_version(instance.course_id)
+
+
+@receiver(post_save, sender="evaluation.AssessmentGenerationConfig")
+@receiver(pre_delete, sender="evaluation.AssessmentGenerationConfig")
+def assessment_config_changed_receiver(sender, instance, **kwargs):
+    # pre_delete, the module links are gone after the delete
+    for course_id in set(instance.modules.values_list("course_id", flat=True)):
+        CourseTreeCache.bump_version(course_id)
+
+
+@receiver(m2m_changed, sender=Module.assignment_configs.through)
+def module_assessment_configs_changed_receiver(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        CourseTreeCache.bump_version(instance.course_id)
+        return
+    modules = instance.modules.all() if action == "pre_clear" else Module.objects.filter(id__in=pk_set)
+    for course_id in set(modules.values_list("course_id", flat=True)):
+        CourseTreeCache.bump_version(course_id)
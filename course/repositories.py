@@ -7,8 +7,10 @@ from course.models import (
     Upload,
     UploadVideo,
 )
+from accounts.models import Student
 from evaluation.models import AssessmentGenerationConfig
-from django.db.models import Prefetch, F, CharField, Value
+from meetings.models import Meeting
+from django.db.models import Prefetch, F, CharField, Value, Count, OuterRef, Subquery
 from django.db import connection
 from django.db.models.functions import Concat
 from django.db import transaction, IntegrityError
@@ -110,6 +112,18 @@ class BatchRepository:
     def get_batches_by_lecturer_id(lecturer_id):
         return Batch.objects.filter(lecturer_id=lecturer_id)
 
+    @staticmethod
+    def get_batch_rosters_by_course_id(course_id, lecturer_id=None):
+        """
+        Batches of the course with their students and users prefetched, and the students count annotated
+        """
+        batches = Batch.objects.filter(course_id=course_id)
+        if lecturer_id is not None:
+            batches = batches.filter(lecturer_id=lecturer_id)
+        return batches.annotate(students_count=Count("student")).prefetch_related(
+            Prefetch("student_set", queryset=Student.objects.select_related("student"))
+        )
+
     @staticmethod
     def set_batch_lecturer(batch_id, lecturer):
         batch = Batch.objects.get(id=batch_id)
@@ -121,6 +135,10 @@ class BatchRepository:
     def get_all_batches():
         return Batch.objects.all()
 
+    @staticmethod
+    def get_all_batches_with_student_count():
+        return Batch.objects.select_related('course').annotate(student_count=Count('student'))
+
     @staticmethod
     def get_batch_by_user_id_and_course_id(user_id, course_id):
         return Batch.objects.filter(
@@ -154,6 +172,46 @@ class LiveClassSeriesBatchAllocationRepository:
             live_class_series_id=live_class_series_id
         ).values_list("batch_id", flat=True)
 
+    @staticmethod
+    def get_live_classes_in_period(
+        start_date, end_date, student_id=None, lecturer_id=None, course_provider_admin_id=None
+    ):
+        """
+        Meetings in the period of the series allocated to the batches of the student, the lecturer or the
+        courses of the course provider admin, in a single query. Series are matched with a subquery, so
+        each meeting is returned once however many of the batches it is allocated to. The first batch
+        and course of the series are annotated.
+        """
+        allocations = LiveClassSeriesBatchAllocation.objects.all()
+        if student_id is not None:
+            allocations = allocations.filter(batch__student__student_id=student_id)
+        elif lecturer_id is not None:
+            allocations = allocations.filter(batch__lecturer_id=lecturer_id)
+        else:
+            allocations = allocations.filter(
+                batch__course__course_provider__admins__course_provider_admin_id=course_provider_admin_id
+            )
+
+        series_allocations = LiveClassSeriesBatchAllocation.objects.filter(
+            live_class_series_id=OuterRef("series_id")
+        )
+        return (
+            Meeting.objects.filter(
+                start_date__range=(start_date, end_date),
+                series_id__in=allocations.values("live_class_series_id"),
+            )
+            .select_related("series")
+            .annotate(
+                batch_title=Subquery(
+                    series_allocations.order_by("batch_id").values("batch__title")[:1]
+                ),
+                course_title=Subquery(
+                    series_allocations.order_by("batch__course_id").values("batch__course__title")[:1]
+                ),
+            )
+            .order_by("start_date", "id")
+        )
+
     @staticmethod
     def delete_live_class_series_batch_allocation(live_class_series, batch_id):
         LiveClassSeriesBatchAllocation.objects.filter(
@@ -369,6 +427,10 @@ class UploadRepository:
         resource = Upload.objects.filter(id=resource_id).first()
         return resource
 
+    @staticmethod
+    def get_existing_reading_resource_ids(resource_ids):
+        return set(Upload.objects.filter(id__in=resource_ids).values_list('id', flat=True))
+
 
 class UploadVideoRepository:
     @staticmethod
@@ -392,3 +454,7 @@ class UploadVideoRepository:
     def get_video_resource_by_id(resource_id):
         resource = UploadVideo.objects.filter(id=resource_id).first()
         return resource
+
+    @staticmethod
+    def get_existing_video_resource_ids(resource_ids):
+        return set(UploadVideo.objects.filter(id__in=resource_ids).values_list('id', flat=True))
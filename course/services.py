@@ -2,10 +2,12 @@ import pandas as pd
 from typing import Dict, List
 from django.db import transaction
 from accounts.models import UserConfigMapping
+from accounts.repositories import UserConfigMappingRepository
 from custom_auth.services.custom_auth_service import CustomAuth
 from custom_auth.services.sendgrid_service import SendgridService
 from evaluation.management.register.utils import Utils
 from course.models import Course, Batch
+from django.conf import settings
 from django.core.exceptions import ValidationError
 import logging
 import json
@@ -161,51 +163,189 @@ class LecturerEnrollmentService:
         mapping.save()
 
 class BulkEnrollmentService:
-    def __init__(self, file):
+    REQUIRED_COLUMNS = [
+        "Name",
+        "Email",
+        "College Name",
+        "Enrollment Status",
+        "Centre Name",
+        "Training Location District Name",
+        "Training Location City Name",
+        "Course Code",
+        "Batch ID",
+        "Onboarding Source",
+        "State",
+        "District",
+        "Phone",
+    ]
+
+    def __init__(self, file=None, progress_callback=None):
         self.file = file
         self.results = {"success": [], "failed": []}
+        # Called with (processed_rows, total_rows) after every chunk of emails
+        self.progress_callback = progress_callback
+        self._courses_by_code = {}
+        self._batches_by_id = {}
+
+    @staticmethod
+    def read_rows(file) -> List[Dict]:
+        """Reads the uploaded file into JSON serializable rows, NaN cells become None"""
+        df = pd.read_excel(file)
+
+        # Validate columns
+        missing_columns = [
+            col for col in BulkEnrollmentService.REQUIRED_COLUMNS if col not in df.columns
+        ]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+        return json.loads(df.to_json(orient="records"))
 
     def process(self) -> Dict:
         """Process the uploaded file and create/update user configs"""
         try:
-            df = pd.read_excel(self.file)
-            required_columns = [
-                "Name",
-                "Email",
-                "College Name",
-                "Enrollment Status",
-                "Centre Name",
-                "Training Location District Name",
-                "Training Location City Name",
-                "Course Code",
-                "Batch ID",
-                "Onboarding Source",
-                "State",
-                "District",
-                "Phone",
-            ]
+            return self.process_rows(self.read_rows(self.file))
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            raise
+
+    def process_rows(self, rows: List[Dict]) -> Dict:
+        """
+        Provisions firebase users and config mappings for all rows, in chunks of emails. Each chunk costs a
+        single mapping query, a few firebase get_users/import_users requests and one bulk write, password emails
+        are queued on celery.
+        """
+        self._prefetch_courses_and_batches(rows)
 
-            # Validate columns
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(
-                    f"Missing required columns: {', '.join(missing_columns)}"
+        configs_by_email = {}
+        for row in rows:
+            try:
+                email = row["Email"].lower().strip()
+                if not email:
+                    raise ValueError("Missing email")
+                configs_by_email.setdefault(email, []).append(self._create_config(row))
+            except Exception as e:
+                logger.error(f"Error processing row for email {row.get('Email', 'No Email')}: {str(e)}")
+                self.results["failed"].append(
+                    {"email": row.get("Email") or "No Email Found", "error": str(e)}
                 )
 
-            # Process each row
-            for _, row in df.iterrows():
-                self._process_row(row)
+        total = len(rows)
+        processed = len(self.results["failed"])
+        self._report_progress(processed, total)
 
-            return {
-                "success_count": len(self.results["success"]),
-                "failed_count": len(self.results["failed"]),
-                "success": self.results["success"],
-                "failed": self.results["failed"],
-            }
+        emails = list(configs_by_email)
+        chunk_size = settings.BULK_ENROLLMENT_CHUNK_SIZE
+        for start in range(0, len(emails), chunk_size):
+            chunk = {email: configs_by_email[email] for email in emails[start:start + chunk_size]}
+            try:
+                self._process_chunk(chunk)
+            except Exception as e:
+                logger.error(f"Error processing enrollment chunk: {str(e)}\n{traceback.format_exc()}")
+                for email, configs in chunk.items():
+                    self.results["failed"].extend({"email": email, "error": str(e)} for _ in configs)
+            processed += sum(len(configs) for configs in chunk.values())
+            self._report_progress(processed, total)
 
-        except Exception as e:
-            logger.error(f"Error processing file: {str(e)}")
-            raise
+        return {
+            "success_count": len(self.results["success"]),
+            "failed_count": len(self.results["failed"]),
+            "success": self.results["success"],
+            "failed": self.results["failed"],
+        }
+
+    def _report_progress(self, processed: int, total: int) -> None:
+        if self.progress_callback:
+            self.progress_callback(processed, total)
+
+    def _process_chunk(self, configs_by_email: Dict[str, List[Dict]]) -> None:
+        from custom_auth.tasks import send_password_email_task
+
+        emails = list(configs_by_email)
+        mappings = {
+            mapping.email: mapping
+            for mapping in UserConfigMappingRepository.get_user_config_mappings_by_emails(emails)
+        }
+        firebase_uids = CustomAuth.get_uids_by_emails(emails)
+
+        passwords = {
+            email: Utils.generate_random_password()
+            for email in emails if email.lower() not in firebase_uids
+        }
+        created_uids, import_errors, _ = CustomAuth.import_users(passwords)
+
+        credentials = []
+        for email in created_uids:
+            send_password_email_task.delay(email, passwords[email])
+            if email not in mappings:
+                credentials.append(email)
+        self._write_credentials(credentials, passwords)
+
+        to_create, to_update = [], []
+        for email, configs in configs_by_email.items():
+            if email in import_errors:
+                self.results["failed"].extend(
+                    {"email": email, "error": import_errors[email]} for _ in configs
+                )
+                continue
+
+            mapping = mappings.get(email)
+            firebase_created = email in created_uids
+            for index, config in enumerate(configs):
+                if mapping is None:
+                    # Ensure config is JSON serializable
+                    mapping = UserConfigMapping(email=email, config=json.loads(json.dumps(config)))
+                    to_create.append(mapping)
+                    message = (
+                        "Created new user with Firebase auth and config"
+                        if firebase_created
+                        else "Created user config for existing Firebase user"
+                    )
+                else:
+                    self._merge_into_mapping(mapping, config)
+                    message = (
+                        "Created Firebase user and updated config"
+                        if firebase_created and index == 0
+                        else "Updated existing user config"
+                    )
+                self.results["success"].append({"email": email, "message": message})
+            if email in mappings:
+                to_update.append(mapping)
+
+        with transaction.atomic():
+            UserConfigMappingRepository.bulk_create_user_config_mappings(to_create)
+            UserConfigMappingRepository.bulk_update_user_config_mappings(to_update)
+
+    @staticmethod
+    def _write_credentials(emails: List[str], passwords: Dict[str, str]) -> None:
+        if not emails:
+            return
+        csv_path = Path("user_creds.csv")
+        file_exists = csv_path.exists()
+
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["email", "password", "created_at"])
+            if not file_exists:
+                writer.writeheader()
+            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for email in emails:
+                writer.writerow({"email": email, "password": passwords[email], "created_at": created_at})
+
+    def _prefetch_courses_and_batches(self, rows: List[Dict]) -> None:
+        course_codes, batch_ids = set(), set()
+        for row in rows:
+            course_codes.add(str(BulkEnrollmentService.clean_value(row.get("Course Code"))))
+            batch_id = BulkEnrollmentService.clean_value(row.get("Batch ID"))
+            if isinstance(batch_id, int):
+                batch_ids.add(batch_id)
+
+        self._courses_by_code = {
+            course.code: course for course in Course.objects.filter(code__in=course_codes)
+        }
+        self._batches_by_id = {
+            batch.id: batch
+            for batch in Batch.objects.filter(id__in=batch_ids).select_related("course")
+        }
 
     # Helper function to handle NaN values
     @staticmethod
@@ -218,58 +358,7 @@ class BulkEnrollmentService:
             return int(float(value))  # Convert float to int (e.g., 1.0 -> 1)
         return str(value).strip()
 
-    @transaction.atomic
-    def _process_row(self, row: pd.Series) -> None:
-        """Process a single row from the file"""
-        try:
-            email = row["Email"].lower().strip()
-            if not email or pd.isna(email):
-                raise ValueError("Missing email")
-
-            # Create config
-            config = self._create_config(row)
-
-            # Check if user exists in UserConfigMapping
-            user_mapping = UserConfigMapping.objects.filter(email=email).first()
-
-            try:
-                # Try to get Firebase user
-                firebase_user = CustomAuth.get_user_by_email(email)
-                firebase_exists = True
-            except firebase_admin.auth.UserNotFoundError:
-                firebase_exists = False
-
-            if user_mapping and firebase_exists:
-                # User exists in both Firebase and UserConfigMapping - update config
-                self._update_existing_mapping(user_mapping, config)
-                message = "Updated existing user config"
-            elif user_mapping and not firebase_exists:
-                # User exists in UserConfigMapping but not in Firebase - create Firebase user
-                password = Utils.generate_random_password()
-                firebase_id = CustomAuth.create_user(email=email, password=password)
-                SendgridService.send_password_email(email, password)
-                self._update_existing_mapping(user_mapping, config)
-                message = "Created Firebase user and updated config"
-            elif not user_mapping and firebase_exists:
-                # User exists in Firebase but not in UserConfigMapping - create mapping
-                UserConfigMapping.objects.create(email=email, config=config)
-                message = "Created user config for existing Firebase user"
-            else:
-                # New user - create both Firebase user and UserConfigMapping
-                self._create_new_user(email, config)
-                message = "Created new user with Firebase auth and config"
-
-            self.results["success"].append({"email": email, "message": message})
-
-        except Exception as e:
-            logger.error(
-                f"Error processing row for email {row.get('Email', 'No Email')}: {str(e)}\n{traceback.format_exc()}"
-            )
-            self.results["failed"].append(
-                {"email": row.get("Email", "No Email Found"), "error": str(e)}
-            )
-
-    def _create_config(self, row: pd.Series) -> Dict:
+    def _create_config(self, row: Dict) -> Dict:
         """Create config dictionary from row data"""
         # Email validation
         email = BulkEnrollmentService.clean_value(row["Email"]).lower()
@@ -305,7 +394,7 @@ class BulkEnrollmentService:
 
         # Validate Course Code
         if course_id:
-            course = Course.objects.filter(code=course_id).first()
+            course = self._courses_by_code.get(str(course_id))
             if not course:
                 raise ValidationError(f"Invalid Course Code: {course_id}")
 
@@ -313,7 +402,7 @@ class BulkEnrollmentService:
         if batch_id:
             if not isinstance(batch_id, int):
                 raise ValidationError(f"Batch ID must be an integer, got: {batch_id}")
-            batch = Batch.objects.filter(id=batch_id).first()
+            batch = self._batches_by_id.get(batch_id)
             if not batch:
                 raise ValidationError(f"Invalid batch ID: {batch_id}")
             # Verify batch belongs to course
@@ -355,39 +444,10 @@ class BulkEnrollmentService:
             }],
         }
 
-    def _create_new_user(self, email: str, config: Dict) -> None:
-        """Create new user with Firebase auth and config mapping"""
-        password = Utils.generate_random_password()
-
-        # Create Firebase user
-        firebase_id = CustomAuth.create_user(email=email, password=password)
-        csv_path = Path("user_creds.csv")
-        file_exists = csv_path.exists()
-
-        with open(csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["email", "password", "created_at"])
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(
-                {
-                    "email": email,
-                    "password": password,
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                }
-            )
-        # Create config mapping - ensure config is JSON serializable
-        UserConfigMapping.objects.create(
-            email=email,
-            config=json.loads(json.dumps(config)),  # Ensure proper JSON serialization
-        )
-
-        # Send credentials email
-        SendgridService.send_password_email(email, password)
-
-    def _update_existing_mapping(
+    def _merge_into_mapping(
         self, mapping: UserConfigMapping, new_config: Dict
     ) -> None:
-        """Update existing user mapping with new data"""
+        """Merge new data into the config of the mapping, saved in bulk by the caller"""
         existing_config = mapping.config
 
          # Update user data
@@ -438,7 +498,7 @@ class BulkEnrollmentService:
 
         # Ensure proper JSON serialization before saving
         mapping.config = json.loads(json.dumps(existing_config))
-        mapping.save()
+
 
 
 from typing import List, Dict, Tuple
@@ -678,9 +738,12 @@ class QuestionUploader:
             download_url = f"https://drive.google.com/uc?id={file_id}"
 
             with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                response = requests.get(download_url)
-                response.raise_for_status()
-                temp_file.write(response.content)
+                with requests.get(download_url, stream=True) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(
+                        chunk_size=settings.AZURE_STORAGE_CHUNK_SIZE
+                    ):
+                        temp_file.write(chunk)
                 temp_path = temp_file.name
 
             return temp_path
@@ -694,15 +757,13 @@ class QuestionUploader:
         try:
             temp_audio_path = self.download_from_drive(gdrive_url)
 
-            with open(temp_audio_path, "rb") as file:
-                content = file.read()
-                azure_url = self.storage_service.upload_blob(
-                    container_name=self.container_name,
-                    blob_name=blob_name,
-                    content=content,
-                    content_type="audio/mpeg",
-                    overwrite=True,
-                )
+            azure_url = self.storage_service.upload_from_path(
+                container_name=self.container_name,
+                blob_name=blob_name,
+                file_path=temp_audio_path,
+                content_type="audio/mpeg",
+                overwrite=True,
+            )
 
             # Clean up temporary file
             os.unlink(temp_audio_path)
@@ -779,29 +840,17 @@ class QuestionUploader:
             "hint": "",  # Empty hint field for speaking questions
         }
 
-    def get_question_signature(self, question_data: Dict, question_type: str) -> str:
+    def get_question_signature(self, question_data: Dict, config: Dict) -> str:
         """Generate a unique signature for a question based on its content"""
-        if question_type == "reading":
-            signature = f"{question_data['paragraph']}"
-        elif question_type == "listening":
-            signature = f"{question_data.get('audio_url', '')}"
-        else:
-            signature = question_data["question"]
-        return signature.strip().lower()
-
-    def is_question_duplicate(
-        self, question_data: Dict, question_type: str, config: Dict
-    ) -> bool:
-        """Check if question already exists"""
-        signature = self.get_question_signature(question_data, question_type)
-        query = Q(
-            answer_type=config["answer_type"], sub_category=config["sub_category"]
+        return Question.compute_signature(
+            config["answer_type"], config["sub_category"], question_data
         )
-        existing_questions = Question.objects.filter(query)
 
-        return any(
-            self.get_question_signature(q.question_data, question_type) == signature
-            for q in existing_questions
+    def get_existing_signatures(self, signatures: List[str]) -> set:
+        """Signatures which already exist, looked up with a single query for the whole file"""
+        return set(
+            Question.objects.filter(signature__in=[s for s in signatures if s])
+            .values_list("signature", flat=True)
         )
 
     def upload_questions(self, file, question_type: str) -> QuestionUploadResult:
@@ -816,106 +865,62 @@ class QuestionUploader:
                 else pd.read_csv(file)
             )
             self.validate_columns(df, question_type)
-            questions_to_create = []
+
+            # (result entry, question data) of every processed question, duplicates are resolved afterwards
+            processed = []
 
             if question_type == "reading":
                 for _, group in df.groupby("Task Number"):
+                    title = f"Reading Task {group['Task Number'].iloc[0]}"
                     try:
                         question_data = self.process_reading_question(group)
-                        if self.is_question_duplicate(
-                            question_data, question_type, config
-                        ):
-                            result.successful.append(
-                                {
-                                    "title": f"Reading Task {group['Task Number'].iloc[0]}",
-                                    "status": "duplicate",
-                                }
-                            )
-                        else:
-                            questions_to_create.append(
-                                self.create_question_object(question_data, config)
-                            )
-                            result.successful.append(
-                                {
-                                    "title": f"Reading Task {group['Task Number'].iloc[0]}",
-                                    "status": "created",
-                                }
-                            )
+                        processed.append(({"title": title}, question_data))
                     except Exception as e:
-                        result.failed.append(
-                            {
-                                "title": f"Reading Task {group['Task Number'].iloc[0]}",
-                                "reason": str(e),
-                            }
-                        )
+                        result.failed.append({"title": title, "reason": str(e)})
 
             elif question_type == "listening":
                 for audio_url, group in df.groupby("Audio Link"):
+                    title = f"Listening Audio {audio_url}"
                     try:
                         question_data = self.process_listening_question(group)
-                        if self.is_question_duplicate(
-                            question_data, question_type, config
-                        ):
-                            result.successful.append(
-                                {
-                                    "title": f"Listening Audio {audio_url}",
-                                    "question_count": len(group),
-                                    "status": "duplicate",
-                                }
-                            )
-                        else:
-                            questions_to_create.append(
-                                self.create_question_object(question_data, config)
-                            )
-                            result.successful.append(
-                                {
-                                    "title": f"Listening Audio {audio_url}",
-                                    "question_count": len(group),
-                                    "status": "created",
-                                }
-                            )
-                    except Exception as e:
-                        result.failed.append(
-                            {"title": f"Listening Audio {audio_url}", "reason": str(e)}
+                        processed.append(
+                            ({"title": title, "question_count": len(group)}, question_data)
                         )
+                    except Exception as e:
+                        result.failed.append({"title": title, "reason": str(e)})
 
             else:
+                processor = getattr(self, f"process_{question_type}_question")
                 for idx, row in df.iterrows():
                     try:
-                        processor = getattr(self, f"process_{question_type}_question")
                         question_data = processor(row)
-                        if self.is_question_duplicate(
-                            question_data, question_type, config
-                        ):
-                            result.successful.append(
-                                {
-                                    "title": row["Question"],
-                                    "status": "duplicate",
-                                }
-                            )
-                        else:
-                            questions_to_create.append(
-                                self.create_question_object(question_data, config)
-                            )
-                            result.successful.append(
-                                {
-                                    "title": row["Question"],
-                                    "status": "created",
-                                }
-                            )
+                        processed.append(({"title": row["Question"]}, question_data))
                     except Exception as e:
                         result.failed.append(
                             {"title": row["Question"], "reason": str(e)}
                         )
 
-            # Bulk create questions and update IDs for only non-duplicate entries
+            signatures = [
+                self.get_question_signature(question_data, config)
+                for _, question_data in processed
+            ]
+            # Also covers questions repeated within the file, only the first occurrence is created
+            seen_signatures = self.get_existing_signatures(signatures)
+            questions_to_create = []
+            for (entry, question_data), signature in zip(processed, signatures):
+                if signature and signature in seen_signatures:
+                    result.successful.append({**entry, "status": "duplicate"})
+                    continue
+                if signature:
+                    seen_signatures.add(signature)
+                questions_to_create.append(
+                    self.create_question_object(question_data, config, signature)
+                )
+                result.successful.append({**entry, "status": "created"})
+
+            # Bulk create questions for only non-duplicate entries
             if questions_to_create:
-                created_questions = Question.objects.bulk_create(questions_to_create)
-                created_idx = 0
-                for i in range(len(result.successful)):
-                    if result.successful[i]["status"] == "created":
-                        # result.successful[i]["id"] = created_questions[created_idx].id
-                        created_idx += 1
+                Question.objects.bulk_create(questions_to_create)
 
         except Exception as e:
             logger.error(f"Error processing file: {str(e)}")
@@ -923,7 +928,9 @@ class QuestionUploader:
 
         return result
 
-    def create_question_object(self, question_data: Dict, config: Dict) -> Question:
+    def create_question_object(
+        self, question_data: Dict, config: Dict, signature: str = None
+    ) -> Question:
         return Question(
             answer_type=config["answer_type"],
             question_data=question_data,
@@ -932,4 +939,6 @@ class QuestionUploader:
             audio_url=question_data.get("audio_url", None),
             time_required=self.default_time,
             tags=[],
+            # bulk_create doesn't call save(), which sets it otherwise
+            signature=signature or self.get_question_signature(question_data, config),
         )
@@ -23,4 +23,19 @@ def create_attendance_records_task(self, meeting_id):
         logger.info(f"Successfully created attendance records for meeting {meeting_id}")
     except Exception as e:
         logger.error(f"Error creating attendance records for meeting {meeting_id}: {str(e)}")
-        raise self.retry(exc=e)
\ No newline at end of file
+        raise self.retry(exc=e)
+
+@shared_task(bind=True, queue='course_queue')
+def bulk_enroll_students_task(self, rows):
+    """Celery task to provision the students of a bulk enrollment file, reporting progress in the task state"""
+    from course.services import BulkEnrollmentService
+
+    def report_progress(processed, total):
+        self.update_state(state="PROGRESS", meta={"processed": processed, "total": total})
+
+    service = BulkEnrollmentService(progress_callback=report_progress)
+    result = service.process_rows(rows)
+    logger.info(
+        f"Bulk enrollment completed. Success: {result['success_count']}, failed: {result['failed_count']}"
+    )
+    return result
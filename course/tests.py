@@ -1,3 +1,67 @@
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import CourseProvider, CourseProviderAdmin, Student, User
+from course.models import Batch, Course
+from course.usecases import BatchUseCase
+
+
+class BatchRosterQueryCountTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create(
+            username="provider_admin", email="admin@example.com", is_course_provider_admin=True
+        )
+        self.lecturer = User.objects.create(
+            username="lecturer", email="lecturer@example.com", is_lecturer=True
+        )
+        course_provider = CourseProvider.objects.create(name="Provider")
+        course_provider.admins.add(
+            CourseProviderAdmin.objects.create(course_provider_admin=self.admin)
+        )
+        self.course = Course.objects.create(
+            title="Course", code="COURSE", course_provider=course_provider
+        )
+        self.student_count = 0
+
+    def add_batch(self, students_per_batch):
+        batch = Batch.objects.create(
+            title="Batch", course=self.course, lecturer=self.lecturer
+        )
+        for _ in range(students_per_batch):
+            self.student_count += 1
+            user = User.objects.create(
+                username=f"student{self.student_count}",
+                email=f"student{self.student_count}@example.com",
+                is_student=True,
+            )
+            Student.objects.create(student=user).batches.add(batch)
+        return batch
+
+    def test_batches_by_course_id_query_count_does_not_grow_with_batches(self):
+        self.add_batch(students_per_batch=2)
+        with self.assertNumQueries(2):
+            batches = BatchUseCase.get_batches_by_course_id(self.admin, self.course.id)
+        self.assertEqual(batches[0]["students_count"], 2)
+
+        for _ in range(3):
+            self.add_batch(students_per_batch=5)
+        with self.assertNumQueries(2):
+            batches = BatchUseCase.get_batches_by_course_id(self.admin, self.course.id)
+        self.assertEqual(sum(len(batch["students"]) for batch in batches), 17)
+
+    def test_students_for_lecturer_query_count_does_not_grow_with_batches(self):
+        for _ in range(4):
+            self.add_batch(students_per_batch=5)
+        with self.assertNumQueries(1):
+            students = BatchUseCase.get_students_for_lecturer_or_provider(self.lecturer)
+        self.assertEqual(len(students), 20)
+
+    def test_students_for_provider_are_deduplicated(self):
+        first_batch = self.add_batch(students_per_batch=3)
+        second_batch = self.add_batch(students_per_batch=3)
+        for student in Student.objects.filter(batches=first_batch):
+            student.batches.add(second_batch)
+
+        students = BatchUseCase.get_students_for_lecturer_or_provider(self.admin)
+
+        self.assertEqual(len(students), 6)
+        self.assertEqual({student["batch_id"] for student in students}, {second_batch.id})
@@ -6,6 +6,7 @@ from accounts.repositories import (
 )
 from accounts.models import Student
 from config import settings
+from course.cache import CourseTreeCache
 from course.models import Batch, LiveClassSeriesBatchAllocation
 from course.repositories import (
     BatchRepository,
@@ -24,16 +25,17 @@ from .exceptions import CourseContentDriveException
 import os
 import logging
 import re
+import tempfile
 from urllib.parse import urlparse
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
-import io
 from evaluation.management.generate_status_sheet.gd_wrapper import GDWrapper
 from course.models import Course, Module, Upload, UploadVideo
 from storage_service.azure_storage import AzureStorageService
 from telegram_bot.repositories import TelegramChatDataRepository
 from notifications_manager.usecases import NotificationManagerUsecase
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import datetime
 
@@ -179,38 +181,56 @@ class LiveClassUsecase:
     @staticmethod
     def get_live_classes_in_period_for_lecturer_or_student(user, start_date, end_date):
         if user.is_student:
-            # Get all the batches of the student
-            batches = StudentRepository.get_batches_by_student_id(user.id)
+            filters = {"student_id": user.id}
         elif user.is_lecturer:
-            batches = BatchRepository.get_batches_by_lecturer_id(user.id)
+            filters = {"lecturer_id": user.id}
         elif user.is_course_provider_admin:
-            course_provider = CourseProviderRepository.get_course_provider_by_user_id(
-                user.id
-            ).id
-            courses = CourseUseCase.get_courses_by_course_provider(course_provider)
-            batches = []
-            for course in courses:
-                batch_queryset = BatchRepository.get_batches_by_course_id(
-                    course.get("id")
-                )
-                if batch_queryset.exists():  # Check if there are any batches
-                    for batch in batch_queryset:  # Iterate over each batch
-                        batches.append(batch)
+            filters = {"course_provider_admin_id": user.id}
         else:
             # This is not in the requirements currently
             return []
-        live_classes = []
-        # Get the live classes of the batches in the given period
-        for batch in batches:
-            live_classes.extend(
-                LiveClassSeriesBatchAllocationUseCase.get_live_classes_of_batch_in_period(
-                    batch.id, start_date, end_date
-                )
+
+        # Calendars are re-requested on every navigation, a short TTL keeps edits visible soon enough
+        cache_key = f"live_class_calendar:{user.id}:{start_date}:{end_date}"
+        live_classes = cache.get(cache_key)
+        if live_classes is None:
+            meetings = LiveClassSeriesBatchAllocationRepository.get_live_classes_in_period(
+                start_date, end_date, **filters
             )
-        # Convert to set of tuples for deduplication, then back to list of dicts
-        # This is to remove duplicate live classes
-        unique_tuples = {tuple(meeting.items()) for meeting in live_classes}
-        return [dict(t) for t in unique_tuples]
+            live_classes = [
+                LiveClassUsecase._get_calendar_entry(meeting) for meeting in meetings
+            ]
+            cache.set(
+                cache_key, live_classes, timeout=settings.LIVE_CLASS_CALENDAR_CACHE_TTL
+            )
+        return live_classes
+
+    @staticmethod
+    def _get_calendar_entry(meeting):
+        # Same shape as MeetingUsecase.get_meetings_of_series_in_period, batch and course are annotated
+        return {
+            "type": 0,
+            "title": meeting.series.title,
+            "meeting_id": meeting.id,
+            "series_id": meeting.series_id,
+            "start_date": meeting.start_date,
+            "start_timestamp": meeting.start_time,
+            "end_timestamp": meeting.end_time,
+            "link": meeting.link,
+            "provider": f"{meeting.provider.capitalize()} Meeting",
+            "start_time": (
+                meeting.start_time_override
+                if meeting.start_time_override
+                else meeting.series.start_time
+            ),
+            "duration": (
+                meeting.duration_override
+                if meeting.duration_override
+                else meeting.series.duration
+            ),
+            "batch": meeting.batch_title,
+            "course": meeting.course_title,
+        }
 
 
 class LiveClassSeriesPresenterAssignmentUseCase:
@@ -382,91 +402,70 @@ class BatchUseCase:
 
     @staticmethod
     def get_batches_by_course_id(user, course_id):
-        batches = BatchRepository.get_batches_by_course_id(course_id)
+        batches = BatchRepository.get_batch_rosters_by_course_id(
+            course_id, lecturer_id=user.id if user.is_lecturer else None
+        )
 
         # Convert to a list of dictionaries, including students
         batches_with_students = []
         for batch in batches:
-            # Get all students for this batch
-            students = []
-            for student in batch.students.all():
-                student_data = {
+            students = [
+                {
                     "id": student.student.id,
                     "name": f"{student.student.first_name} {student.student.last_name}",
                     "email": student.student.email,
                     "status": student.status_string,
                     "enrollment_date": batch.created_at
                 }
-                students.append(student_data)
-
-            batch_data = {
-                "id": batch.id,
-                "title": batch.title,
-                "course_id": batch.course_id,
-                "lecturer_id": batch.lecturer_id,
-                "start_date": batch.created_at,
-                "students_count": len(batch.students.values()),  # Get student data
-                "students": students,
-            }
-            batches_with_students.append(batch_data)
-        if user.is_lecturer:
-            if user.is_lecturer:
-                batches_with_students = [
-                    batch
-                    for batch in batches_with_students
-                    if batch["lecturer_id"] == user.id
-                ]
+                for student in batch.student_set.all()
+            ]
+            batches_with_students.append(
+                {
+                    "id": batch.id,
+                    "title": batch.title,
+                    "course_id": batch.course_id,
+                    "lecturer_id": batch.lecturer_id,
+                    "start_date": batch.created_at,
+                    "students_count": batch.students_count,
+                    "students": students,
+                }
+            )
 
         return batches_with_students
 
     @staticmethod
     def get_students_for_lecturer_or_provider(user):
-        students_data = []
-
         if user.is_lecturer:
-            # Get all batches where user is the lecturer
-            batches = BatchRepository.get_batches_by_lecturer_id(user.id)
+            # Students of the batches where user is the lecturer
+            enrollments = StudentRepository.get_unique_student_enrollments(lecturer_id=user.id)
         elif user.is_course_provider_admin:
-            # Get course provider ID
             course_provider = CourseProviderRepository.get_course_provider_by_user_id(
                 user.id
             )
-            # Get all courses for this provider
-            courses = CourseRepository.get_courses_by_course_provider(
-                course_provider.id
+            if course_provider is None:
+                return []
+            # Students of the batches of all the courses of the provider
+            enrollments = StudentRepository.get_unique_student_enrollments(
+                course_provider_id=course_provider.id
             )
-            # Get all batches for these courses
-            batches = []
-            for course in courses:
-                batch_queryset = BatchRepository.get_batches_by_course_id(course.id)
-                batches.extend(batch_queryset)
         else:
             return []
 
-        # Process each batch to get student information
-        for batch in batches:
-            for student in batch.students.all():
-                student_data = {
-                    "id": student.student.id,
-                    "name": f"{student.student.first_name} {student.student.last_name}",
-                    "email": student.student.email,
-                    "status": student.status_string,
-                    "batch_id": batch.id,
-                    "batch_title": batch.title,
-                    "course_id": batch.course.id,
-                    "course_title": batch.course.title,
-                    "enrollment_date": batch.created_at,
-                    "last_login": (
-                        student.student.last_login
-                        if student.student.last_login
-                        else None
-                    ),
-                }
-                students_data.append(student_data)
-
-        # Remove duplicates based on student ID
-        unique_students = {student["id"]: student for student in students_data}.values()
-        return list(unique_students)
+        return [
+            {
+                "id": enrollment.student.student.id,
+                "name": f"{enrollment.student.student.first_name} {enrollment.student.student.last_name}",
+                "email": enrollment.student.student.email,
+                "status": enrollment.student.status_string,
+                "batch_id": enrollment.batch.id,
+                "batch_title": enrollment.batch.title,
+                "course_id": enrollment.batch.course.id,
+                "course_title": enrollment.batch.course.title,
+                "enrollment_date": enrollment.batch.created_at,
+                "last_login": enrollment.student.student.last_login,
+            }
+            for enrollment in enrollments
+        ]
 
     @staticmethod
     def add_students_to_batch(batch_id, student_ids):
@@ -507,7 +506,23 @@ class CourseUseCase:
         else:
             return None, "user"
 
-    def get_modules_by_course_id(course_id):
+    def get_modules_by_course_id(course_id, version=None):
+        """
+        Returns the modules tree of the course, from the course tree cache when the content didn't change
+        """
+        if version is None:
+            version = CourseTreeCache.get_version(course_id)
+        module_data = CourseTreeCache.get_tree(course_id, version)
+        if module_data is None:
+            module_data = CourseUseCase._build_modules_tree(course_id)
+            CourseTreeCache.set_tree(course_id, version, module_data)
+        return module_data
+
+    def get_modules_etag(course_id):
+        version = CourseTreeCache.get_version(course_id)
+        return version, CourseTreeCache.get_etag(course_id, version)
+
+    def _build_modules_tree(course_id):
         modules = ModuleRepository.get_module_details_by_course_id(course_id)
         module_data = []
         for module in modules:
@@ -833,17 +848,17 @@ class CourseContentDriveUsecase:
             mime_type = file_metadata.get("mimeType", "application/octet-stream")
 
             request = drive_service.files().get_media(fileId=file["id"])
-            file_content = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_content, request)
-
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                local_path = os.path.join(temp_dir, "drive_file")
+                with open(local_path, "wb") as local_file:
+                    downloader = MediaIoBaseDownload(
+                        local_file, request, chunksize=settings.AZURE_STORAGE_CHUNK_SIZE
+                    )
+                    done = False
+                    while not done:
+                        _, done = downloader.next_chunk()
 
-            file_content.seek(0)
-            return self._upload_to_blob(
-                file_content, file["name"], file_path, mime_type
-            )
+                return self._upload_file_to_blob(local_path, file_path, mime_type)
         except Exception as e:
             raise CourseContentDriveException.DriveFileUploadException(file["name"], e)
 
@@ -879,16 +894,16 @@ class CourseContentDriveUsecase:
         results = drive_service.files().list(q=query).execute()
         return results.get("files", [])
 
-    def _upload_to_blob(self, file_content, filename, blob_path, content_type):
-        """Upload file to Azure Blob Storage with content type"""
+    def _upload_file_to_blob(self, local_path, blob_path, content_type):
+        """Stream a local file to Azure Blob Storage with content type"""
         logging.info(
             f"Uploading file to blob storage: {blob_path} with content type: {content_type}"
         )
-        blob_url = self.storage_service.upload_blob(
+        blob_url = self.storage_service.upload_from_path(
             container_name=settings.AZURE_STORAGE_COURSE_MATERIALS_CONTAINER_NAME,
             blob_name=blob_path,
-            content=file_content,
-            content_type=content_type,  # Pass the content type to Azure
+            file_path=local_path,
+            content_type=content_type,
             overwrite=True,
         )
         logging.info(f"Uploaded file to blob storage: {blob_url}")
@@ -53,6 +53,8 @@ from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
 from .services import BulkEnrollmentService, AssessmentConfigGenerator, QuestionUploader, LecturerEnrollmentService
+from .tasks import bulk_enroll_students_task
+from celery.result import AsyncResult
 from rest_framework import serializers
 from evaluation.usecases import AssessmentUseCase
 from datetime import timedelta
@@ -390,13 +392,23 @@ def get_courses_by_course_provider_id(request, course_provider_id):
 @authentication_classes([FirebaseAuthentication])
 @permission_classes([IsLoggedIn])
 def get_modules_and_resources_by_course_id(request, course_id):
-    module_data = CourseUseCase.get_modules_by_course_id(course_id)
+    version, etag = CourseUseCase.get_modules_etag(course_id)
+    # Students poll the tree on every page load, unchanged content is answered without a body
+    if_none_match = request.headers.get("If-None-Match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    module_data = CourseUseCase.get_modules_by_course_id(course_id, version=version)
     if not module_data:
         return Response(
             {"error": "No modules found for the given course ID."},
             status=status.HTTP_404_NOT_FOUND,
         )
-    return Response({"module_data": module_data}, status=status.HTTP_200_OK)
+    return Response(
+        {"module_data": module_data},
+        status=status.HTTP_200_OK,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
 
 
 @api_view(["GET"])
@@ -646,27 +658,59 @@ class BulkEnrollmentView(APIView):
 
         try:
             file = serializer.validated_data["file"]
-            service = BulkEnrollmentService(file)
-            result = service.process()
+            rows = BulkEnrollmentService.read_rows(file)
+            task = bulk_enroll_students_task.delay(rows)
+
+            return Response(
+                {
+                    "message": "Bulk enrollment started",
+                    "data": {"task_id": task.id, "total": len(rows)},
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        except Exception as e:
+            return Response(
+                {"error": f"Failed to process file: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+
+class BulkEnrollmentStatusView(APIView):
+    authentication_classes = [FirebaseAuthentication]
+    permission_classes = [IsLoggedIn, IsCourseProviderAdmin]
+
+    def get(self, request, task_id, *args, **kwargs):
+        task = AsyncResult(task_id)
+
+        if task.state == "SUCCESS":
+            result = task.result
             return Response(
                 {
-                    "message": "Bulk enrollment processed successfully",
+                    "status": task.state,
                     "data": {
                         "success_count": result["success_count"],
                         "failed_count": result["failed_count"],
-                        "success": result["success"],  # Limit success examples
+                        "success": result["success"],
                         "failures": result["failed"],  # Show all failures for debugging
                     },
                 },
                 status=status.HTTP_200_OK,
             )
-
-        except Exception as e:
+        if task.state == "FAILURE":
             return Response(
-                {"error": f"Failed to process file: {str(e)}"},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"status": task.state, "error": f"Failed to process file: {str(task.result)}"},
+                status=status.HTTP_200_OK,
             )
+        # PENDING (or unknown task id), STARTED or PROGRESS
+        progress = task.info if isinstance(task.info, dict) else {}
+        return Response(
+            {
+                "status": task.state,
+                "data": {"processed": progress.get("processed", 0), "total": progress.get("total")},
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 class LecturerBulkEnrollmentView(APIView):
@@ -1,5 +1,6 @@
 from channels.db import database_sync_to_async
 import logging
+import time
 import typing
 import json
 from django.contrib.auth import get_user_model
@@ -11,6 +12,7 @@ from rest_framework.permissions import BasePermission
 from custom_auth import exceptions
 from common.django_commons import local
 from custom_auth.usecases import BetaUserlistUsecase
+from custom_auth.token_cache import CachedUser, VerifiedTokenCache
 from .repositories import UserProfileRepository
 
 # from DoubtSolving.usecases import ValidateApiKeyUseCase,ValidateUserKeyUseCase
@@ -20,6 +22,8 @@ logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+verified_token_cache = VerifiedTokenCache(namespace="custom_auth")
+
 # class APIKeyAuthentication(BaseAuthentication):
 #     """API BASED Authentication for Django Rest Framework"""
 #     def authenticate(self, request):
@@ -70,7 +74,7 @@ class FirebaseAuthentication(BaseAuthentication):
     """Custom Firebase Authentication for Django Rest Framework"""
 
     @classmethod
-    def get_uid_and_email_from_headers(
+    def get_id_token_from_headers(
         cls, headers_dict: typing.Dict, access_point: str = None
     ):
 
@@ -111,6 +115,10 @@ class FirebaseAuthentication(BaseAuthentication):
                 logger.warning("Invalid auth token - Token type is not 'Bearer'")
                 raise exceptions.InvalidAuthToken("Token type is not 'Bearer'")
 
+        return id_token
+
+    @classmethod
+    def verify_id_token(cls, id_token):
         # Decode the Firebase ID token
         decoded_token = None
         try:
@@ -135,13 +143,42 @@ class FirebaseAuthentication(BaseAuthentication):
 
         # Get the UID of the user
         try:
-            uid = decoded_token["uid"]
+            decoded_token["uid"]
         except Exception as exp:
             logger.warning(f"An error occurred during authentication: {str(exp)}")
             raise exceptions.FirebaseError()
 
+        return decoded_token
+
+    @classmethod
+    def get_uid_and_email_from_headers(
+        cls, headers_dict: typing.Dict, access_point: str = None
+    ):
+        id_token = cls.get_id_token_from_headers(headers_dict, access_point)
+        decoded_token = cls.verify_id_token(id_token)
+        return decoded_token["uid"], decoded_token.get("email", "")
+
+    @classmethod
+    def get_user_for_token(cls, id_token, on_user_created=None):
+        """
+        Resolves the user of the token, from the verified token cache when the token was seen before
+        """
+        identity = verified_token_cache.get(id_token)
+        if identity is not None:
+            return CachedUser(identity)
+
+        verified_at = time.time()
+        decoded_token = cls.verify_id_token(id_token)
+        uid = decoded_token["uid"]
         email = decoded_token.get("email", "")
-        return uid, email
+        # Get or create the user based on the UID
+        user, created = User.objects.get_or_create(
+            username=uid, defaults={"email": email}
+        )
+        if created and on_user_created:
+            on_user_created(user, email)
+        verified_token_cache.set(id_token, user, decoded_token["exp"], verified_at)
+        return user
 
     def authenticate(self, request):
         """Authenticate the request using Firebase token"""
@@ -153,73 +190,37 @@ class FirebaseAuthentication(BaseAuthentication):
         - ref https://github.com/encode/django-rest-framework/discussions/7770#discussioncomment-6943405
         """
         # Get the authorization token from the request header
-        headers_dict = request.headers
-        uid, email = self.get_uid_and_email_from_headers(headers_dict)
-        # Get or create the user based on the UID
-        user, created = User.objects.get_or_create(
-            username=uid, defaults={"email": email}
-        )
-        if created:
-            UserProfileRepository.create_user_profile(user_id=user.id)
-            BetaUserlistUsecase.mark_onboarding_complete_if_whitelisted_user(
-                email=email, user_id=user.id
-            )
-            BetaUserlistUsecase.mark_onboarding_complete_and_assign_institue_if_in_institue_student_list(
-                email=email, user_id=user.id
-            )
-            # BetaUserlistUsecase.mark_onboarding_complete_for_user_if_not(
-            #     email=email, user_id=user.id)
-            # BetaUserlistUsecase.assign_institute_based_on_email_domain(
-            #     email=email, user_id=user.id)
+        id_token = self.get_id_token_from_headers(request.headers)
+        user = self.get_user_for_token(id_token, on_user_created=self._on_user_created)
         local.user_id = user.id
         logger.info(f"Request made. url = {request.path} ")
         return user, None
 
-    def authenticate_token(token):
-        try:
-            decoded_token = auth.verify_id_token(token)
-        except auth.ExpiredIdTokenError:
-            logger.warning("Expired auth token")
-            raise exceptions.InvalidAuthToken("Expired auth token")
-        except auth.InvalidIdTokenError:
-            logger.warning("Invalid auth token")
-            raise exceptions.InvalidAuthToken("Invalid auth token")
-        except auth.CertificateFetchError:
-            logger.warning("Firebase authentication failed")
-            raise exceptions.FirebaseAuthenticationFailed()
-        except Exception as exp:
-            logger.warning(f"An error occurred during authentication: {str(exp)}")
-            raise exceptions.FirebaseError()
-
-        # Return None if the token or decoded token is invalid
-        if not decoded_token:
-            logger.warning("Invalid Decoded Token")
-            return None
-
-        # Get the UID of the user
-        try:
-            uid = decoded_token["uid"]
-        except Exception as exp:
-            logger.warning(f"An error occurred during authentication: {str(exp)}")
-            raise exceptions.FirebaseError()
-
-        email = decoded_token.get("email", "")
-        # Get or create the user based on the UID
-        user, created = User.objects.get_or_create(
-            username=uid, defaults={"email": email}
+    @staticmethod
+    def _on_user_created(user, email):
+        UserProfileRepository.create_user_profile(user_id=user.id)
+        BetaUserlistUsecase.mark_onboarding_complete_if_whitelisted_user(
+            email=email, user_id=user.id
         )
+        BetaUserlistUsecase.mark_onboarding_complete_and_assign_institue_if_in_institue_student_list(
+            email=email, user_id=user.id
+        )
+        # BetaUserlistUsecase.mark_onboarding_complete_for_user_if_not(
+        #     email=email, user_id=user.id)
+        # BetaUserlistUsecase.assign_institute_based_on_email_domain(
+        #     email=email, user_id=user.id)
 
-        return user, None
+    def authenticate_token(token):
+        return FirebaseAuthentication.get_user_for_token(token), None
 
 
 @database_sync_to_async
 def get_user(headers_dict: typing.Dict):
-    uid, email = FirebaseAuthentication.get_uid_and_email_from_headers(
+    id_token = FirebaseAuthentication.get_id_token_from_headers(
         headers_dict, access_point="websocket"
     )
-    user, created = User.objects.get_or_create(username=uid, defaults={"email": email})
     # user = User.objects.get(id=1)
-    return user
+    return FirebaseAuthentication.get_user_for_token(id_token)
 
 
 class FirebaseAuthMiddleware:
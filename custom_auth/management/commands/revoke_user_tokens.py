@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from custom_auth.services.custom_auth_service import CustomAuth
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Command to revoke the firebase sessions and cached tokens of users, optionally deactivating them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("emails", nargs="+")
+        parser.add_argument(
+            "--deactivate",
+            action="store_true",
+            help="Also mark the users as inactive",
+        )
+
+    def handle(self, *args, **options):
+        emails = options["emails"]
+        users = list(User.objects.filter(email__in=emails))
+        missing_emails = set(emails) - {user.email for user in users}
+        if missing_emails:
+            raise CommandError(f"Users not found - {', '.join(sorted(missing_emails))}")
+
+        for user in users:
+            if options["deactivate"] and user.is_active:
+                user.is_active = False
+                user.save(update_fields=["is_active"])
+            CustomAuth.revoke_tokens(user)
+            self.stdout.write(f"Revoked tokens of {user.email}")
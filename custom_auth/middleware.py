@@ -4,10 +4,17 @@ from .repositories import UserProfileRepository
 from django.utils.deprecation import MiddlewareMixin
 
 class OnboardingMiddleware(MiddlewareMixin):
+    """
+    Redirects students who haven't completed onboarding to the onboarding page.
+
+    Not installed in MIDDLEWARE: the onboarding url it redirects to is disabled, so enabling it needs that
+    route back first.
+    """
+
     def process_request(self, request):
         if request.user.is_authenticated and request.user.is_student:
                 user_profile = UserProfileRepository.get(request.user.id)
-                if not user_profile.onboarding_complete:
+                if user_profile is None or not user_profile.onboarding_complete:
                     # Check if the current path is not the onboarding path
                     if request.path_info != reverse('onboarding'):
                         return redirect('onboarding')
@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from datetime import date
 import random
 import uuid
 
+from custom_auth.token_cache import VerifiedTokenCache
+
 # from InstituteConfiguration.models import Institute
 
 User = get_user_model()
@@ -58,3 +62,12 @@ class UserProfile (models.Model):
     def get_user_details_for_memgpt(self) -> str:
         return f"name={self.name}, email={self.email}, age={self.age}, gender={self.gender}, " \
                f"languages={self.languages}, city={self.city}, country={self.country}, interests={self.interests}"
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_verified_tokens_receiver(sender, instance, update_fields=None, **kwargs):
+    # Roles and activation are read from the verified token cache, last login updates don't change them
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    VerifiedTokenCache.invalidate_user(instance.id)
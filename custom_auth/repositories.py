@@ -166,7 +166,7 @@ class UserProfileRepository:
 
     @staticmethod
     def get_all_profiles_for_user_ids(user_ids):
-        return UserProfile.objects.filter(user_id__in=user_ids)
+        return UserProfile.objects.filter(user_id__in=user_ids).select_related('user_id')
 
     @staticmethod
     def get(user_id: str):
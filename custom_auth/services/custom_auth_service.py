@@ -1,11 +1,15 @@
 # myapp/services/firebase_service.py
 
+import hashlib
 import os
+import uuid
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.db import connection
 from firebase_admin import credentials, auth
 from firebase_admin import initialize_app
 from firebase_admin._auth_utils import UserNotFoundError
+from custom_auth.token_cache import VerifiedTokenCache
 from evaluation.event_flow.services.base_rest_service import BaseRestService
 from datetime import datetime
 
@@ -44,6 +48,13 @@ class CustomAuth(BaseRestService):
     def get_user_by_email(email):
         return auth.get_user_by_email(email).uid
     
+    def revoke_tokens(user):
+        """
+        Revokes the firebase sessions of the user and drops their verified tokens
+        """
+        auth.revoke_refresh_tokens(user.firebase_uid or user.username)
+        VerifiedTokenCache.invalidate_user(user.id)
+
     def get_user_latest_login(uid):
         try:
             user = auth.get_user(uid)
@@ -52,3 +63,83 @@ class CustomAuth(BaseRestService):
             return last_login_str
         except UserNotFoundError:
             return None
+
+    # Firebase Admin API limits
+    GET_USERS_BATCH_SIZE = 100
+    IMPORT_USERS_BATCH_SIZE = 1000
+    # Postgres advisory lock key serialising import_users across processes
+    IMPORT_USERS_LOCK_ID = 7310001
+
+    def get_uids_by_emails(emails):
+        """
+        Looks up firebase users by email, GET_USERS_BATCH_SIZE emails per request.
+
+        Returns:
+            dict: email (lowercased) -> uid, for the emails which have a firebase user
+        """
+        emails = list(emails)
+        uids_by_email = {}
+        for start in range(0, len(emails), CustomAuth.GET_USERS_BATCH_SIZE):
+            identifiers = [
+                auth.EmailIdentifier(email) for email in emails[start:start + CustomAuth.GET_USERS_BATCH_SIZE]
+            ]
+            for user in auth.get_users(identifiers).users:
+                uids_by_email[user.email.lower()] = user.uid
+        return uids_by_email
+
+    def import_users(passwords_by_email):
+        """
+        Creates firebase users with the given passwords, IMPORT_USERS_BATCH_SIZE users per request.
+
+        Firebase skips the email uniqueness check on import, so imports are serialised with a postgres advisory lock
+        and every batch is checked again with get_users under the lock. Emails created meanwhile by another import
+        are returned as existing instead of being imported twice. Passwords are imported as PBKDF2 hashes, firebase
+        rehashes them with its own scrypt on first sign in.
+
+        Returns:
+            tuple: (dict email -> uid of the created users, dict email -> error reason of the failed ones,
+                    dict email -> uid of the users which already existed)
+        """
+        rounds = settings.FIREBASE_IMPORT_PBKDF2_ROUNDS
+        hash_alg = auth.UserImportHash.pbkdf2_sha256(rounds=rounds)
+        items = list(passwords_by_email.items())
+        uids_by_email, errors_by_email, existing_uids_by_email = {}, {}, {}
+        if not items:
+            return uids_by_email, errors_by_email, existing_uids_by_email
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [CustomAuth.IMPORT_USERS_LOCK_ID])
+        try:
+            for start in range(0, len(items), CustomAuth.IMPORT_USERS_BATCH_SIZE):
+                batch = items[start:start + CustomAuth.IMPORT_USERS_BATCH_SIZE]
+                existing_uids = CustomAuth.get_uids_by_emails([email for email, _ in batch])
+                for email, _ in batch:
+                    if email.lower() in existing_uids:
+                        existing_uids_by_email[email] = existing_uids[email.lower()]
+                batch = [(email, password) for email, password in batch if email.lower() not in existing_uids]
+                if not batch:
+                    continue
+
+                records = []
+                for email, password in batch:
+                    salt = os.urandom(16)
+                    records.append(
+                        auth.ImportUserRecord(
+                            uid=uuid.uuid4().hex,
+                            email=email,
+                            password_hash=hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, rounds),
+                            password_salt=salt,
+                        )
+                    )
+                result = auth.import_users(records, hash_alg=hash_alg)
+                failed_indexes = set()
+                for error in result.errors:
+                    failed_indexes.add(error.index)
+                    errors_by_email[batch[error.index][0]] = error.reason
+                for index, record in enumerate(records):
+                    if index not in failed_indexes:
+                        uids_by_email[record.email] = record.uid
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [CustomAuth.IMPORT_USERS_LOCK_ID])
+        return uids_by_email, errors_by_email, existing_uids_by_email
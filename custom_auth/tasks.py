@@ -0,0 +1,17 @@
+import logging
+
+from celery import shared_task
+
+from custom_auth.services.sendgrid_service import SendgridService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, queue="notification_queue")
+def send_password_email_task(self, email, password):
+    try:
+        SendgridService.send_password_email(email, password)
+        logger.info(f"Sent password email to: {email}")
+    except Exception as e:
+        logger.error(f"Error sending password email to {email}: {str(e)}")
+        raise self.retry(exc=e, countdown=60)
@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, empty
+
+# Fields of the user resolved from the cached identity, without a database query
+IDENTITY_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_student",
+    "is_lecturer",
+    "is_course_provider_admin",
+    "needs_role_assignment",
+)
+
+
+class VerifiedTokenCache:
+    """
+    Cache of the identities of verified firebase ID tokens, keyed by a hash of the token and kept until
+    the token expires.
+
+    Lookups go to a process local LRU first and then to the shared cache. Local entries are only trusted
+    for VERIFIED_TOKEN_LOCAL_CACHE_TTL_SECONDS, so an invalidation made by another process is picked up
+    within that time. invalidate_user marks the identities of a user verified before now as stale, for
+    role changes and revoked tokens.
+
+    The shared cache is only used when it is redis (VERIFIED_TOKEN_SHARED_CACHE_ENABLED). The default LocMem
+    cache lives in the process, where an invalidation made elsewhere would never be seen, so without redis
+    identities are only kept in the local LRU.
+    """
+
+    TOKEN_KEY = "verified_token:{namespace}:{token_hash}"
+    REVOKED_AT_KEY = "verified_token_revoked_at:{user_id}"
+    # Firebase ID tokens are valid for an hour
+    MAX_TOKEN_LIFETIME_SECONDS = 3600
+
+    _instances = []
+
+    def __init__(self, namespace):
+        # Authentication classes resolve users differently, so they don't share identities
+        self.namespace = namespace
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        VerifiedTokenCache._instances.append(self)
+
+    def _get_token_key(self, token_hash):
+        return self.TOKEN_KEY.format(namespace=self.namespace, token_hash=token_hash)
+
+    def get(self, id_token):
+        token_hash = hashlib.sha256(id_token.encode()).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(token_hash)
+            if entry is not None:
+                identity, local_expires_at = entry
+                if local_expires_at > now:
+                    self._local.move_to_end(token_hash)
+                    return identity
+                del self._local[token_hash]
+
+        if not settings.VERIFIED_TOKEN_SHARED_CACHE_ENABLED:
+            return None
+        identity = cache.get(self._get_token_key(token_hash))
+        if identity is None or identity["exp"] <= now:
+            return None
+        revoked_at = cache.get(self.REVOKED_AT_KEY.format(user_id=identity["id"]))
+        if revoked_at is not None and revoked_at >= identity["verified_at"]:
+            return None
+        self._set_local(token_hash, identity, now)
+        return identity
+
+    def set(self, id_token, user, exp, verified_at):
+        """
+        verified_at is taken before the user is read, so a role change made meanwhile still invalidates it
+        """
+        now = time.time()
+        timeout = int(exp - now)
+        if timeout <= 0:
+            return
+        token_hash = hashlib.sha256(id_token.encode()).hexdigest()
+        identity = {field: getattr(user, field) for field in IDENTITY_FIELDS}
+        identity.update({"exp": exp, "verified_at": verified_at})
+        if settings.VERIFIED_TOKEN_SHARED_CACHE_ENABLED:
+            cache.set(self._get_token_key(token_hash), identity, timeout=timeout)
+        self._set_local(token_hash, identity, now)
+
+    def _set_local(self, token_hash, identity, now):
+        local_expires_at = min(
+            identity["exp"], now + settings.VERIFIED_TOKEN_LOCAL_CACHE_TTL_SECONDS
+        )
+        with self._lock:
+            self._local[token_hash] = (identity, local_expires_at)
+            self._local.move_to_end(token_hash)
+            while len(self._local) > settings.VERIFIED_TOKEN_LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+    @classmethod
+    def invalidate_user(cls, user_id):
+        if settings.VERIFIED_TOKEN_SHARED_CACHE_ENABLED:
+            cache.set(
+                cls.REVOKED_AT_KEY.format(user_id=user_id),
+                time.time(),
+                timeout=cls.MAX_TOKEN_LIFETIME_SECONDS,
+            )
+        for instance in cls._instances:
+            with instance._lock:
+                stale_hashes = [
+                    token_hash
+                    for token_hash, (identity, _) in instance._local.items()
+                    if identity["id"] == user_id
+                ]
+                for token_hash in stale_hashes:
+                    del instance._local[token_hash]
+
+
+class CachedUser(SimpleLazyObject):
+    """
+    User resolved from a cached identity. The identity fields are read from the cache, any other
+    attribute loads the user from the database on first access.
+    """
+
+    def __init__(self, identity):
+        self.__dict__["_identity"] = identity
+        super().__init__(lambda: get_user_model().objects.get(id=identity["id"]))
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            identity = self.__dict__["_identity"]
+            if name in IDENTITY_FIELDS:
+                return identity[name]
+            if name == "pk":
+                return identity["id"]
+            if name == "is_authenticated":
+                return True
+            if name == "is_anonymous":
+                return False
+        return super().__getattr__(name)
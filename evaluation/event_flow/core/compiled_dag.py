@@ -0,0 +1,74 @@
+import typing
+
+from evaluation.event_flow.core.dag_config import DAG
+
+
+class CompiledDag:
+    """
+    Read-only view of a single DAG entry from dag_config, with the lookups the orchestrator needs
+    (dependents, in-degree, topological order) computed once instead of on every processor transition.
+    """
+
+    def __init__(self, eventflow_type: str, dag: typing.Dict):
+        self.eventflow_type = eventflow_type
+        self.processors: typing.Dict[str, typing.Dict] = dag["processors"]
+        self.termination_processors: typing.Dict[str, typing.Dict] = dag.get("termination_processor", {})
+
+        dependents = {name: [] for name in self.processors}
+        for name, values in self.processors.items():
+            for provider_name in values["depends_on"]:
+                if provider_name not in self.processors:
+                    raise ValueError(f"DAG {eventflow_type} - {name} depends on unknown processor {provider_name}")
+                dependents[provider_name].append(name)
+
+        self.dependents: typing.Dict[str, typing.Tuple[str, ...]] = {k: tuple(v) for k, v in dependents.items()}
+        self.in_degree: typing.Dict[str, int] = {
+            name: len(values["depends_on"]) for name, values in self.processors.items()
+        }
+        self.root_processors: typing.Tuple[str, ...] = tuple(
+            name for name, degree in self.in_degree.items() if degree == 0
+        )
+        self.topological_order: typing.Tuple[str, ...] = self._topological_sort()
+
+    def _topological_sort(self) -> typing.Tuple[str, ...]:
+        remaining = dict(self.in_degree)
+        ready = list(self.root_processors)
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.processors):
+            cyclic = sorted(set(self.processors) - set(order))
+            raise ValueError(f"DAG {self.eventflow_type} has a cycle between processors - {cyclic}")
+        return tuple(order)
+
+    def has_processor(self, processor_name: str) -> bool:
+        return processor_name in self.processors or processor_name in self.termination_processors
+
+    def get_providers(self, processor_name: str) -> typing.List[str]:
+        if processor_name in self.processors:
+            return self.processors[processor_name]["depends_on"]
+        if processor_name in self.termination_processors:
+            return []
+        raise KeyError(f"Error, {processor_name} is not present in the dag")
+
+    def get_dependents(self, processor_name: str) -> typing.Tuple[str, ...]:
+        return self.dependents.get(processor_name, ())
+
+    def get_in_degree(self, processor_name: str) -> int:
+        # Termination processors have no providers, so they are ready as soon as they are created.
+        return self.in_degree.get(processor_name, 0)
+
+
+COMPILED_DAGS: typing.Dict[str, CompiledDag] = {
+    eventflow_type: CompiledDag(eventflow_type, dag) for eventflow_type, dag in DAG.items()
+}
+
+
+def get_compiled_dag(eventflow_type: str) -> CompiledDag:
+    return COMPILED_DAGS[eventflow_type]
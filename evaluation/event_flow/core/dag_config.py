@@ -178,9 +178,82 @@ DAG = {
     }
 }
 
+
+class ResourceClass:
+    AUDIO = "audio"
+    CPU = "cpu"
+    LLM_IO = "llm-io"
+    FINALIZE = "finalize"
+
+
+# Queue and recommended worker pool of each resource class, so every class is scaled with its own workers. Savers
+# and final scores have their own queue and workers, so started flows complete without waiting behind new ones.
+# llm-io processors mostly wait on HTTP, so their workers run gevent with a high concurrency.
+RESOURCE_CLASSES = {
+    ResourceClass.AUDIO: {"queue": "whisper-timestamped", "pool": "prefork"},
+    ResourceClass.CPU: {"queue": "evaluation_cpu_queue", "pool": "prefork"},
+    ResourceClass.LLM_IO: {"queue": "evaluation_llm_io_queue", "pool": "gevent"},
+    ResourceClass.FINALIZE: {"queue": "evaluation_finalize_queue", "pool": "prefork"},
+}
+
+# Resource class of each processor. Processors without one run on the default queue.
+# Pitch is CPU bound and doesn't wait behind SpeechToText on the single slot audio worker. It reads the converted
+# audio from AudioArtifactCache, whose directory is a volume shared by the audio and cpu workers, and downloads it
+# when the directory isn't shared.
+PROCESSOR_RESOURCE_CLASSES = {
+    "SpeechToText": ResourceClass.AUDIO,
+
+    "Pitch": ResourceClass.CPU,
+    "Pace": ResourceClass.CPU,
+    "AwkwardPauses": ResourceClass.CPU,
+    "Fluency": ResourceClass.CPU,
+    "Vocab": ResourceClass.CPU,
+
+    "Coherence": ResourceClass.LLM_IO,
+    "Grammar": ResourceClass.LLM_IO,
+    "InterviewPrepGrammar": ResourceClass.LLM_IO,
+    "Sentiment": ResourceClass.LLM_IO,
+    "FillerWords": ResourceClass.LLM_IO,
+    "Pronunciation": ResourceClass.LLM_IO,
+    "IELTSIdealResponse": ResourceClass.LLM_IO,
+    "InterviewPrepIdealResponse": ResourceClass.LLM_IO,
+    "IELTSReportGenerator": ResourceClass.LLM_IO,
+    "InteviewPrepReportGenerator": ResourceClass.LLM_IO,
+    "CodeEfficiencyProcessor": ResourceClass.LLM_IO,
+    "CodeQualityProcessor": ResourceClass.LLM_IO,
+    "CodeImprovementProcessor": ResourceClass.LLM_IO,
+    "CodeRevisionTopicProcessor": ResourceClass.LLM_IO,
+    "CodeSummaryProcessor": ResourceClass.LLM_IO,
+
+    "CoherenceSaver": ResourceClass.FINALIZE,
+    "PronunciationSaver": ResourceClass.FINALIZE,
+    "FluencySaver": ResourceClass.FINALIZE,
+    "VocabSaver": ResourceClass.FINALIZE,
+    "IELTSGrammarSaver": ResourceClass.FINALIZE,
+    "InterviewPrepGrammarSaver": ResourceClass.FINALIZE,
+    "SentimentSaver": ResourceClass.FINALIZE,
+    "IELTSEvaluationSaver": ResourceClass.FINALIZE,
+    "InterviewEvaluationSaver": ResourceClass.FINALIZE,
+    "IELTSIdealResponseSaver": ResourceClass.FINALIZE,
+    "InterviewPrepIdealResponseSaver": ResourceClass.FINALIZE,
+    "SpeakingSaver": ResourceClass.FINALIZE,
+    "WritingSaver": ResourceClass.FINALIZE,
+    "DSAResponseSaverEfficiency": ResourceClass.FINALIZE,
+    "DSAResponseSaverImprovement": ResourceClass.FINALIZE,
+    "DSAResponseSaverQuality": ResourceClass.FINALIZE,
+    "DSAResponseSaverRevision": ResourceClass.FINALIZE,
+    "DSAResponseSaverSummary": ResourceClass.FINALIZE,
+    "DSAMarkAsCompleteSaver": ResourceClass.FINALIZE,
+    "MockBehaviouralSaver": ResourceClass.FINALIZE,
+    "SpeakingFinalScore": ResourceClass.FINALIZE,
+    "WritingFinalScore": ResourceClass.FINALIZE,
+    "MockBehaviourFinalScore": ResourceClass.FINALIZE,
+    "AssessmentEvaluatorProcessor": ResourceClass.FINALIZE,
+    "AbortHandler": ResourceClass.FINALIZE,
+}
+
 # Which celery queue to assign to.
 # If the mapping doesn't exist, it will assigned to default queue
-
 PROCESSOR_QUEUE_MAPPING = {
-    "SpeechToText":"whisper-timestamped"
-}
\ No newline at end of file
+    name: RESOURCE_CLASSES[resource_class]["queue"] for name, resource_class in PROCESSOR_RESOURCE_CLASSES.items()
+}
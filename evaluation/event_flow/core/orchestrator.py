@@ -1,13 +1,17 @@
-from collections import defaultdict
 from enum import Enum
 import typing
 import logging
 from common.mixins import BaseLoggerMixin
 from evaluation.event_flow.helpers.db_helper import EventFlowDbHelper
+from evaluation.event_flow.helpers.result_store import EventFlowResultStore
 
 from evaluation.models import EventFlow, EventFlowProcessorState
+from celery import group
+from django.db import transaction
 from config.celery import app
-from evaluation.event_flow.core.dag_config import DAG, PROCESSOR_QUEUE_MAPPING
+from evaluation.event_flow.core.compiled_dag import CompiledDag, get_compiled_dag
+from evaluation.event_flow.core.dag_config import DAG
+from evaluation.event_flow.core.processor_registry import ProcessorRegistry
 
 
 logger = logging.getLogger(__name__)
@@ -33,16 +37,20 @@ class Orchestrator(BaseLoggerMixin):
     def get_dag_from_eventflow_type(eventflow_type: str):
         return DAG[eventflow_type]
 
+    @staticmethod
+    def get_compiled_dag_from_eventflow_type(eventflow_type: str) -> CompiledDag:
+        return get_compiled_dag(eventflow_type)
+
     @staticmethod
     def start_new_eventflow(*, eventflow_type: str = "default", root_args: typing.Dict, initiated_by: str) -> str:
-        dag = Orchestrator.get_dag_from_eventflow_type(eventflow_type)
+        compiled_dag = Orchestrator.get_compiled_dag_from_eventflow_type(eventflow_type)
         
         ef = EventFlow.objects.create(type=eventflow_type, 
                                       root_arguments=root_args,
                                       initiated_by=initiated_by)
         logger.info(f"OrchestratorLog:[{ef.id}]:Created eventflow = {ef}. Type-{eventflow_type}.")
         
-        Orchestrator.initialise_eventflow_processors(ef.id, dag["processors"].keys())
+        Orchestrator.initialise_eventflow_processors(ef.id, compiled_dag.topological_order, compiled_dag)
 
         logger.info(f"OrchestratorLog:[{ef.id}]:Created processors states for event flow = {ef}. Type-{eventflow_type}.")
         
@@ -50,11 +58,12 @@ class Orchestrator(BaseLoggerMixin):
         return ef.id
     
     @staticmethod
-    def initialise_eventflow_processors(eventflow_id, processor_names):
+    def initialise_eventflow_processors(eventflow_id, processor_names, compiled_dag: CompiledDag):
         efp_states = []
         for processor in processor_names:
             efp_states.append(EventFlowProcessorState(event_flow_id=eventflow_id,
-                                                      processor_name=processor))
+                                                      processor_name=processor,
+                                                      pending_providers=compiled_dag.get_in_degree(processor)))
 
         EventFlowProcessorState.objects.bulk_create(efp_states)
 
@@ -63,6 +72,8 @@ class Orchestrator(BaseLoggerMixin):
         ef_db_helper = EventFlowDbHelper(eventflow_id)
         dag = Orchestrator.get_dag_from_eventflow_type(ef_db_helper.eventflow_type)
         ef_db_helper.reset_all_processors_state(termination_processors=dag["termination_processor"].keys())
+        ef_db_helper.recompute_pending_providers(
+            Orchestrator.get_compiled_dag_from_eventflow_type(ef_db_helper.eventflow_type))
         logger.info(f"OrchestratorLog:[{eventflow_id}]:Restarting eventflow, Type-{ef_db_helper.eventflow_type}, with args {ef_db_helper.eventflow_root_args}")
         Orchestrator(eventflow_id=eventflow_id, initial=True, 
                      root_args=ef_db_helper.eventflow_root_args)
@@ -92,11 +103,10 @@ class Orchestrator(BaseLoggerMixin):
                                  f"providers are not done. Won't restart. Fix state manually. Eventflow id - {self.id}.")
         self.ef_db_helper.reset_aborted_and_error_processor_states()
         self.ef_db_helper.delete_processors(list(termination_processors))
+        self.ef_db_helper.recompute_pending_providers(self.compiled_dag)
         self.ef_db_helper.set_eventflow_status(EventFlow.Status.STARTED)
-        for processor_name in error_processor_names:
-            if processor_name in termination_processors:
-                continue
-            self.call_next_processor(processor_name)
+        self.call_next_processors([processor_name for processor_name in error_processor_names
+                                   if processor_name not in termination_processors])
 
     def __init__(self, *, eventflow: EventFlow, root_args: typing.Dict | None, initial: bool = False):
         self.id = str(eventflow.id)
@@ -109,23 +119,15 @@ class Orchestrator(BaseLoggerMixin):
             self.root_args = root_args
 
         self.dag = Orchestrator.get_dag_from_eventflow_type(self.ef_db_helper.eventflow.type)
-        
-        self.provider_to_dependents_dict = defaultdict(list)
-        
-        for name, values in self.dag["processors"].items():
-            for provider_name in values["depends_on"]:
-                self.provider_to_dependents_dict[provider_name].append(name)
-        
-        self.log_debug(f"Provider to dependents dict for tree {self.id} - {self.provider_to_dependents_dict}")
+        self.compiled_dag = Orchestrator.get_compiled_dag_from_eventflow_type(self.ef_db_helper.eventflow.type)
         
         if initial:
-            root_processors = [k for k, v in self.dag["processors"].items() if len(v["depends_on"]) == 0]
+            root_processors = self.compiled_dag.root_processors
             self.log_debug(f"Initial processors being called - {root_processors}")
-            for processor in root_processors:
-                self.call_next_processor(processor)
+            self.call_next_processors(root_processors)
 
     def get_all_providers(self,processor_name:str):
-        return self.dag["processors"][processor_name]["depends_on"]
+        return self.compiled_dag.get_providers(processor_name)
 
     @staticmethod
     def get_eventflow_status_from_termination_cause(termination_cause: TerminationCause):
@@ -141,65 +143,77 @@ class Orchestrator(BaseLoggerMixin):
         self.ef_db_helper.mark_pending_processor_aborted()
 
         termination_processor = self.dag["termination_processor"].keys()
-        Orchestrator.initialise_eventflow_processors(self.id, termination_processor)
+        Orchestrator.initialise_eventflow_processors(self.id, termination_processor, self.compiled_dag)
 
         self.log_info(f"Calling termination handler processors, processor: {termination_processor}")
-        for processor in termination_processor:
-            self.call_next_processor(processor)
+        self.call_next_processors(list(termination_processor))
 
 
     def on_processor_complete(self, *, processor_name: str, result_dict: typing.Dict, error_stacktrace = None):
-        if error_stacktrace is None:
-            self.ef_db_helper.mark_processor_complete(processor_name=processor_name, result_dict=result_dict)
-        else:
-            self.ef_db_helper.mark_processor_complete_with_error(processor_name=processor_name, 
-                                                                 result_dict=result_dict,
-                                                                 error_stacktrace=error_stacktrace)
-        
-        if not self.ef_db_helper.is_eventflow_terminated:
-            for depending_processor in self.provider_to_dependents_dict[processor_name]:
-                if self.check_if_providers_are_done(processor_name=depending_processor):
-                    self.call_next_processor(depending_processor)
-        else:
-            self.log_info(f"Not calling dependent processor for {processor_name} since this event_flow has been terminated")
+        # The processor state stays locked till the dependents are decremented, so a redelivered completion waits
+        # for the first one and then sees the processor as already complete.
+        ready_processors = []
+        with transaction.atomic():
+            if error_stacktrace is None:
+                newly_completed = self.ef_db_helper.mark_processor_complete(processor_name=processor_name,
+                                                                            result_dict=result_dict)
+            else:
+                newly_completed = self.ef_db_helper.mark_processor_complete_with_error(
+                    processor_name=processor_name, result_dict=result_dict, error_stacktrace=error_stacktrace)
+
+            if not newly_completed:
+                self.log_info(f"{processor_name} was already complete, not decrementing its dependents again")
+            elif not self.ef_db_helper.is_eventflow_terminated:
+                ready_processors = self.ef_db_helper.decrement_pending_providers(
+                    self.compiled_dag.get_dependents(processor_name))
+            else:
+                self.log_info(f"Not calling dependent processor for {processor_name} since this event_flow has been terminated")
+
+        self.call_next_processors(ready_processors)
 
     def check_if_providers_are_done(self, *, processor_name: str):
-        providers = self.dag["processors"][processor_name]["depends_on"]
+        providers = self.compiled_dag.get_providers(processor_name)
         return self.ef_db_helper.are_given_processors_done(processor_names=providers)
 
     def get_assembled_results(self, *, processor_names: typing.List[str])->typing.Dict:
-        results_to_be_sent = {}
-        
-        processor_states = self.ef_db_helper.get_processor_states(processor_names=processor_names)
-            
-        for processor, state in processor_states.items():
-            results_to_be_sent[processor] = state.result
-        
-        return results_to_be_sent
+        return EventFlowResultStore(self.ef_db_helper.eventflow).get_results(processor_names)
 
     def call_next_processor(self, processor_name: str):
+        self.call_next_processors([processor_name])
 
-        if processor_name in self.dag["processors"]:
-            providers = self.dag["processors"][processor_name]["depends_on"]
-        elif processor_name in self.dag["termination_processor"]:
-            providers = []
-        else:
-            raise KeyError(f"Error, {processor_name} is not present in the dag")
+    def call_next_processors(self, processor_names: typing.List[str]):
+        """
+        Dispatches all given processors together. Sibling processors which become ready on the same provider
+        completion (e.g. everything depending on SpeechToText) are marked in progress with one UPDATE and the tasks
+        are published as a single celery group.
+        Messages only carry a reference to the processor; provider results and root arguments are read by the
+        processor itself from the eventflow (see EventFlowResultStore).
+        """
+        if not processor_names:
+            return
 
-        assembled_results = {}
-        if providers:
-            assembled_results = self.get_assembled_results(processor_names=providers)
-        
-        self.log_debug(f"Calling processor - {processor_name} with inputs of - {list(assembled_results.keys())}")
+        for processor_name in processor_names:
+            # Raises KeyError for processors not present in the dag
+            self.compiled_dag.get_providers(processor_name)
+
+        self.ef_db_helper.mark_processors_inprogress(processor_names)
+
+        signatures = []
+        for processor_name in processor_names:
+            self.log_debug(f"Calling processor - {processor_name}")
 
-        self.ef_db_helper.mark_processor_inprogress(processor_name)
-        queue_name = PROCESSOR_QUEUE_MAPPING.get(processor_name,"default")
-        app.send_task("evaluation.tasks.call_event_processor",kwargs={"processor_name": processor_name,"eventflow_id":self.id,
-                                                 "root_arguments":self.root_args,
-                                                 "inputs": assembled_results}, queue=queue_name)
+            queue_name = ProcessorRegistry.get_queue(processor_name)
+            signatures.append(app.signature("evaluation.tasks.call_event_processor",
+                                            kwargs={"processor_name": processor_name, "eventflow_id": self.id},
+                                            queue=queue_name))
+
+        if len(signatures) == 1:
+            signatures[0].apply_async()
+        else:
+            group(signatures).apply_async()
 
     def submit_result(self, *, processor_name: str, result_dict: typing.Dict, error_stacktrace=None):
-        if processor_name not in self.dag["processors"] and processor_name not in self.dag["termination_processor"]:
+        if not self.compiled_dag.has_processor(processor_name):
             raise ValueError(
                 f"{processor_name} is not present in the tree-{self.id}. Keys present - {list(self.dag['processors'].keys())}")
         
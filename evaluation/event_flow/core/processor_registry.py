@@ -0,0 +1,137 @@
+import ast
+import importlib
+import logging
+import os
+import pkgutil
+import resource
+import time
+import typing
+
+from evaluation.event_flow.core.dag_config import PROCESSOR_QUEUE_MAPPING
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROCESSOR_QUEUE = "default"
+
+PROCESSORS_PACKAGE = "evaluation.event_flow.processors"
+
+
+def _get_registered_name(class_node: ast.ClassDef) -> typing.Optional[str]:
+    for decorator in class_node.decorator_list:
+        if isinstance(decorator, ast.Name) and decorator.id == register_processor.__name__:
+            return class_node.name
+        if (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Name)
+            and decorator.func.id == register_processor.__name__
+        ):
+            for keyword in decorator.keywords:
+                if keyword.arg == "name" and isinstance(keyword.value, ast.Constant):
+                    return keyword.value.value
+            return class_node.name
+    return None
+
+
+def discover_processor_modules() -> typing.Dict[str, str]:
+    """
+    Module of every processor decorated with @register_processor in the processors package, found by parsing the
+    sources so that no processor module is imported.
+    """
+    package = importlib.import_module(PROCESSORS_PACKAGE)
+    processor_modules = {}
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module_name = f"{PROCESSORS_PACKAGE}.{module_info.name}"
+        path = os.path.join(module_info.module_finder.path, f"{module_info.name}.py")
+        if module_info.ispkg or not os.path.exists(path):
+            continue
+        with open(path) as source:
+            tree = ast.parse(source.read(), filename=path)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                name = _get_registered_name(node)
+                if name is not None:
+                    processor_modules[name] = module_name
+    return processor_modules
+
+
+class ProcessorRegistry:
+    """
+    Processor classes by name, kept for the life of the process. Classes register themselves with
+    @register_processor when their module is imported, so a module is only imported once one of its processors is
+    needed. The module of each processor is found from the decorators by discover_processor_modules.
+
+    Celery workers preload the processors routed to the queues they consume before the pool forks, so children
+    share the loaded modules and a worker never imports the libraries of processors it can't receive (parselmouth
+    and matplotlib on LLM workers, OpenAIService on the whisper-timestamped worker).
+    """
+
+    _processors: typing.Dict[str, type] = {}
+    _processor_modules: typing.Optional[typing.Dict[str, str]] = None
+    _worker_queues: typing.Optional[typing.FrozenSet[str]] = None
+
+    @classmethod
+    def register(cls, processor_class: type, name: str = None) -> type:
+        name = name or processor_class.__name__
+        registered = cls._processors.get(name)
+        if registered is not None and registered is not processor_class:
+            raise ValueError(f"Processor {name} is already registered by {registered.__module__}")
+        cls._processors[name] = processor_class
+        return processor_class
+
+    @classmethod
+    def get_processor_modules(cls) -> typing.Dict[str, str]:
+        if cls._processor_modules is None:
+            cls._processor_modules = discover_processor_modules()
+        return cls._processor_modules
+
+    @classmethod
+    def get(cls, name: str) -> type:
+        processor_class = cls._processors.get(name)
+        if processor_class is not None:
+            return processor_class
+        processor_modules = cls.get_processor_modules()
+        if name not in processor_modules:
+            raise KeyError(f"Unknown processor {name}, decorate it with @register_processor in {PROCESSORS_PACKAGE}")
+        importlib.import_module(processor_modules[name])
+        if name not in cls._processors:
+            raise KeyError(f"Processor {name} is not registered by {processor_modules[name]}")
+        return cls._processors[name]
+
+    @staticmethod
+    def get_queue(name: str) -> str:
+        return PROCESSOR_QUEUE_MAPPING.get(name, DEFAULT_PROCESSOR_QUEUE)
+
+    @classmethod
+    def get_names_for_queues(cls, queues: typing.Iterable[str]) -> typing.List[str]:
+        queues = set(queues)
+        return [name for name in cls.get_processor_modules() if cls.get_queue(name) in queues]
+
+    @classmethod
+    def is_routed_to_worker(cls, name: str) -> bool:
+        """
+        Whether this worker consumes the queue of the processor. True outside of workers started with -Q.
+        """
+        return cls._worker_queues is None or cls.get_queue(name) in cls._worker_queues
+
+    @classmethod
+    def preload_for_queues(cls, queues: typing.Iterable[str]):
+        cls._worker_queues = frozenset(queues)
+        names = cls.get_names_for_queues(cls._worker_queues)
+        started_at = time.monotonic()
+        for name in names:
+            cls.get(name)
+        # ru_maxrss is in kilobytes on linux
+        logger.info(
+            f"Loaded {len(names)} processors for queues {sorted(cls._worker_queues)} in "
+            f"{time.monotonic() - started_at:.2f}s, worker max RSS "
+            f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024} MB"
+        )
+
+
+def register_processor(processor_class: type = None, *, name: str = None):
+    """
+    Class decorator registering a processor under its class name, or under name if given.
+    """
+    if processor_class is None:
+        return lambda decorated_class: ProcessorRegistry.register(decorated_class, name=name)
+    return ProcessorRegistry.register(processor_class, name=name)
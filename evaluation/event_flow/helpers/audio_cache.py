@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+
+from storage_service.azure_storage import AzureStorageService
+
+logger = logging.getLogger(__name__)
+
+
+class AudioArtifactCache:
+    """
+    Size bounded on-disk cache of audio blobs, shared by the processors reading the audio of an attempt
+    (SpeechToText, Pitch). SpeechToText and Pitch run on different workers, which share the cache directory through
+    a volume (see docker-compose). Hits are best effort: a worker without the shared directory downloads the
+    converted audio once and keeps it for the other processors of that host.
+
+    Files are keyed by a hash of container + blob path, written to a temp file first and moved into place
+    atomically, so concurrent workers on the host never see partial files. Least recently used files are evicted
+    once the cache grows above AUDIO_ARTIFACT_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or settings.AUDIO_ARTIFACT_CACHE_DIR
+        self.max_bytes = max_bytes or settings.AUDIO_ARTIFACT_CACHE_MAX_BYTES
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def get_key(container_name: str, blob_name: str) -> str:
+        return hashlib.sha256(f"{container_name}/{blob_name}".encode("utf-8")).hexdigest()
+
+    def _get_path(self, container_name: str, blob_name: str) -> str:
+        extension = os.path.splitext(blob_name)[1]
+        return os.path.join(self.cache_dir, self.get_key(container_name, blob_name) + extension)
+
+    def _new_temp_path(self) -> str:
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        os.close(fd)
+        return temp_path
+
+    def get_local_path(self, container_name: str, blob_name: str, storage_service: AzureStorageService = None) -> str:
+        """
+        Returns path of a local copy of the blob, downloading it only if it is not cached on this worker yet.
+        The returned file is owned by the cache and must not be deleted by the caller.
+        """
+        path = self._get_path(container_name, blob_name)
+        if os.path.exists(path):
+            # Bump mtime, eviction goes by least recently used
+            os.utime(path)
+            logger.info(f"AudioArtifactCache hit for {container_name}/{blob_name}")
+            return path
+
+        logger.info(f"AudioArtifactCache miss for {container_name}/{blob_name}, downloading")
+        storage_service = storage_service or AzureStorageService()
+        temp_path = self._new_temp_path()
+        try:
+            storage_service.download_to_path(container_name=container_name, blob_name=blob_name, file_path=temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict(keep=path)
+        return path
+
+    def put_file(self, container_name: str, blob_name: str, local_path: str) -> str:
+        """
+        Moves a locally produced file (e.g. the converted audio just uploaded by SpeechToText) into the cache,
+        so later processors on this worker don't download it again.
+        """
+        path = self._get_path(container_name, blob_name)
+        temp_path = self._new_temp_path()
+        try:
+            shutil.move(local_path, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str = None):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or entry.name.endswith(".part") or entry.path == keep:
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+        if keep is not None and os.path.exists(keep):
+            total_size += os.path.getsize(keep)
+
+        if total_size <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted by another worker process
+                pass
+            total_size -= size
+            logger.info(f"AudioArtifactCache evicted {path}")
+            if total_size <= self.max_bytes:
+                break
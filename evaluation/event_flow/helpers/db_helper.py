@@ -1,6 +1,6 @@
 import logging
 import typing
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
 
 from evaluation.models import EventFlow, EventFlowProcessorState
@@ -53,6 +53,42 @@ class EventFlowDbHelper:
 
         return processor_states
 
+    def decrement_pending_providers(self, processor_names: typing.Iterable[str]) -> typing.List[str]:
+        """
+        Decrements the pending provider counter of given processors in a single UPDATE and returns the ones which
+        became ready by it. Row locks taken by the UPDATE guarantee only one completing provider sees a processor's
+        counter reach zero, so a processor is never dispatched twice.
+        """
+        processor_names = list(processor_names)
+        if not processor_names:
+            return []
+
+        table = EventFlowProcessorState._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET pending_providers = pending_providers - 1 "
+                f"WHERE event_flow_id = %s AND processor_name = ANY(%s) "
+                f"RETURNING processor_name, pending_providers, status",
+                [self.eventflow.pk, processor_names],
+            )
+            rows = cursor.fetchall()
+
+        return [name for name, pending, status in rows
+                if pending == 0 and status == EventFlowProcessorState.Status.PENDING]
+
+    def recompute_pending_providers(self, compiled_dag):
+        """
+        Rebuilds the pending provider counters from the current processor states. Used after states are reset, where
+        counters can no longer be derived from the completions seen so far.
+        """
+        states = list(self.eventflow.processors.only("id", "processor_name", "status"))
+        done = {state.processor_name for state in states
+                if state.status in EventFlowProcessorState.COMPLETION_STATES}
+        for state in states:
+            providers = compiled_dag.get_providers(state.processor_name)
+            state.pending_providers = len([p for p in providers if p not in done])
+        EventFlowProcessorState.objects.bulk_update(states, ["pending_providers"])
+
     @staticmethod
     def update_processor_termination_time(event_flow_state: EventFlowProcessorState):
         event_flow_state.end_time = timezone.now()
@@ -77,6 +113,12 @@ class EventFlowDbHelper:
 
         ef_state.save()
 
+    def mark_processors_inprogress(self, processor_names: typing.List[str]):
+        self.eventflow.processors.filter(processor_name__in=processor_names).update(
+            status=EventFlowProcessorState.Status.IN_PROGRESS,
+            start_time=timezone.now(),
+        )
+
     def mark_processor_error(self, processor_name: str, stacktrace: str):
         with transaction.atomic():
             ef_state = EventFlowProcessorState.objects.select_for_update().get(event_flow=self.eventflow,
@@ -99,10 +141,14 @@ class EventFlowDbHelper:
 
             ef_state.save()
 
-    def mark_processor_complete(self, *, processor_name: str, result_dict: typing.Dict):
+    def mark_processor_complete(self, *, processor_name: str, result_dict: typing.Dict) -> bool:
+        """
+        Returns False if the processor was already complete, e.g. when its task is delivered again
+        """
         with transaction.atomic():
             ef_state = EventFlowProcessorState.objects.select_for_update().get(event_flow=self.eventflow,
                                                                                 processor_name=processor_name)
+            newly_completed = ef_state.status not in EventFlowProcessorState.COMPLETION_STATES
             ef_state.result = result_dict
             ef_state.status = EventFlowProcessorState.Status.COMPLETED
 
@@ -111,11 +157,14 @@ class EventFlowDbHelper:
             ef_state.save()
         #Calling save method to trigger check for completion
         self.eventflow.save()
+        return newly_completed
 
-    def mark_processor_complete_with_error(self, *, processor_name: str, result_dict: typing.Dict, error_stacktrace):
+    def mark_processor_complete_with_error(self, *, processor_name: str, result_dict: typing.Dict,
+                                           error_stacktrace) -> bool:
         with transaction.atomic():
             ef_state = EventFlowProcessorState.objects.select_for_update().get(event_flow=self.eventflow,
                                                                                 processor_name=processor_name)
+            newly_completed = ef_state.status not in EventFlowProcessorState.COMPLETION_STATES
             ef_state.result = result_dict
             ef_state.error = error_stacktrace
             ef_state.status = EventFlowProcessorState.Status.COMPLETED_WITH_ERROR
@@ -123,6 +172,7 @@ class EventFlowDbHelper:
             self.update_processor_termination_time(ef_state)
 
             ef_state.save()
+        return newly_completed
 
     def delete_processors(self, processor_names:typing.List[str]):
         self.eventflow.processors.filter(processor_name__in=processor_names).delete()
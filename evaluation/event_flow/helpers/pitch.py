@@ -13,7 +13,68 @@ def init(audio_file):
     return snd
 
 
-def calculate_pitch(pitch, average_pitch, smoothed_pitch_values):
+def _get_stressed_regions(xs, region_indices):
+    """
+    Groups the whole seconds at which the pitch is out of bounds into (start, end) runs of consecutive seconds.
+    Seconds are grouped in the iteration order of a set of them, as before vectorisation, so runs come out identical.
+    """
+    seconds = np.unique(np.round(xs[region_indices]).astype(np.int64))
+    ordered_seconds = np.fromiter(set(seconds.tolist()), dtype=np.int64, count=len(seconds))
+    if len(ordered_seconds) == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(ordered_seconds) != 1)
+    starts = ordered_seconds[np.concatenate(([0], breaks + 1))]
+    ends = ordered_seconds[np.concatenate((breaks, [len(ordered_seconds) - 1]))]
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _count_intervals_with_less_variation(xs, duration, smoothed_pitch_values):
+    interval_duration = TIME_SLICE  # seconds
+    num_intervals = int(duration // interval_duration)
+    if num_intervals == 0:
+        return 0
+
+    interval_starts = np.arange(num_intervals) * interval_duration
+    # Both interval ends are inclusive
+    first_indices = np.searchsorted(xs, interval_starts, side="left")
+    last_indices = np.searchsorted(xs, interval_starts + interval_duration, side="right")
+    if np.any(last_indices <= first_indices):
+        raise ValueError("zero-size array to reduction operation minimum which has no identity")
+
+    # reduceat over interleaved (first, last) indices reduces each [first, last) slice at even positions, padding
+    # lets the last interval end at the last sample
+    padded_values = np.append(smoothed_pitch_values, smoothed_pitch_values[-1])
+    reduce_indices = np.empty(2 * num_intervals, dtype=np.intp)
+    reduce_indices[0::2] = first_indices
+    reduce_indices[1::2] = last_indices
+    interval_min = np.minimum.reduceat(padded_values, reduce_indices)[0::2]
+    interval_max = np.maximum.reduceat(padded_values, reduce_indices)[0::2]
+
+    return int(np.count_nonzero(interval_max - interval_min < 20))
+
+
+def calculate_pitch(pitch, average_pitch, smoothed_pitch_values, xs=None):
+        if xs is None:
+            xs = pitch.xs()
+        upper_bound = average_pitch * 1.25
+        lower_bound = average_pitch * 0.75
+        above_indices = np.flatnonzero(smoothed_pitch_values > upper_bound)
+        below_indices = np.flatnonzero(smoothed_pitch_values < lower_bound)
+
+        overstressed_words = _get_stressed_regions(xs, above_indices)
+        understressed_words = _get_stressed_regions(xs, below_indices)
+        count_of_less_variation = _count_intervals_with_less_variation(xs, pitch.duration, smoothed_pitch_values)
+
+        mini = np.min(smoothed_pitch_values)
+        maxi = np.max(smoothed_pitch_values)
+        return upper_bound, lower_bound, mini, maxi, count_of_less_variation, overstressed_words, understressed_words
+
+
+def calculate_pitch_with_loops(pitch, average_pitch, smoothed_pitch_values):
+        """
+        Previous, loop based implementation of calculate_pitch. Kept as reference for benchmarks.
+        """
         upper_bound = average_pitch * 1.25
         lower_bound = average_pitch * 0.75
         above_indices = np.where(smoothed_pitch_values > upper_bound)[0]
@@ -88,16 +149,17 @@ def evaluate_pitch(audio_blob_path, storage_container_name, audio_file):
     pitch_values[~mask] = np.interp(np.flatnonzero(~mask), np.flatnonzero(mask), pitch_values[mask])
     average_pitch = np.mean(pitch_values)
     smoothed_pitch_values = gaussian_filter1d(pitch_values, sigma=sigma)
-    upper_bound, lower_bound, mini, maxi, count_of_less_variation, overstressed_words, understressed_words = calculate_pitch(pitch, average_pitch, smoothed_pitch_values)
+    xs = pitch.xs()
+    upper_bound, lower_bound, mini, maxi, count_of_less_variation, overstressed_words, understressed_words = calculate_pitch(pitch, average_pitch, smoothed_pitch_values, xs=xs)
 
     fig, ax = plt.subplots()  # Create a new figure and axis
 
-    ax.fill_between(pitch.xs(), smoothed_pitch_values, upper_bound, where=smoothed_pitch_values > upper_bound,
+    ax.fill_between(xs, smoothed_pitch_values, upper_bound, where=smoothed_pitch_values > upper_bound,
                     color='k', alpha=0.5)
-    ax.fill_between(pitch.xs(), smoothed_pitch_values, lower_bound, where=smoothed_pitch_values < lower_bound,
+    ax.fill_between(xs, smoothed_pitch_values, lower_bound, where=smoothed_pitch_values < lower_bound,
                     color='k', alpha=0.5)
 
-    ax.plot(pitch.xs(), smoothed_pitch_values, linewidth=1, color='r')
+    ax.plot(xs, smoothed_pitch_values, linewidth=1, color='r')
     ax.axhline(average_pitch, color='g', linestyle='--')
 
     ax.grid(True)
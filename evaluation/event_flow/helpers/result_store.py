@@ -0,0 +1,29 @@
+import typing
+
+from evaluation.event_flow.core.compiled_dag import get_compiled_dag
+from evaluation.models import EventFlow, EventFlowProcessorState
+
+
+class EventFlowResultStore:
+    """
+    Reads processor results of an eventflow straight from EventFlowProcessorState, so they don't need to be
+    carried around in celery messages.
+    """
+
+    def __init__(self, eventflow: EventFlow) -> None:
+        self.eventflow = eventflow
+
+    def get_results(self, processor_names: typing.Iterable[str]) -> typing.Dict[str, typing.Dict]:
+        processor_names = list(processor_names)
+        if not processor_names:
+            return {}
+
+        return dict(
+            EventFlowProcessorState.objects.filter(
+                event_flow=self.eventflow, processor_name__in=processor_names
+            ).values_list("processor_name", "result")
+        )
+
+    def get_inputs(self, processor_name: str) -> typing.Dict[str, typing.Dict]:
+        providers = get_compiled_dag(self.eventflow.type).get_providers(processor_name)
+        return self.get_results(providers)
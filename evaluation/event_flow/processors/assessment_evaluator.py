@@ -7,9 +7,11 @@ from evaluation.evaluators.MockInterviewBehaviouralEvaluator import MockIntervie
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.models import AssessmentAttempt
 import logging
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
+@register_processor
 class AssessmentEvaluatorProcessor(EventProcessor):
     def initialize(self):
         self.assessment_attempt_id = self.root_arguments.get("assessment_attempt_id")
@@ -4,6 +4,7 @@ import traceback
 import typing
 
 from evaluation.models import EventFlow
+from evaluation.event_flow.helpers.result_store import EventFlowResultStore
 import openai
 
 from common.mixins import BaseLoggerMixin
@@ -20,13 +21,23 @@ class EventProcessor(abc.ABC, BaseLoggerMixin):
     def get_fallback_result(self):
         raise NotImplementedError
 
-    def __init__(self, eventflow_id: str, inputs: typing.Dict, root_arguments: typing.Dict):
-        self.inputs = inputs
-        self.root_arguments = root_arguments
+    def __init__(self, eventflow_id: str, inputs: typing.Dict | None = None, root_arguments: typing.Dict | None = None):
+        self._inputs = inputs
         self.eventflow_id = eventflow_id
         self.eventflow = EventFlow.objects.get(id=eventflow_id)
+        self.root_arguments = self.eventflow.root_arguments if root_arguments is None else root_arguments
         self.log_debug(f"Init function of processor called - {self.__class__.__name__}")
 
+    @property
+    def inputs(self) -> typing.Dict:
+        """
+        Results of this processor's providers. Unless passed in explicitly, they are loaded from the result store
+        on first access, in a single query.
+        """
+        if self._inputs is None:
+            self._inputs = EventFlowResultStore(self.eventflow).get_inputs(self.__class__.__name__)
+        return self._inputs
+
     def get_formatted_msg(self, msg):
         return f"ProcessorLog:[{self.eventflow_id}]:[{self.__class__.__name__}]:{msg}"
 
@@ -7,6 +7,7 @@ from OpenAIService.repositories import (
 )
 
 from evaluation.event_flow.processors.base_llm_processor import BaseLLMProcessor
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class Response(BaseModel):
     efficiency: Efficiency = Efficiency()
 
 
+@register_processor
 class CodeEfficiencyProcessor(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -1,6 +1,7 @@
 from evaluation.event_flow.processors.base_llm_processor import BaseLLMProcessor
 from OpenAIService.repositories import ValidPromptTemplates
 from pydantic import BaseModel
+from evaluation.event_flow.core.processor_registry import register_processor
 
 
 class Response(BaseModel):
@@ -8,6 +9,7 @@ class Response(BaseModel):
     Feedback: str = "No solution was submitted."
 
 
+@register_processor
 class CodeImprovementProcessor(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
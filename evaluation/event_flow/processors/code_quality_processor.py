@@ -2,6 +2,7 @@ import logging
 from evaluation.event_flow.processors.base_llm_processor import BaseLLMProcessor
 from OpenAIService.repositories import ValidPromptTemplates
 from pydantic import BaseModel
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class Response(BaseModel):
     Feedback: FeedbackModel = FeedbackModel()
 
 
+@register_processor
 class CodeQualityProcessor(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
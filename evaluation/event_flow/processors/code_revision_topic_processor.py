@@ -5,6 +5,7 @@ from OpenAIService.repositories import ValidPromptTemplates
 from evaluation.event_flow.processors.base_llm_processor import (
     BaseLLMProcessor,
 )
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class Response(BaseModel):
     RevisionTopics: str = "No solution was submitted."
 
 
+@register_processor
 class CodeRevisionTopicProcessor(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
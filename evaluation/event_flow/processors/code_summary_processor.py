@@ -6,6 +6,7 @@ from OpenAIService.repositories import ValidPromptTemplates
 from evaluation.event_flow.processors.base_llm_processor import (
     BaseLLMProcessor,
 )
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,7 @@ class Response(BaseModel):
     AreaOfImprovements: str = "NA"
 
 
+@register_processor
 class CodeSummaryProcessor(BaseLLMProcessor):
 
     def __init__(self, *args, **kwargs):
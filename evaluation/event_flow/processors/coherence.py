@@ -8,6 +8,7 @@ from OpenAIService.repositories import (
 )
 from evaluation.event_flow.helpers.sentiment import evaluate_sentiment
 from evaluation.event_flow.processors.base_llm_processor import BaseLLMProcessor
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class Response(BaseModel):
     Overall_Reason: str
 
 
+@register_processor
 class Coherence(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -1,6 +1,7 @@
 from .base_event_processor import EventProcessor
 from ...models import UserAttemptResponseEvaluation, UserEvalQuestionAttempt, AssessmentAttempt
 import logging
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -25,17 +26,20 @@ class BaseGrammarSaver(EventProcessor):
         eval_object.save()
         return {}
 
+@register_processor
 class IELTSGrammarSaver(BaseGrammarSaver):
 
     def get_processor_name(self):
         return "Grammar"
 
+@register_processor
 class InterviewPrepGrammarSaver(BaseGrammarSaver):
 
     def get_processor_name(self):
         return "InterviewPrepGrammar"
 
 
+@register_processor
 class VocabSaver(EventProcessor):
 
     def initialize(self):
@@ -52,6 +56,7 @@ class VocabSaver(EventProcessor):
         return {}
 
 
+@register_processor
 class PronunciationSaver(EventProcessor):
 
     def initialize(self):
@@ -68,6 +73,7 @@ class PronunciationSaver(EventProcessor):
         return {}
 
 
+@register_processor
 class FluencySaver(EventProcessor):
 
     def initialize(self):
@@ -84,6 +90,7 @@ class FluencySaver(EventProcessor):
         return {}
 
 
+@register_processor
 class CoherenceSaver(EventProcessor):
 
     def initialize(self):
@@ -123,16 +130,19 @@ class BaseEvaluationSaver(EventProcessor):
         eval_object.save()
         return {"summary": self.summary, "overall_score": self.final_score}
 
+@register_processor
 class IELTSEvaluationSaver(BaseEvaluationSaver):
 
     def get_process_name(self):
         return "IELTSReportGenerator"
 
+@register_processor
 class InterviewEvaluationSaver(BaseEvaluationSaver):
 
     def get_process_name(self):
         return "InteviewPrepReportGenerator"
 
+@register_processor
 class MockBehaviouralSaver(EventProcessor):
     def initialize(self):
         self.question_attemp_id = self.root_arguments.get("question_attempt_id")
@@ -167,6 +177,7 @@ class MockBehaviouralSaver(EventProcessor):
         eval_object.save()
         return {}
     
+@register_processor
 class SpeakingSaver(EventProcessor):
     def initialize(self):
         self.question_attemp_id = self.root_arguments.get("question_attempt_id")
@@ -216,6 +227,7 @@ class SpeakingSaver(EventProcessor):
         return {}
 
 
+@register_processor
 class WritingSaver(EventProcessor):
     def initialize(self):
         self.question_attemp_id = self.root_arguments.get("question_attempt_id")
@@ -251,6 +263,7 @@ class WritingSaver(EventProcessor):
         return {}
     
 
+@register_processor
 class SentimentSaver(EventProcessor):
 
     def initialize(self):
@@ -285,12 +298,14 @@ class BaseIdealResponseSaver(EventProcessor):
         return {}
     
 
+@register_processor
 class IELTSIdealResponseSaver(BaseIdealResponseSaver):
 
     def get_processor_name(self):
         return "IELTSIdealResponse"
     
 
+@register_processor
 class InterviewPrepIdealResponseSaver(BaseIdealResponseSaver):
 
     def get_processor_name(self):
@@ -319,6 +334,7 @@ class BaseDSAPracticeResponseSaver(BaseIdealResponseSaver):
         self.assessment_attempt.save()
 
 
+@register_processor
 class DSAResponseSaverEfficiency(BaseDSAPracticeResponseSaver):
     def _execute(self):
         self.initialize()
@@ -327,6 +343,7 @@ class DSAResponseSaverEfficiency(BaseDSAPracticeResponseSaver):
         return {}
 
 
+@register_processor
 class DSAResponseSaverQuality(BaseDSAPracticeResponseSaver):
     def _execute(self):
         self.initialize()
@@ -335,6 +352,7 @@ class DSAResponseSaverQuality(BaseDSAPracticeResponseSaver):
         return {}
 
 
+@register_processor
 class DSAResponseSaverImprovement(BaseDSAPracticeResponseSaver):
     def _execute(self):
         self.initialize()
@@ -343,6 +361,7 @@ class DSAResponseSaverImprovement(BaseDSAPracticeResponseSaver):
         return {}
 
 
+@register_processor
 class DSAResponseSaverRevision(BaseDSAPracticeResponseSaver):
     def _execute(self):
         self.initialize()
@@ -351,6 +370,7 @@ class DSAResponseSaverRevision(BaseDSAPracticeResponseSaver):
         return {}
 
 
+@register_processor
 class DSAResponseSaverSummary(BaseDSAPracticeResponseSaver):
     def _execute(self):
         self.initialize()
@@ -359,6 +379,7 @@ class DSAResponseSaverSummary(BaseDSAPracticeResponseSaver):
         return {}
 
 
+@register_processor
 class DSAMarkAsCompleteSaver(BaseIdealResponseSaver):
     def initialize(self):
         self.question_attempt_id = self.root_arguments.get("question_attempt_id")
@@ -5,10 +5,12 @@ from evaluation.event_flow.helpers.fillerWords import evaluate_fillerWords
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.expections import ProcessorEvaluationException, ProcessorException
 from evaluation.event_flow.services.llm_service.openai_service import OpenAIService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class FillerWords(EventProcessor):
 
     def get_fallback_result(self):
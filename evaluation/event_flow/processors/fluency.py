@@ -2,10 +2,12 @@ import difflib
 import logging
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.expections import ProcessorException
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class Fluency(EventProcessor):
     """
     Fluency event processor
@@ -1,7 +1,9 @@
 from data_repo.models import QuestionBank
 from evaluation.event_flow.processors.base_grammar import BaseGrammar
+from evaluation.event_flow.core.processor_registry import register_processor
 
 
+@register_processor
 class Grammar(BaseGrammar):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
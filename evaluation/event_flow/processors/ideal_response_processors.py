@@ -5,6 +5,7 @@ import json
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.expections import ProcessorException
 from evaluation.event_flow.services.llm_service.openai_service import OpenAIService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 
 @dataclasses.dataclass
@@ -73,6 +74,7 @@ class BaseIdealResponse(EventProcessor):
         }
 
 
+@register_processor
 class IELTSIdealResponse(BaseIdealResponse):
     """
     Processor to generate ideal response for a given ielts question using llm
@@ -96,6 +98,7 @@ class IELTSIdealResponse(BaseIdealResponse):
         return msg
 
 
+@register_processor
 class InterviewPrepIdealResponse(BaseIdealResponse):
     """
     Processor to generate ideal response for a given interview prep question using llm
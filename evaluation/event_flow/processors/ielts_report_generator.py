@@ -7,6 +7,7 @@ from common.utilities import round_to_pt5
 
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.services.llm_service.openai_service import OpenAIService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class Band:
     result: typing.Union[str | float | int]
 
 
+@register_processor
 class IELTSReportGenerator(EventProcessor):
     base_prompt = """You are a communication coach which rates the user on the following parameters and scale:
 
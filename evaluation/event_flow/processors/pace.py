@@ -5,10 +5,12 @@ import json
 from evaluation.event_flow.helpers.pace import evaluate_pace
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.storagemixin import ProcessorStorageMixin
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class Pace(EventProcessor,ProcessorStorageMixin):
 
     def set_vars_from_full_output_json(self):
@@ -1,23 +1,21 @@
-from datetime import datetime
 import logging
 
+from evaluation.event_flow.helpers.audio_cache import AudioArtifactCache
 from evaluation.event_flow.helpers.pitch import evaluate_pitch
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
-from storage_service.azure_storage import AzureStorageService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class Pitch(EventProcessor):
     def initialize(self):
-        azure_obj = AzureStorageService()
         # self.audio_blob_path = self.root_arguments.get("audio_blob_path")
         self.converted_audio_output_path = self.root_arguments.get("converted_audio_blob_path")
         self.storage_container_name = self.root_arguments.get("storage_container_name")
-        wav_binary_data = azure_obj.read_blob(self.storage_container_name, self.converted_audio_output_path)
-        self.sound_file = "wav_binary_data" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".wav"
-        with open(self.sound_file, "wb") as f:
-            f.write(wav_binary_data)
+        self.sound_file = AudioArtifactCache().get_local_path(self.storage_container_name,
+                                                              self.converted_audio_output_path)
 
     def _execute(self):
         self.initialize()
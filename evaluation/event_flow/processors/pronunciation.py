@@ -4,10 +4,12 @@ import logging
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.expections import ProcessorException
 from django.conf import settings
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class Pronunciation(EventProcessor):
 
     def get_fallback_result(self):
@@ -8,6 +8,7 @@ from OpenAIService.repositories import (
 )
 from evaluation.event_flow.helpers.sentiment import evaluate_sentiment
 from evaluation.event_flow.processors.base_llm_processor import BaseLLMProcessor
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class Response(BaseModel):
     confidence_rating: str  # HIGH/MODERATE/LOW
 
 
+@register_processor
 class Sentiment(BaseLLMProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -1,5 +1,7 @@
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
+from evaluation.event_flow.core.processor_registry import register_processor
 
+@register_processor
 class SpeakingFinalScore(EventProcessor):
 
     def initialize(self):
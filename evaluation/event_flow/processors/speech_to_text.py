@@ -1,18 +1,23 @@
 import json
+import os
 import subprocess
+import tempfile
 from datetime import datetime, timedelta
 import logging
 import random
 import string
+from evaluation.event_flow.helpers.audio_cache import AudioArtifactCache
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.event_flow.processors.expections import CriticalProcessorException
 from evaluation.event_flow.services.whisper_timestamped_service import WhisperTimestampService,DeepgramWhisperService
 from storage_service.azure_storage import AzureStorageService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 WORDS_THRESHOLD = 10
 
+@register_processor
 class SpeechToText(EventProcessor):
     """
     Testing code
@@ -73,15 +78,19 @@ class SpeechToText(EventProcessor):
             raise ValueError(f"Got error while converting audio. FFMPEG output =  {output}")
 
     def convert_and_upload_audio(self):
-        temp_initial_audio_path = self.get_random_string("initial_audio_",".wav")
-        temp_converted_audio_path = self.get_random_string("initial_converted_audio_",".wav")
-        self.azure_storage_service.download_blob(container_name=self.storage_container_name,
-                                                 blob_name=self.audio_blob_path, file_path=temp_initial_audio_path)
-        self.convert_audio(audio_path=temp_initial_audio_path, converted_audio_path=temp_converted_audio_path)
-        converted_audio_bytes = open(temp_converted_audio_path, "rb").read()
-        self.azure_storage_service.upload_blob(container_name=self.storage_container_name,
-                                               blob_name=self.converted_audio_output_path,
-                                               content=converted_audio_bytes)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_initial_audio_path = os.path.join(temp_dir, self.get_random_string("initial_audio_",".wav"))
+            temp_converted_audio_path = os.path.join(temp_dir, self.get_random_string("initial_converted_audio_",".wav"))
+            self.azure_storage_service.download_to_path(container_name=self.storage_container_name,
+                                                        blob_name=self.audio_blob_path,
+                                                        file_path=temp_initial_audio_path)
+            self.convert_audio(audio_path=temp_initial_audio_path, converted_audio_path=temp_converted_audio_path)
+            self.azure_storage_service.upload_from_path(container_name=self.storage_container_name,
+                                                        blob_name=self.converted_audio_output_path,
+                                                        file_path=temp_converted_audio_path)
+            # Keeping the converted audio in the cache directory, shared with the cpu worker running Pitch
+            AudioArtifactCache().put_file(self.storage_container_name, self.converted_audio_output_path,
+                                          temp_converted_audio_path)
 
     def _execute(self):
         self.initialize()
@@ -1,8 +1,10 @@
 
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
 from evaluation.models import UserAttemptResponseEvaluation
+from evaluation.event_flow.core.processor_registry import register_processor
 
 
+@register_processor
 class AbortHandler(EventProcessor):
 
     def initialize(self):
@@ -1,6 +1,8 @@
 from evaluation.event_flow.processors.base_event_processor import EventProcessor
+from evaluation.event_flow.core.processor_registry import register_processor
 
 
+@register_processor
 class TestingProcessor(EventProcessor):
 
     def initialize(self):
@@ -6,10 +6,12 @@ from evaluation.event_flow.processors.expections import ProcessorException
 from evaluation.vocab.vocab import evaluate_vocab
 from evaluation.vocab.vocab_predictor import evaluate_vocab_level
 from evaluation.event_flow.services.cefr_level_service import CEFRLevelService
+from evaluation.event_flow.core.processor_registry import register_processor
 
 logger = logging.getLogger(__name__)
 
 
+@register_processor
 class Vocab(EventProcessor):
 
     def get_fallback_result(self):
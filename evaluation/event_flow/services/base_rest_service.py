@@ -1,10 +1,16 @@
 import abc
 import dataclasses
+import json
+import os
+import threading
+import time
 import typing
+from collections import defaultdict
+from http.cookiejar import DefaultCookiePolicy
 from django.conf import settings
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3 import Retry
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, Retry
 
 import logging
 
@@ -28,6 +34,138 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 
+class ConnectionCounter:
+    """
+    Counts the connections opened by the calling thread (greenlet under gevent), so a request is only charged with
+    the connections it opened itself, even when other threads share its session.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def increment(cls):
+        cls._local.count = cls.get() + 1
+
+    @classmethod
+    def get(cls) -> int:
+        return getattr(cls._local, "count", 0)
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        ConnectionCounter.increment()
+        return super()._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        ConnectionCounter.increment()
+        return super()._new_conn()
+
+
+class ConnectionCountingHTTPAdapter(TimeoutHTTPAdapter):
+    """
+    TimeoutHTTPAdapter whose pools count every connection they open in ConnectionCounter.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class RestSessionPool:
+    """
+    Per-process pool of keep-alive sessions, shared by all BaseRestService instances. A session (and its urllib3
+    connection pools) is created once per base url and adapter config, so repeated calls to the same service reuse
+    TCP+TLS connections instead of handshaking on every request.
+
+    Sessions are dropped in forked children (celery prefork, gunicorn workers), since sockets inherited from the
+    parent must not be shared between processes. Sessions don't keep cookies, a cookie set for one caller must not be
+    sent on behalf of another.
+    """
+
+    _sessions: typing.Dict[tuple, requests.Session] = {}
+    _lock = threading.Lock()
+    _pid = os.getpid()
+
+    @classmethod
+    def reset(cls):
+        cls._sessions = {}
+        cls._lock = threading.Lock()
+        cls._pid = os.getpid()
+
+    @classmethod
+    def get_session(cls, *, base_url: str, timeout: tuple, retries: Retry | None) -> requests.Session:
+        if cls._pid != os.getpid():
+            cls.reset()
+
+        key = (base_url, timeout, None if retries is None else retries.total)
+        session = cls._sessions.get(key)
+        if session is not None:
+            return session
+
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                adapter_kwargs = dict(timeout=timeout,
+                                      pool_connections=settings.REST_SERVICE_POOL_CONNECTIONS,
+                                      pool_maxsize=settings.REST_SERVICE_POOL_MAXSIZE)
+                if retries is not None:
+                    adapter_kwargs["max_retries"] = retries
+                adapter = ConnectionCountingHTTPAdapter(**adapter_kwargs)
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                cls._sessions[key] = session
+        return session
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=RestSessionPool.reset)
+
+
+class RestServiceMetrics:
+    """
+    Process local counters of requests, newly opened connections and latency per service class. Every
+    REST_SERVICE_METRICS_LOG_INTERVAL_SECONDS the counters of the process are logged, for log based metrics.
+    """
+
+    _metrics = defaultdict(lambda: {"requests": 0, "new_connections": 0, "total_latency_ms": 0.0})
+    _lock = threading.Lock()
+    _last_logged_at = time.monotonic()
+
+    @classmethod
+    def record(cls, *, service_name: str, latency_ms: float, new_connections: int):
+        now = time.monotonic()
+        with cls._lock:
+            metrics = cls._metrics[service_name]
+            metrics["requests"] += 1
+            metrics["new_connections"] += new_connections
+            metrics["total_latency_ms"] += latency_ms
+            should_log = now - cls._last_logged_at >= settings.REST_SERVICE_METRICS_LOG_INTERVAL_SECONDS
+            if should_log:
+                cls._last_logged_at = now
+        if should_log:
+            logger.info(f"rest_service_metrics pid={os.getpid()} {json.dumps(cls.get_metrics())}")
+
+    @classmethod
+    def get_metrics(cls) -> typing.Dict[str, typing.Dict]:
+        with cls._lock:
+            snapshot = {}
+            for service_name, metrics in cls._metrics.items():
+                requests_count = metrics["requests"]
+                snapshot[service_name] = {
+                    **metrics,
+                    "connection_reuse_ratio": 1 - metrics["new_connections"] / requests_count,
+                    "avg_latency_ms": metrics["total_latency_ms"] / requests_count,
+                }
+            return snapshot
+
+
 # class SpeechToTextResponseDTO(dataclasses.dataclass):
 #     success: bool
 #     output_upload_response: str
@@ -50,30 +188,38 @@ class BaseRestService(abc.ABC):
         self.retries = Retry(total=kwargs.get('max_retries', MAX_RETRIES))
 
     def __get_session(self, use_retry=False):
-        s = requests.Session()
-        if use_retry:
-            adapter = TimeoutHTTPAdapter(max_retries=self.retries, timeout=(self._connection_timeout, self._timeout,))
-        else:
-            adapter = TimeoutHTTPAdapter(timeout=(self._connection_timeout, self._timeout,))
-        s.mount('http://', adapter)
-        s.mount('https://', adapter)
-        return s
+        return RestSessionPool.get_session(base_url=self.base_url,
+                                           timeout=(self._connection_timeout, self._timeout,),
+                                           retries=self.retries if use_retry else None)
+
+    def __send(self, method, url, *, use_retry, **kwargs):
+        session = self.__get_session(use_retry=use_retry)
+        connections_before = ConnectionCounter.get()
+        start = time.perf_counter()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            new_connections = ConnectionCounter.get() - connections_before
+            RestServiceMetrics.record(service_name=self.__class__.__name__, latency_ms=latency_ms,
+                                      new_connections=new_connections)
+            logger.debug(f"{self.__class__.__name__} {method} {url} took {latency_ms:.1f}ms, "
+                         f"reused_connection={new_connections == 0}")
 
     def _get_request(self, *, url, params=None, use_retry=True, custom_headers=None):
         custom_headers = {} if custom_headers is None else custom_headers
         headers = {'accept': 'application/json', **self.get_base_headers()}
         headers = {**headers, **custom_headers}
-        return self.__get_session(use_retry=use_retry).get(url, params=params, headers=headers)
+        return self.__send('GET', url, use_retry=use_retry, params=params, headers=headers)
 
     def _post_request(self, *, url, data: typing.Dict, use_retry=True, custom_headers=None):
         custom_headers = {} if custom_headers is None else custom_headers
         headers = {'content-type': 'application/json', **self.get_base_headers()}
         headers = {**headers, **custom_headers}
-        return self.__get_session(use_retry=use_retry).post(url, json=data, headers=headers)
+        return self.__send('POST', url, use_retry=use_retry, json=data, headers=headers)
     
     def _patch_request(self, *, url, data: typing.Dict, use_retry=True, custom_headers=None):
         custom_headers = {} if custom_headers is None else custom_headers
         headers = {'content-type': 'application/json', **self.get_base_headers()}
         headers = {**headers, **custom_headers}
-        return self.__get_session(use_retry=use_retry).patch(url, json=data, headers=headers)
-
+        return self.__send('PATCH', url, use_retry=use_retry, json=data, headers=headers)
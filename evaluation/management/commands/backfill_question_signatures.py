@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from evaluation.models import Question
+
+
+class Command(BaseCommand):
+    help = "Computes the content signature of questions, used for duplicate detection on question upload"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--all", action="store_true",
+                            help="Recompute signatures of all questions instead of only the missing ones")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        questions = Question.objects.order_by("id").only("id", "answer_type", "sub_category", "question_data")
+        if not options["all"]:
+            questions = questions.filter(signature__isnull=True)
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(questions.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            for question in batch:
+                question.signature = Question.compute_signature(
+                    question.answer_type, question.sub_category, question.question_data
+                )
+            Question.objects.bulk_update(batch, ["signature"])
+            updated += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"Processed {updated} questions")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled signatures of {updated} questions"))
@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy.ndimage import gaussian_filter1d
+
+from evaluation.event_flow.helpers.pitch import calculate_pitch, calculate_pitch_with_loops
+
+
+class SyntheticPitch:
+    """
+    Stands in for a parselmouth Pitch object, with parselmouth's default 10ms time step.
+    """
+
+    TIME_STEP = 0.01
+
+    def __init__(self, duration_in_seconds: int):
+        num_frames = int(duration_in_seconds / self.TIME_STEP)
+        self._xs = self.TIME_STEP / 2 + np.arange(num_frames) * self.TIME_STEP
+        self.duration = float(duration_in_seconds)
+
+    def xs(self):
+        return self._xs.copy()
+
+
+class Command(BaseCommand):
+    help = "Benchmarks pitch analysis, loop based vs vectorised, on synthetic 1, 5 and 20 minute recordings"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--minutes", type=int, nargs="+", default=[1, 5, 20])
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        for minutes in options["minutes"]:
+            pitch = SyntheticPitch(minutes * 60)
+            num_frames = len(pitch.xs())
+            pitch_values = 180 + np.cumsum(rng.normal(0, 3, num_frames)) + 40 * np.sin(np.arange(num_frames) / 700)
+            smoothed_pitch_values = gaussian_filter1d(pitch_values, sigma=200)
+            average_pitch = np.mean(pitch_values)
+
+            start = time.perf_counter()
+            loop_result = calculate_pitch_with_loops(pitch, average_pitch, smoothed_pitch_values)
+            loop_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            vectorised_result = calculate_pitch(pitch, average_pitch, smoothed_pitch_values)
+            vectorised_time = time.perf_counter() - start
+
+            if repr(loop_result) != repr(vectorised_result):
+                raise AssertionError(f"Vectorised pitch analysis differs from loop based one for {minutes} minutes")
+
+            self.stdout.write(
+                f"{minutes:>3} min: loops {loop_time * 1000:.1f}ms, vectorised {vectorised_time * 1000:.2f}ms, "
+                f"speedup {loop_time / vectorised_time:.0f}x"
+            )
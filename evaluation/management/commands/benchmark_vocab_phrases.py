@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from evaluation.vocab.phrase_matcher import CefrPhraseMatcher, match_phrases_with_regex_scan
+from evaluation.vocab.vocab import VocabLexicon
+
+SAMPLE_TRANSCRIPTS = [
+    "Hello, my name is Priya and I am from Pune. I have just finished my graduation in commerce and I would like "
+    "to work in the banking sector. In my free time I enjoy reading novels and I go for a walk every morning. "
+    "I hope that I will get a good job soon, and then I want to do an MBA.",
+    "Well, to be honest, I think technology has changed the way we communicate. On the one hand, it is much easier "
+    "to keep in touch with friends and family who live far away. On the other hand, people spend too much time on "
+    "their phones and don't talk face to face any more. As far as I'm concerned, we should find a balance.",
+    "The place I would like to describe is a small hill station near my hometown. I went there last year with my "
+    "cousins. What I liked the most was the weather, it was cool and pleasant, and the view from the top of the "
+    "hill was breathtaking. I'd like to go there again because it helped me to relax and take my mind off work.",
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks CEFR phrase detection, regex scan over all phrases vs the precompiled phrase index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--transcript-file", type=str, default=None,
+                            help="Optional file with one transcript per line, used instead of the built-in samples")
+
+    def handle(self, *args, **options):
+        transcripts = SAMPLE_TRANSCRIPTS
+        if options["transcript_file"]:
+            with open(options["transcript_file"]) as transcript_file:
+                transcripts = [line.strip() for line in transcript_file if line.strip()]
+        iterations = options["iterations"]
+
+        phrase_level_mapping = VocabLexicon._load_json("cefrPhrases.json")
+
+        start = time.perf_counter()
+        matcher = CefrPhraseMatcher(phrase_level_mapping)
+        build_time = time.perf_counter() - start
+
+        for transcript in transcripts:
+            if matcher.match(transcript) != match_phrases_with_regex_scan(phrase_level_mapping, transcript):
+                raise AssertionError(f"Phrase index result differs from regex scan for transcript: {transcript}")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for transcript in transcripts:
+                match_phrases_with_regex_scan(phrase_level_mapping, transcript)
+        regex_scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for transcript in transcripts:
+                matcher.match(transcript)
+        phrase_index_time = time.perf_counter() - start
+
+        runs = iterations * len(transcripts)
+        self.stdout.write(f"Phrases: {len(phrase_level_mapping)}, transcripts: {len(transcripts)}, runs: {runs}")
+        self.stdout.write(f"Phrase index build time: {build_time * 1000:.1f}ms (once per process)")
+        self.stdout.write(f"Regex scan:   {regex_scan_time / runs * 1000:.2f}ms per transcript")
+        self.stdout.write(f"Phrase index: {phrase_index_time / runs * 1000:.2f}ms per transcript")
+        self.stdout.write(f"Speedup: {regex_scan_time / phrase_index_time:.1f}x")
@@ -1,4 +1,5 @@
 from asyncio.log import logger
+import hashlib
 import json
 import os
 from django.conf import settings
@@ -229,109 +230,315 @@ class GDWrapper:
     def smart_update_sheet(self, sheet_name, new_data, key_fields):
         """
         Updates sheet by comparing existing data with new data based on key fields.
-        
+        Only the rows whose content changed are re-sent, new keys are appended and rows
+        missing from new_data are kept as they are.
+
         Args:
             sheet_name (str): Name of the sheet to update
             new_data (list): List of dictionaries containing new data
             key_fields (list): List of field names to use as unique identifiers
         """
         logger.info(f"Smart updating sheet {sheet_name} using keys: {key_fields}")
+        self.sync_sheet(sheet_name, new_data, key_fields=key_fields)
 
-        # Get existing data
-        existing_data = self.get_sheet_as_json(sheet_name)
-        
-        # Create a dictionary of existing data using key fields as composite key
-        existing_data_dict = {}
-        for row in existing_data:
-            composite_key = tuple(str(row.get(key, '')) for key in key_fields)
-            existing_data_dict[composite_key] = row
-
-        # Process new data
-        updated_data = existing_data.copy()  # Start with existing data
-        for new_row in new_data:
-            # Create composite key for new row
-            composite_key = tuple(str(new_row.get(key, '')) for key in key_fields)
-            
-            if composite_key in existing_data_dict:
-                # Row exists - check if update needed
-                existing_row = existing_data_dict[composite_key]
-                if self._row_needs_update(existing_row, new_row):
-                    logger.info(f"Updating existing row with key: {composite_key}")
-                    # Find and update the row in updated_data
-                    for i, row in enumerate(updated_data):
-                        if all(str(row.get(key, '')) == str(new_row.get(key, '')) for key in key_fields):
-                            updated_data[i] = new_row
-                            break
-            else:
-                # New row - append to data
-                logger.info(f"Adding new row with key: {composite_key}")
-                updated_data.append(new_row)
-
-        # Update sheet with final data
-        self.update_sheet(sheet_name, updated_data)
-
-    def _row_needs_update(self, existing_row, new_row):
-        """
-        Compare existing and new row to determine if update is needed.
-        Returns True if rows are different, False if they're the same.
-        """
-        return any(
-            str(existing_row.get(key, '')) != str(new_row.get(key, ''))
-            for key in set(existing_row.keys()) | set(new_row.keys())
-        )
-    
     def append_to_sheet(self, sheet_name, data):
         """
         Appends new data to an existing sheet without clearing existing content.
         Handles empty data and prevents duplicate rows.
-        
+
         Args:
             sheet_name (str): Name of the sheet to append to
             data (list): List of dictionaries containing the data to append
         """
+        logger.info(f"Appending data to sheet {sheet_name}")
+        # The whole row is the key, so rows already in the sheet are skipped and the rest appended
+        self.sync_sheet(sheet_name, data, key_fields=None)
+
+    def sync_sheet(self, sheet_name, data, key_fields=None, keep_missing_rows=True):
+        """
+        Writes data to the sheet with a single values.batchUpdate holding only the changed row
+        ranges and the appended rows.
+
+        Existing rows are indexed by the composite key of key_fields (the whole row when None)
+        together with a content hash. The index is cached locally per spreadsheet and sheet, and
+        checked before every write against the header, the row count and the key columns read
+        from the sheet (the first column for sheets keyed on the whole row). If rows were edited,
+        sorted or deleted by hand, or written from another host, the check fails and the index is
+        rebuilt from the whole sheet.
+
+        Args:
+            sheet_name (str): Name of the sheet to sync
+            data (list): List of dictionaries containing the data
+            key_fields (list): Field names used as composite key, None to key on the whole row
+            keep_missing_rows (bool): Whether rows of the sheet missing from data are kept. When
+                False and rows have to go, the sheet is rewritten like update_sheet does.
+        """
         if not data:
-            logger.info(f"No data to append to sheet {sheet_name}")
+            logger.info(f"No data to sync to sheet {sheet_name}")
             return
 
-        logger.info(f"Appending data to sheet {sheet_name}")
+        header = list(data[0].keys())
+        key_indexes = (
+            [header.index(field) for field in key_fields] if key_fields else None
+        )
+        rows = [self._to_row(entry, header) for entry in data]
+
+        state = self._load_sync_state(sheet_name)
+        if state is not None and (
+            state["header"] != header
+            or state.get("key_indexes") != key_indexes
+            or not self._is_sync_state_current(sheet_name, state, key_indexes)
+        ):
+            logger.info(f"Sheet {sheet_name} doesn't match its cached index, rebuilding it")
+            state = None
+        if state is None:
+            state = self._build_sync_state(sheet_name, header, key_indexes, rows, keep_missing_rows)
+            if state is None:
+                # Sheet has a different header, it was rewritten from scratch
+                return
+
+        if not keep_missing_rows:
+            keys = [self._get_row_key(row, key_indexes) for row in rows]
+            if len(set(keys)) != len(keys) or not set(state["rows"]) <= set(keys):
+                logger.info(f"Rows of sheet {sheet_name} are gone from the data, rewriting the sheet")
+                self._rewrite_sheet(sheet_name, header, key_indexes, rows)
+                return
+
+        changed_rows, appended_rows = self._get_row_changes(state, rows, key_indexes)
+        updated_count = len(changed_rows)
+        if state["row_count"] == 0:
+            # Empty sheet, the header goes out with the first range
+            changed_rows[1] = header
+            state["row_count"] = 1
+        next_row_number = state["row_count"] + 1
+        for key, row in appended_rows.items():
+            state["rows"][key] = [next_row_number, self._get_row_hash(row)]
+            changed_rows[next_row_number] = row
+            next_row_number += 1
+
+        if not changed_rows:
+            self._save_sync_state(sheet_name, state)
+            logger.info(f"Sheet {sheet_name} is up to date")
+            return
+
+        if appended_rows:
+            self._ensure_row_count(sheet_name, next_row_number - 1)
+
+        value_ranges = [
+            {"range": self._get_a1_range(sheet_name, start, len(header)), "values": values}
+            for start, values in self._group_contiguous_rows(changed_rows)
+        ]
+        self.sheets_service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.speadsheet_id,
+            body={"valueInputOption": "RAW", "data": value_ranges},
+        ).execute()
+
+        state["row_count"] = next_row_number - 1
+        self._save_sync_state(sheet_name, state)
+        logger.info(
+            f"Synced sheet {sheet_name}: {updated_count} rows updated, "
+            f"{len(appended_rows)} rows appended in {len(value_ranges)} ranges"
+        )
 
-        # Get existing data to check for duplicates
+    def _get_row_changes(self, state, rows, key_indexes):
+        """
+        Splits rows into the indexed rows whose content changed, by row number, and the rows
+        with a new key to append, by key. Changed rows are updated in the index.
+        """
+        index = state["rows"]
+        changed_rows = {}
+        appended_rows = {}
+        for row in rows:
+            key = self._get_row_key(row, key_indexes)
+            row_hash = self._get_row_hash(row)
+            if key in index:
+                row_number, existing_hash = index[key]
+                if existing_hash != row_hash:
+                    changed_rows[row_number] = row
+                    index[key] = [row_number, row_hash]
+            else:
+                # A key repeated within the data itself is appended once, the last row wins
+                appended_rows[key] = row
+        return changed_rows, appended_rows
+
+    def _rewrite_sheet(self, sheet_name, header, key_indexes, rows):
+        self.update_sheet(sheet_name, [dict(zip(header, row)) for row in rows])
+        state = {"header": header, "key_indexes": key_indexes, "row_count": len(rows) + 1, "rows": {}}
+        for row_number, row in enumerate(rows, start=2):
+            state["rows"][self._get_row_key(row, key_indexes)] = [row_number, self._get_row_hash(row)]
+        self._save_sync_state(sheet_name, state)
+
+    def _build_sync_state(self, sheet_name, header, key_indexes, rows, keep_missing_rows=True):
+        """
+        Indexes the rows currently in the sheet. Returns None if the sheet had to be rewritten
+        because its header doesn't match the data.
+        """
         existing_data = self.get_existing_data(sheet_name)
-        
-        # Get fieldnames from the first data entry
-        fieldnames = data[0].keys()
-        
-        # Convert data to rows, checking for duplicates
-        values = []
-        for entry in data:
-            row = []
-            for field in fieldnames:
-                value = entry.get(field, "")
-                if isinstance(value, dict):
-                    value = json.dumps(value)
-                row.append(str(value))
-            
-            # Skip if row already exists in sheet
-            if not self.is_row_in_existing_data(row, existing_data):
-                values.append(row)
+        state = {"header": header, "key_indexes": key_indexes, "row_count": 0, "rows": {}}
 
-        if not values:
-            logger.info("No new unique rows to append")
+        if not existing_data:
+            return state
+
+        if existing_data[0] != header:
+            logger.info(f"Header of sheet {sheet_name} changed, rewriting the sheet")
+            merged = {}
+            if keep_missing_rows:
+                existing_header = existing_data[0]
+                for existing_row in existing_data[1:]:
+                    entry = dict(zip(existing_header, existing_row))
+                    row = [entry.get(field, "") for field in header]
+                    merged[self._get_row_key(row, key_indexes)] = row
+            for row in rows:
+                merged[self._get_row_key(row, key_indexes)] = row
+            self._rewrite_sheet(sheet_name, header, key_indexes, list(merged.values()))
+            return None
+
+        for row_number, existing_row in enumerate(existing_data[1:], start=2):
+            # The API drops trailing empty cells
+            row = existing_row + [""] * (len(header) - len(existing_row))
+            state["rows"][self._get_row_key(row, key_indexes)] = [
+                row_number,
+                self._get_row_hash(row),
+            ]
+        state["row_count"] = len(existing_data)
+        return state
+
+    def _is_sync_state_current(self, sheet_name, state, key_indexes):
+        """
+        Reads the header and key columns of the sheet (the first column for sheets keyed on the
+        whole row) and checks the cached index still has every key at the same row number, with no
+        rows added or removed since.
+        """
+        check_indexes = key_indexes or [0]
+        escaped_sheet_name = sheet_name.replace("'", "''")
+        column_count = len(state["header"])
+        ranges = [f"'{escaped_sheet_name}'!A1:{self._get_column_letter(column_count)}1"] + [
+            f"'{escaped_sheet_name}'!{self._get_column_letter(index + 1)}2:{self._get_column_letter(index + 1)}"
+            for index in check_indexes
+        ]
+        result = self.sheets_service.spreadsheets().values().batchGet(
+            spreadsheetId=self.speadsheet_id, ranges=ranges, majorDimension="COLUMNS"
+        ).execute()
+        value_ranges = result.get("valueRanges", [])
+        header_columns = value_ranges[0].get("values", [])
+        sheet_header = [column[0] if column else "" for column in header_columns]
+        sheet_header += [""] * (column_count - len(sheet_header))
+        if state["row_count"] == 0:
+            return not any(sheet_header)
+        if sheet_header != state["header"]:
+            return False
+
+        check_columns = [
+            (value_range.get("values") or [[]])[0] for value_range in value_ranges[1:]
+        ]
+        row_count = max(len(column) for column in check_columns) + 1
+        if row_count != state["row_count"]:
+            return False
+        cached_values = {}
+        for key, (row_number, _) in state["rows"].items():
+            key_values = json.loads(key)
+            cached_values[row_number] = key_values if key_indexes else key_values[:1]
+        for row_number in range(2, row_count + 1):
+            if row_number not in cached_values:
+                # Duplicate of an indexed row, already in the sheet when the index was built
+                continue
+            # The API drops trailing empty cells
+            values = [
+                column[row_number - 2] if row_number - 2 < len(column) else "" for column in check_columns
+            ]
+            if cached_values[row_number] != values:
+                return False
+        return True
+
+    def _ensure_row_count(self, sheet_name, row_count):
+        # values.batchUpdate doesn't grow the grid, unlike values.append
+        sheet = self.get_or_create_sheet(sheet_name)
+        if "replies" in sheet:
+            # Sheet was just created
+            sheet = sheet["replies"][0]["addSheet"]
+        properties = sheet["properties"]
+        current_row_count = properties["gridProperties"]["rowCount"]
+        if current_row_count >= row_count:
             return
+        self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=self.speadsheet_id,
+            body={
+                "requests": [
+                    {
+                        "appendDimension": {
+                            "sheetId": properties["sheetId"],
+                            "dimension": "ROWS",
+                            "length": row_count - current_row_count,
+                        }
+                    }
+                ]
+            },
+        ).execute()
 
-        body = {"values": values}
-        result = (
-            self.sheets_service.spreadsheets()
-            .values()
-            .append(
-                spreadsheetId=self.speadsheet_id,
-                range=sheet_name,
-                valueInputOption="RAW",
-                body=body,
-                insertDataOption="INSERT_ROWS"
-            )
-            .execute()
-        )
+    @staticmethod
+    def _to_row(entry, header):
+        row = []
+        for field in header:
+            value = entry.get(field, "")
+            if isinstance(value, dict):
+                value = json.dumps(value)
+            row.append(str(value))
+        return row
+
+    @staticmethod
+    def _get_row_key(row, key_indexes):
+        values = row if key_indexes is None else [row[i] for i in key_indexes]
+        return json.dumps(values)
+
+    @staticmethod
+    def _get_row_hash(row):
+        return hashlib.sha1(json.dumps(row).encode()).hexdigest()
+
+    @staticmethod
+    def _group_contiguous_rows(rows_by_number):
+        """
+        Yields (start row number, rows) for each run of consecutive row numbers.
+        """
+        start, values = None, []
+        for row_number in sorted(rows_by_number):
+            if values and row_number != start + len(values):
+                yield start, values
+                start, values = None, []
+            if start is None:
+                start = row_number
+            values.append(rows_by_number[row_number])
+        if values:
+            yield start, values
+
+    @staticmethod
+    def _get_column_letter(column_number):
+        column, remaining = "", column_number
+        while remaining:
+            remaining, offset = divmod(remaining - 1, 26)
+            column = chr(ord("A") + offset) + column
+        return column
+
+    @staticmethod
+    def _get_a1_range(sheet_name, start_row, column_count):
+        column = GDWrapper._get_column_letter(column_count)
+        escaped_sheet_name = sheet_name.replace("'", "''")
+        return f"'{escaped_sheet_name}'!A{start_row}:{column}"
+
+    def _get_sync_state_path(self, sheet_name):
+        file_name = hashlib.sha1(f"{self.speadsheet_id}:{sheet_name}".encode()).hexdigest()
+        return os.path.join(settings.GD_SYNC_CACHE_DIR, f"{file_name}.json")
+
+    def _load_sync_state(self, sheet_name):
+        try:
+            with open(self._get_sync_state_path(sheet_name)) as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return None
 
-        logger.info(f"Successfully appended {len(values)} unique rows to sheet {sheet_name}")
-    
+    def _save_sync_state(self, sheet_name, state):
+        path = self._get_sync_state_path(sheet_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_path, path)
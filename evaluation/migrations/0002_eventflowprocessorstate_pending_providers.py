@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def populate_pending_providers(apps, schema_editor):
+    """
+    Eventflows which are in flight during the deploy need their counters set, otherwise their pending processors
+    will never become ready.
+    """
+    from evaluation.event_flow.core.dag_config import DAG
+
+    EventFlow = apps.get_model("evaluation", "EventFlow")
+    EventFlowProcessorState = apps.get_model("evaluation", "EventFlowProcessorState")
+
+    completion_states = (3, 5)  # EventFlowProcessorState.COMPLETION_STATES
+    for eventflow in EventFlow.objects.filter(status=1).iterator():
+        dag = DAG.get(eventflow.type)
+        if dag is None:
+            continue
+        states = list(EventFlowProcessorState.objects.filter(event_flow=eventflow))
+        done = {state.processor_name for state in states if state.status in completion_states}
+        for state in states:
+            providers = dag["processors"].get(state.processor_name, {}).get("depends_on", [])
+            state.pending_providers = len([p for p in providers if p not in done])
+        EventFlowProcessorState.objects.bulk_update(states, ["pending_providers"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventflowprocessorstate',
+            name='pending_providers',
+            field=models.IntegerField(default=0, help_text='Number of providers of this processor which are yet to complete.'),
+        ),
+        migrations.RunPython(populate_pending_providers, migrations.RunPython.noop),
+    ]
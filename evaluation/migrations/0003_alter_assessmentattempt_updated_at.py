@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0002_eventflowprocessorstate_pending_providers"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="assessmentattempt",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0003_alter_assessmentattempt_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="signature",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import uuid
 import typing
@@ -186,6 +187,9 @@ class EventFlowProcessorState(TimeStampedModel):
     start_time = models.DateTimeField('Start time of event flow', null=True, blank=True)
 
     end_time = models.DateTimeField('Start time of event flow', null=True, blank=True)
+
+    pending_providers = models.IntegerField(default=0,
+                                            help_text=_("Number of providers of this processor which are yet to complete."))
     
     class Meta:
         constraints = [
@@ -277,9 +281,38 @@ class Question(models.Model):
     sub_category = models.IntegerField(choices=SubCategory.choices, blank=True, null=True) # can be RC, Speaking, Reading, Writing
     time_required = models.DurationField(default=datetime.timedelta(minutes=1))
     source = models.URLField(blank=True, null=True)
+    # Normalised content hash, see compute_signature. Used to detect duplicate question uploads
+    signature = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-        
+
+    @staticmethod
+    def compute_signature(answer_type, sub_category, question_data) -> typing.Optional[str]:
+        """
+        Hash of answer type, sub category and the identifying content of the question (passage for reading
+        comprehension, audio for listening, question text otherwise), lowercased and stripped.
+        Returns None for questions without such content.
+        """
+        if answer_type is None or sub_category is None or not isinstance(question_data, dict):
+            return None
+        if int(sub_category) == int(Question.SubCategory.RC):
+            content = question_data.get("paragraph")
+        elif int(sub_category) == int(Question.SubCategory.LISTENING):
+            content = question_data.get("audio_url")
+        else:
+            content = question_data.get("question")
+        if not isinstance(content, str):
+            return None
+        normalised = content.strip().lower()
+        return hashlib.sha256(f"{int(answer_type)}:{int(sub_category)}:{normalised}".encode("utf-8")).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.signature = Question.compute_signature(self.answer_type, self.sub_category, self.question_data)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"answer_type", "sub_category", "question_data"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"signature"}
+        super().save(*args, **kwargs)
+
     @property
     def check_is_scoring_enabled(self):
         if self.category != int(Question.Category.PERSONALITY):
@@ -366,7 +399,7 @@ class AssessmentAttempt(models.Model):
     last_saved_section = models.IntegerField(choices=Question.SubCategory.choices, blank=True, null=True)
     status = models.IntegerField(choices=Status.choices, default=Status.CREATION_PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     evaluation_triggered = models.BooleanField(default=False)
     start_time = models.DateTimeField(blank=True, null=True)
     test_duration = models.DurationField()
@@ -16,6 +16,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.exceptions import ValidationError
 import os
 from datetime import timedelta
+from django.db.models import F
 
 logger = logging.getLogger(__name__)
 
@@ -386,12 +387,35 @@ class AssessmentAttemptRepository:
     def fetch_all_assessments_attempts_data():
         assessments = AssessmentAttempt.objects.all()
         return assessments
+
+    @staticmethod
+    def fetch_completed_assessments_of_students_updated_between(since, until):
+        """
+        Completed assessment attempts of students changed after since (all attempts when None) and up to until,
+        one row per attempt and course the assessment belongs to (through its modules).
+        """
+        assessments = AssessmentAttempt.objects.filter(
+            updated_at__lte=until,
+            user_id__is_student=True,
+            assessment_generation_config_id__modules__isnull=False,
+            status=AssessmentAttempt.Status.COMPLETED
+        )
+        if since is not None:
+            assessments = assessments.filter(updated_at__gt=since)
+        return assessments.values(
+            'user_id_id',
+            'assessment_id',
+            'test_duration',
+            'updated_at',
+            'assessment_generation_config_id__assessment_display_name',
+            course_id=F('assessment_generation_config_id__modules__course_id'),
+        ).order_by('assessment_id').distinct()
     
     def fetch_assessments_attempts_data_by_date(date):
         assessments = AssessmentAttempt.objects.filter(
             updated_at__date=date,
             status=AssessmentAttempt.Status.COMPLETED
-        )
+        ).select_related('assessment_generation_config_id')
         return assessments
 
 
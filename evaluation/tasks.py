@@ -1,10 +1,12 @@
+import json
 import logging
 
 from celery import shared_task
+from celery.signals import celeryd_after_setup, worker_process_init
+from django.conf import settings
 
-from evaluation.event_flow.processors.assessment_evaluator import AssessmentEvaluatorProcessor
-from evaluation.event_flow.processors.speaking_final_score import SpeakingFinalScore
-from evaluation.event_flow.processors.writing_final_score import WritingFinalScore
+from evaluation.event_flow.core.dag_config import RESOURCE_CLASSES
+from evaluation.event_flow.core.processor_registry import ProcessorRegistry
 from evaluation.repositories import AssessmentAttemptRepository
 from evaluation.models import AssessmentAttempt
 import openai
@@ -14,6 +16,21 @@ from config.celery import app
 logger = logging.getLogger(__name__)
 
 
+@celeryd_after_setup.connect
+def preload_queue_processors(sender, instance, **kwargs):
+    # Runs once -Q is applied and before the pool forks, children share the processor modules loaded here
+    ProcessorRegistry.preload_for_queues(instance.app.amqp.queues.consume_from.keys())
+
+
+@worker_process_init.connect
+def warm_up_vocab_lexicon(**kwargs):
+    # Loading the lexicon and spaCy model takes a few hundred ms, paying it at worker start instead of first task
+    if not settings.WARM_UP_VOCAB_LEXICON or not ProcessorRegistry.is_routed_to_worker("Vocab"):
+        return
+    from evaluation.vocab.vocab import VocabLexicon
+    VocabLexicon.warm_up()
+
+
 @shared_task
 def add(*, x, y):
     return x + y
@@ -29,110 +46,12 @@ def add(*, x, y):
 #           max_retries=3,
 #           # retry_jitter=True,
 #           ignore_result=True)
+# inputs and root_arguments are only passed by messages published before processors started reading them
+# from the eventflow, keep them optional till those are drained.
 @app.task(bind=True, max_retries=5)
-def call_event_processor(self, *, eventflow_id, processor_name, inputs, root_arguments):
-    from evaluation.event_flow.processors.fluency import Fluency
-    from evaluation.event_flow.processors.awkward_pauses import AwkwardPauses
-    from evaluation.event_flow.processors.ielts_report_generator import IELTSReportGenerator
-    from evaluation.event_flow.processors.interview_prep_report_generator import InteviewPrepReportGenerator
-    from evaluation.event_flow.processors.filler_words import FillerWords
-    from evaluation.event_flow.processors.pace import Pace
-    from evaluation.event_flow.processors.code_efficiency_processor import CodeEfficiencyProcessor
-    from evaluation.event_flow.processors.code_improvement_processor import CodeImprovementProcessor
-    from evaluation.event_flow.processors.code_quality_processor import CodeQualityProcessor
-    from evaluation.event_flow.processors.code_summary_processor import CodeSummaryProcessor
-    from evaluation.event_flow.processors.code_revision_topic_processor import CodeRevisionTopicProcessor
-    from evaluation.event_flow.processors.mock_behaviour_final_score import MockBehaviourFinalScore
-    from evaluation.event_flow.processors.pitch import Pitch
-    from evaluation.event_flow.processors.pronunciation import Pronunciation
-    from evaluation.event_flow.processors.vocab import Vocab
-    from evaluation.event_flow.processors.testingProcessor import TestingProcessor
-    from evaluation.event_flow.processors.db_saver_processors import (
-        CoherenceSaver,
-        PronunciationSaver,
-        FluencySaver,
-        VocabSaver,
-        IELTSGrammarSaver,
-        InterviewPrepGrammarSaver,
-        SentimentSaver,
-        IELTSEvaluationSaver,
-        InterviewEvaluationSaver,
-        IELTSIdealResponseSaver,
-        InterviewPrepIdealResponseSaver,
-        SpeakingSaver,
-        WritingSaver,
-        DSAResponseSaverEfficiency,
-        DSAResponseSaverImprovement,
-        DSAResponseSaverQuality,
-        DSAResponseSaverRevision,
-        DSAResponseSaverSummary,
-        DSAMarkAsCompleteSaver,
-         MockBehaviouralSaver
-    )
-    from evaluation.event_flow.processors.coherence import Coherence
-    from evaluation.event_flow.processors.grammar import Grammar
-    from evaluation.event_flow.processors.interview_prep_grammar import InterviewPrepGrammar
-    from evaluation.event_flow.processors.speech_to_text import SpeechToText
-    from evaluation.event_flow.processors.sentiment import Sentiment
-    from evaluation.event_flow.processors.termination_processors import AbortHandler
-    from evaluation.event_flow.processors.ideal_response_processors import (
-        IELTSIdealResponse,
-        InterviewPrepIdealResponse,
-    )
+def call_event_processor(self, *, eventflow_id, processor_name, inputs=None, root_arguments=None):
     logger.info(f"Task {self.__dict__}")
-    processors = [
-        SpeechToText,
-        Pace,
-        Coherence,
-        Fluency,
-        FillerWords,
-        Vocab,
-        Pronunciation,
-        Grammar,
-        InterviewPrepGrammar,
-        Pitch,
-        CoherenceSaver,
-        PronunciationSaver,
-        FluencySaver,
-        VocabSaver,
-        IELTSGrammarSaver,
-        InterviewPrepGrammarSaver,
-        SentimentSaver,
-        IELTSReportGenerator,
-        IELTSEvaluationSaver,
-        InteviewPrepReportGenerator,
-        InterviewEvaluationSaver,
-        AwkwardPauses,
-        Sentiment,
-        AbortHandler,
-        IELTSIdealResponse,
-        InterviewPrepIdealResponse,
-        IELTSIdealResponseSaver,
-        InterviewPrepIdealResponseSaver,
-        SpeakingSaver,
-        WritingSaver,
-        SpeakingFinalScore,
-        WritingFinalScore,
-        AssessmentEvaluatorProcessor,
-        CodeEfficiencyProcessor,
-        CodeQualityProcessor,
-        CodeImprovementProcessor,
-        CodeRevisionTopicProcessor,
-        CodeSummaryProcessor,
-        TestingProcessor,
-        DSAResponseSaverEfficiency,
-        DSAResponseSaverImprovement,
-        DSAResponseSaverQuality,
-        DSAResponseSaverRevision,
-        DSAResponseSaverSummary,
-        DSAResponseSaverEfficiency,
-        DSAMarkAsCompleteSaver,
-        MockBehaviouralSaver,
-        MockBehaviourFinalScore
-    ]
-
-    processor_name_to_processors = {p.__name__: p for p in processors}
-    processor_instance: SpeechToText = processor_name_to_processors[processor_name]
+    processor_instance = ProcessorRegistry.get(processor_name)
     try:
         logger.info(f"Celery calling processor class - {processor_instance}.")
         processor_instance(eventflow_id=eventflow_id, inputs=inputs, root_arguments=root_arguments).execute()
@@ -198,4 +117,23 @@ def evaluate_lsrw_assessment(eval_data,assessment_attempt_id):
     except Exception as e:
         logger.error(f'Error in evaluating behavioral assessment: {e}')
         assessment_attempt.status = AssessmentAttempt.Status.EVALUATION_PENDING
-        assessment_attempt.evaluation_triggered = False
\ No newline at end of file
+        assessment_attempt.evaluation_triggered = False
+
+
+@shared_task(queue='evaluation_queue', ignore_result=True)
+def report_evaluation_queue_depths():
+    """
+    Logs the number of messages waiting in the queue of every processor resource class, to scale their workers
+    """
+    queue_depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for resource_class, resource_config in RESOURCE_CLASSES.items():
+            try:
+                # passive only reads the message count, the queue is not created if missing
+                queue_depth = channel.queue_declare(resource_config["queue"], passive=True).message_count
+            except connection.channel_errors:
+                # Queues with no messages don't exist on the redis broker
+                queue_depth = 0
+            queue_depths[resource_class] = {"queue": resource_config["queue"], "depth": queue_depth}
+    logger.info(f"evaluation_queue_depths {json.dumps(queue_depths)}")
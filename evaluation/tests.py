@@ -1,3 +1,170 @@
-from django.test import TestCase
+import re
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from evaluation.management.generate_status_sheet.gd_wrapper import GDWrapper
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class FakeSheetsService:
+    """
+    In memory single sheet applying the requests sent by GDWrapper, and recording them.
+    spreadsheets() and values() both return the service itself.
+    """
+
+    def __init__(self, values=None):
+        self.sheet = [list(row) for row in values or []]
+        self.requests = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range=None):
+        if range is None:
+            # spreadsheets().get, used to check the grid size
+            grid = {"rowCount": 1000, "columnCount": 26}
+            return FakeRequest({"sheets": [{"properties": {"title": "Sheet", "sheetId": 0, "gridProperties": grid}}]})
+        self.requests.append("get")
+        return FakeRequest({"values": [list(row) for row in self.sheet]})
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension):
+        self.requests.append("batchGet")
+        value_ranges = []
+        for a1_range in ranges:
+            start_column, start_row, end_column, end_row = re.match(
+                r".*!([A-Z]+)(\d+):([A-Z]+)(\d*)$", a1_range
+            ).groups()
+            rows = self.sheet[int(start_row) - 1:int(end_row) if end_row else None]
+            columns = []
+            for column in range(self._get_column_index(start_column), self._get_column_index(end_column) + 1):
+                values = [row[column] if column < len(row) else "" for row in rows]
+                # Like the API, trailing empty cells and columns are dropped
+                while values and values[-1] == "":
+                    values.pop()
+                columns.append(values)
+            while columns and not columns[-1]:
+                columns.pop()
+            value_ranges.append({"values": columns} if columns else {})
+        return FakeRequest({"valueRanges": value_ranges})
+
+    def batchUpdate(self, spreadsheetId, body):
+        if "data" not in body:
+            # spreadsheets().batchUpdate growing the grid
+            return FakeRequest({})
+        self.requests.append("batchUpdate")
+        for value_range in body["data"]:
+            start_row = int(re.match(r".*!A(\d+):", value_range["range"]).group(1))
+            for row_number, row in enumerate(value_range["values"], start=start_row):
+                while len(self.sheet) < row_number:
+                    self.sheet.append([])
+                self.sheet[row_number - 1] = list(row)
+        return FakeRequest({})
+
+    def clear(self, spreadsheetId, range):
+        self.requests.append("clear")
+        self.sheet = []
+        return FakeRequest({})
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        self.requests.append("update")
+        self.sheet = [list(row) for row in body["values"]]
+        return FakeRequest({})
+
+    @staticmethod
+    def _get_column_index(column):
+        index = 0
+        for letter in column:
+            index = index * 26 + ord(letter) - ord("A") + 1
+        return index - 1
+
+
+@override_settings(GD_SYNC_CACHE_DIR=tempfile.mkdtemp())
+class GDWrapperSyncSheetTestCase(SimpleTestCase):
+    def get_gd_wrapper(self, values=None):
+        gd_wrapper = GDWrapper.__new__(GDWrapper)
+        gd_wrapper.speadsheet_id = f"spreadsheet-{self.id()}"
+        gd_wrapper.sheets_service = FakeSheetsService(values)
+        return gd_wrapper
+
+    def test_group_contiguous_rows(self):
+        rows = {9: ["e"], 2: ["a"], 3: ["b"], 5: ["c"], 6: ["d"]}
+
+        self.assertEqual(
+            list(GDWrapper._group_contiguous_rows(rows)),
+            [(2, [["a"], ["b"]]), (5, [["c"], ["d"]]), (9, [["e"]])],
+        )
+
+    def test_get_column_letter(self):
+        self.assertEqual(
+            [GDWrapper._get_column_letter(number) for number in (1, 26, 27, 52, 703)],
+            ["A", "Z", "AA", "AZ", "AAA"],
+        )
+
+    def test_changed_rows_are_updated_and_new_rows_appended(self):
+        gd_wrapper = self.get_gd_wrapper([["ID", "Name"], ["1", "Old"], ["2", "Same"]])
+        state = gd_wrapper._build_sync_state("Sheet", ["ID", "Name"], [0], [])
+        rows = [["1", "New"], ["2", "Same"], ["3", "Added"]]
+
+        changed_rows, appended_rows = gd_wrapper._get_row_changes(state, rows, [0])
+
+        self.assertEqual(changed_rows, {2: ["1", "New"]})
+        self.assertEqual(list(appended_rows.values()), [["3", "Added"]])
+
+    def test_sync_sends_only_changed_and_appended_rows(self):
+        gd_wrapper = self.get_gd_wrapper([["ID", "Name"], ["1", "Old"], ["2", "Same"]])
+
+        gd_wrapper.sync_sheet(
+            "Sheet",
+            [{"ID": 1, "Name": "New"}, {"ID": 2, "Name": "Same"}, {"ID": 3, "Name": "Added"}],
+            key_fields=["ID"],
+        )
+
+        self.assertEqual(gd_wrapper.sheets_service.requests, ["get", "batchUpdate"])
+        self.assertEqual(
+            gd_wrapper.sheets_service.sheet,
+            [["ID", "Name"], ["1", "New"], ["2", "Same"], ["3", "Added"]],
+        )
+
+    def test_append_only_sheet_is_checked_against_the_cached_index(self):
+        gd_wrapper = self.get_gd_wrapper([["ID", "Name"], ["1", "First"]])
+        gd_wrapper.append_to_sheet("Sheet", [{"ID": 1, "Name": "First"}, {"ID": 2, "Name": "Second"}])
+        gd_wrapper.sheets_service.requests = []
+
+        gd_wrapper.append_to_sheet("Sheet", [{"ID": 2, "Name": "Second"}, {"ID": 3, "Name": "Third"}])
+
+        # The whole sheet is not downloaded again
+        self.assertEqual(gd_wrapper.sheets_service.requests, ["batchGet", "batchUpdate"])
+        self.assertEqual(
+            gd_wrapper.sheets_service.sheet,
+            [["ID", "Name"], ["1", "First"], ["2", "Second"], ["3", "Third"]],
+        )
+
+    def test_rows_deleted_by_hand_rebuild_the_index(self):
+        gd_wrapper = self.get_gd_wrapper([["ID", "Name"], ["1", "First"], ["2", "Second"]])
+        gd_wrapper.sync_sheet("Sheet", [{"ID": 1, "Name": "First"}], key_fields=["ID"])
+        del gd_wrapper.sheets_service.sheet[1]
+        gd_wrapper.sheets_service.requests = []
+
+        gd_wrapper.sync_sheet("Sheet", [{"ID": 2, "Name": "Renamed"}], key_fields=["ID"])
+
+        self.assertEqual(gd_wrapper.sheets_service.requests, ["batchGet", "get", "batchUpdate"])
+        self.assertEqual(gd_wrapper.sheets_service.sheet, [["ID", "Name"], ["2", "Renamed"]])
+
+    def test_rows_missing_from_the_data_rewrite_the_sheet_unless_kept(self):
+        gd_wrapper = self.get_gd_wrapper([["ID", "Name"], ["1", "First"], ["2", "Second"]])
+
+        gd_wrapper.sync_sheet("Sheet", [{"ID": 2, "Name": "Second"}], key_fields=["ID"], keep_missing_rows=False)
+
+        self.assertEqual(gd_wrapper.sheets_service.requests, ["get", "clear", "update"])
+        self.assertEqual(gd_wrapper.sheets_service.sheet, [["ID", "Name"], ["2", "Second"]])
@@ -0,0 +1,147 @@
+import re
+import typing
+from collections import deque
+
+
+def extract_required_literal(pattern: str) -> str:
+    """
+    Returns the longest literal run (lowercased) which any match of the regex pattern has to contain, or "" if no
+    such run can be determined safely. Patterns with groups, alternations or character sets are not analysed.
+    """
+    if any(c in pattern for c in "|()[]"):
+        return ""
+
+    runs = []
+    current = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            # Escaped chars (classes or literals) end the run, keeping the analysis conservative
+            runs.append("".join(current))
+            current = []
+            i += 2
+            continue
+        if c in "?*{":
+            # The preceding char is optional (or repeated an unknown number of times)
+            if current:
+                current.pop()
+            runs.append("".join(current))
+            current = []
+            if c == "{":
+                i = pattern.index("}", i) if "}" in pattern[i:] else len(pattern)
+        elif c in ".^$+":
+            runs.append("".join(current))
+            current = []
+        else:
+            current.append(c)
+        i += 1
+    runs.append("".join(current))
+
+    return max(runs, key=len).lower()
+
+
+class AhoCorasickAutomaton:
+    """
+    Minimal Aho-Corasick automaton, finds which of a fixed set of keywords occur in a text in a single pass.
+    """
+
+    def __init__(self, keywords: typing.Iterable[str]):
+        self._goto: typing.List[typing.Dict[str, int]] = [{}]
+        self._fail: typing.List[int] = [0]
+        self._output: typing.List[typing.List[str]] = [[]]
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build_fail_links()
+
+    def _add(self, keyword: str):
+        node = 0
+        for c in keyword:
+            next_node = self._goto[node].get(c)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][c] = next_node
+            node = next_node
+        self._output[node].append(keyword)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(c, 0)
+                self._output[next_node] = self._output[next_node] + self._output[self._fail[next_node]]
+
+    def find_keywords(self, text: str) -> typing.Set[str]:
+        found = set()
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for c in text:
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class CefrPhraseMatcher:
+    """
+    Precompiled index over the CEFR phrase patterns of cefrPhrases.json.
+
+    Every phrase is a case insensitive regex. Instead of running all of them over the text, the literal each pattern
+    requires is indexed in an Aho-Corasick automaton; one pass over the lowercased text tells which patterns can
+    possibly match, and only those regexes (precompiled) are run. Results are identical to running re.search for
+    every phrase, in the same order.
+    """
+
+    def __init__(self, phrase_level_mapping: typing.Dict[str, typing.Dict]):
+        self.phrases = list(phrase_level_mapping.keys())
+        self.levels = [phrase_level_mapping[phrase]["cefr"] for phrase in self.phrases]
+        self.compiled = [re.compile(phrase, re.IGNORECASE) for phrase in self.phrases]
+
+        self.literal_to_indices: typing.Dict[str, typing.List[int]] = {}
+        self.unindexed: typing.List[int] = []
+        for index, phrase in enumerate(self.phrases):
+            literal = extract_required_literal(phrase)
+            if literal:
+                self.literal_to_indices.setdefault(literal, []).append(index)
+            else:
+                self.unindexed.append(index)
+
+        self.automaton = AhoCorasickAutomaton(self.literal_to_indices.keys())
+
+    def match(self, text: str) -> typing.List[typing.Tuple[str, str]]:
+        """
+        Returns (matched text, cefr level) for every phrase found in the text, in the phrase file order.
+        """
+        candidates = set(self.unindexed)
+        for literal in self.automaton.find_keywords(text.lower()):
+            candidates.update(self.literal_to_indices[literal])
+
+        matches = []
+        for index in sorted(candidates):
+            match = self.compiled[index].search(text)
+            if match:
+                matches.append((match.group(0), self.levels[index]))
+        return matches
+
+
+def match_phrases_with_regex_scan(phrase_level_mapping: typing.Dict[str, typing.Dict], text: str):
+    """
+    Previous implementation, running every phrase regex over the text. Kept as reference for benchmarks.
+    """
+    matches = []
+    for phrase in phrase_level_mapping:
+        match = re.search(phrase, text, re.IGNORECASE)
+        if match:
+            matches.append((match.group(0), phrase_level_mapping[phrase]["cefr"]))
+    return matches
@@ -1,22 +1,55 @@
 from textblob import TextBlob
 import json
-import re
+import os
+import threading
 import spacy
 
+from evaluation.vocab.phrase_matcher import CefrPhraseMatcher
+
+VOCAB_DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Only lemmas are read from the pipeline, which need the tagger and attribute ruler but not parsing or NER
+SPACY_DISABLED_COMPONENTS = ["parser", "ner"]
+
+
+class VocabLexicon:
+    """
+    Frequency lists, CEFR mappings and the spaCy pipeline used by evaluate_vocab. Loaded once per process on first
+    use (or by warm_up on worker start) instead of on every call.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.most_freq_5000 = frozenset(self._load_json("most_freq_5000.json"))
+        self.most_freq_2000 = frozenset(self._load_json("most_freq_2000.json"))
+        self.word_level_mapping = self._load_json("cefrWords.json")
+        self.phrase_level_mapping = self._load_json("cefrPhrases.json")
+        self.phrase_matcher = CefrPhraseMatcher(self.phrase_level_mapping)
+        self.nlp = spacy.load("en_core_web_sm", disable=SPACY_DISABLED_COMPONENTS)
+
+    @staticmethod
+    def _load_json(file_name):
+        with open(os.path.join(VOCAB_DATA_DIR, file_name), "r") as json_file:
+            return json.load(json_file)
+
+    @classmethod
+    def get_instance(cls) -> "VocabLexicon":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def warm_up(cls):
+        cls.get_instance()
+
 
 def init():
-    with open('evaluation/vocab/most_freq_5000.json', 'r') as json_file:
-        most_freq_5000 = json.load(json_file)
-    with open('evaluation/vocab/most_freq_2000.json', 'r') as json_file:
-        most_freq_2000 = json.load(json_file)
-
-    with open('evaluation/vocab/cefrWords.json', 'r') as json_file:
-        word_level_mapping = json.load(json_file)
-        
-    with open('evaluation/vocab/cefrPhrases.json', 'r') as json_file:
-        phrase_level_mapping = json.load(json_file)
-        
-    return most_freq_5000, most_freq_2000, word_level_mapping, phrase_level_mapping
+    lexicon = VocabLexicon.get_instance()
+    return lexicon.most_freq_5000, lexicon.most_freq_2000, lexicon.word_level_mapping, lexicon.phrase_level_mapping
 
 def evaluate_vocab(user_answer):
     most_freq_5000, most_freq_2000, word_level_mapping, phrase_level_mapping = init()
@@ -52,8 +85,7 @@ def evaluate_vocab(user_answer):
             words_by_level[level].append(word)
         else:
             words_not_found += word + " "   
-    nlp = spacy.load('en_core_web_sm')
-    doc = nlp(words_not_found)         
+    doc = VocabLexicon.get_instance().nlp(words_not_found)         
     lemmatized_words = [token.lemma_ for token in doc]
     for word in lemmatized_words:
         cefr_word = word_level_mapping.get(word.lower())
@@ -70,13 +102,9 @@ def evaluate_vocab(user_answer):
 
     longest_sentence_length = max(sentence_lengths)
 
-    for phrase in phrase_level_mapping:
-        match = re.search(phrase, user_answer, re.IGNORECASE)
-        if match:
-            exact_phrase = match.group(0)
-            level = phrase_level_mapping[phrase]['cefr']
-            level_counts[level] = level_counts.get(level, 0) + 1
-            if level not in words_by_level:
-                words_by_level[level] = []
-            words_by_level[level].append(exact_phrase)
+    for exact_phrase, level in VocabLexicon.get_instance().phrase_matcher.match(user_answer):
+        level_counts[level] = level_counts.get(level, 0) + 1
+        if level not in words_by_level:
+            words_by_level[level] = []
+        words_by_level[level].append(exact_phrase)
     return num_unique_words, num_repeated_words, total_words, frequently_used_2000, percentage_frequently_used_2000, percentage_unique, rare_words, percentage_rare_words, level_counts, words_by_level, average_sentence_length, longest_sentence_length
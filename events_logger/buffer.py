@@ -0,0 +1,80 @@
+import logging
+import uuid
+from datetime import date
+from typing import Dict, Iterator, Tuple
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageEventBuffer:
+    """
+    Write-behind buffer of time spent heartbeats in redis.
+
+    Heartbeats are added with HINCRBY to a single pending hash, keyed by user, date, content type and content id.
+    A flush atomically renames the pending hash to a batch hash (new heartbeats go to a fresh pending hash) and
+    registers the batch in a set. A batch is only deleted after it has been written to Postgres, so a failed flush
+    leaves the batch in redis and it is retried by the next flush: increments are never lost. If the process dies
+    between the Postgres commit and the delete, the batch is applied again (at-least-once).
+    """
+
+    PENDING_KEY = "page_events:pending"
+    BATCHES_KEY = "page_events:batches"
+    BATCH_KEY_PREFIX = "page_events:batch:"
+    FLUSH_LOCK_KEY = "page_events:flush_lock"
+
+    _client = None
+
+    @classmethod
+    def get_client(cls) -> redis.Redis:
+        if cls._client is None:
+            cls._client = redis.Redis.from_url(settings.REDIS_URL)
+        return cls._client
+
+    @staticmethod
+    def get_field(user_id: int, current_date: date, content_type: str, content_id: int) -> str:
+        return f"{user_id}:{current_date.isoformat()}:{content_type}:{content_id}"
+
+    @staticmethod
+    def parse_field(field: bytes) -> Tuple[int, date, str, int]:
+        user_id, current_date, content_type, content_id = field.decode().split(":")
+        return int(user_id), date.fromisoformat(current_date), content_type, int(content_id)
+
+    @classmethod
+    def add(cls, user_id: int, current_date: date, content_type: str, content_id: int, seconds: int):
+        cls.get_client().hincrby(cls.PENDING_KEY, cls.get_field(user_id, current_date, content_type, content_id), seconds)
+
+    @classmethod
+    def seal_pending(cls):
+        """
+        Moves the pending heartbeats into a new batch. Only called with the flush lock held, so the pending hash
+        can't disappear between the exists check and the rename.
+        """
+        client = cls.get_client()
+        if not client.exists(cls.PENDING_KEY):
+            return
+        batch_key = f"{cls.BATCH_KEY_PREFIX}{uuid.uuid4().hex}"
+        # Registered before the rename, so a crash in between leaves an empty (skipped) batch, never an orphan one
+        client.sadd(cls.BATCHES_KEY, batch_key)
+        client.rename(cls.PENDING_KEY, batch_key)
+
+    @classmethod
+    def iter_batches(cls) -> Iterator[Tuple[str, Dict[Tuple[int, date, str, int], int]]]:
+        client = cls.get_client()
+        for batch_key in sorted(member.decode() for member in client.smembers(cls.BATCHES_KEY)):
+            entries = {cls.parse_field(field): int(value) for field, value in client.hgetall(batch_key).items()}
+            yield batch_key, entries
+
+    @classmethod
+    def delete_batch(cls, batch_key: str):
+        client = cls.get_client()
+        client.delete(batch_key)
+        client.srem(cls.BATCHES_KEY, batch_key)
+
+    @classmethod
+    def flush_lock(cls):
+        return cls.get_client().lock(
+            cls.FLUSH_LOCK_KEY, timeout=settings.PAGE_EVENT_FLUSH_LOCK_TIMEOUT_SECONDS, blocking_timeout=0
+        )
@@ -12,6 +12,7 @@ class PageEvent(models.Model):
     recording = models.ForeignKey(Meeting, on_delete=models.CASCADE, null=True, blank=True,to_field='id')
     watched=models.BooleanField(default=False)
     time_spent=models.DurationField(default=timedelta())
+    updated_at=models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         unique_together = (('user', 'pdf', 'video','recording','date'),)
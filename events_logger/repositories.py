@@ -29,6 +29,57 @@ class PageEventRepository:
         page_event.save()
         
         return page_event
+
+    @staticmethod
+    def bulk_add_time_spent(time_spent_by_key, batch_size=1000):
+        """
+        Adds time spent to the page events, creating the missing ones, with one read and one bulk write each for
+        inserts and updates. Must be called inside a transaction, the existing page events are locked.
+
+        Args:
+            time_spent_by_key: dict of (user_id, date, pdf_id, video_id, recording_id) -> timedelta to add
+        """
+        if not time_spent_by_key:
+            return
+        # Nullable columns of the unique constraint never conflict in postgres, so this can't be an
+        # INSERT .. ON CONFLICT and existing rows are matched here instead
+        existing = PageEvent.objects.select_for_update().filter(
+            user_id__in={key[0] for key in time_spent_by_key},
+            date__in={key[1] for key in time_spent_by_key},
+        ).filter(
+            models.Q(pdf_id__in={key[2] for key in time_spent_by_key if key[2] is not None}) |
+            models.Q(video_id__in={key[3] for key in time_spent_by_key if key[3] is not None}) |
+            models.Q(recording_id__in={key[4] for key in time_spent_by_key if key[4] is not None})
+        )
+        existing_by_key = {
+            (event.user_id, event.date, event.pdf_id, event.video_id, event.recording_id): event
+            for event in existing
+        }
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for key, time_spent in time_spent_by_key.items():
+            event = existing_by_key.get(key)
+            if event is None:
+                user_id, date, pdf_id, video_id, recording_id = key
+                to_create.append(PageEvent(
+                    user_id=user_id,
+                    date=date,
+                    pdf_id=pdf_id,
+                    video_id=video_id,
+                    recording_id=recording_id,
+                    watched=True,
+                    time_spent=time_spent
+                ))
+            else:
+                event.time_spent += time_spent
+                event.watched = True
+                # auto_now is not applied by bulk_update
+                event.updated_at = now
+                to_update.append(event)
+
+        PageEvent.objects.bulk_create(to_create, batch_size=batch_size)
+        PageEvent.objects.bulk_update(to_update, ['time_spent', 'watched', 'updated_at'], batch_size=batch_size)
     
     @staticmethod
     def get_total_time_spent_by_user_on_resources_in_course(user, course):
@@ -111,4 +162,25 @@ class PageEventRepository:
             models.Q(recording__series__course_enrollments__batch__course_id=course_id)
         )
         
-        return daily_resources
\ No newline at end of file
+        return daily_resources
+
+    @staticmethod
+    def get_resources_consumption_of_students_updated_between(since, until):
+        """
+        Page events of students changed after since (all events when None) and up to until
+        """
+        page_events = PageEvent.objects.filter(updated_at__lte=until, user__is_student=True)
+        if since is not None:
+            page_events = page_events.filter(updated_at__gt=since)
+        return page_events.values(
+            'user_id',
+            'date',
+            'pdf_id',
+            'pdf__title',
+            'pdf__course_id',
+            'video_id',
+            'video__title',
+            'video__course_id',
+            'recording_id',
+            'time_spent',
+        ).order_by('id')
@@ -0,0 +1,13 @@
+import logging
+
+from celery import shared_task
+
+from .usecases import LogEventUseCase
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(queue='reporting_queue')
+def flush_buffered_page_events():
+    flushed = LogEventUseCase.flush_buffered_events()
+    logger.info(f"flushed {flushed} buffered page event entries")
@@ -1,24 +1,122 @@
+import logging
+import re
+from collections import defaultdict
 from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from redis.exceptions import LockNotOwnedError
+from .buffer import PageEventBuffer
 from .repositories import PageEventRepository
 from course.repositories import UploadRepository, UploadVideoRepository
 from meetings.repositories import MeetingRepository
 
+logger = logging.getLogger(__name__)
+
 class LogEventUseCase:
-    @staticmethod
-    def log_event(user, content_id, content_type, time_spent):
-        if not content_id or not content_type:
-            raise ValueError("content_id and content_type are required.")
+    CONTENT_TYPES = ("reading", "video", "recording")
 
-        current_date = datetime.now().date()
-        
+    @staticmethod
+    def _parse_time_spent(time_spent):
         # Convert time_spent string to timedelta if needed
         if isinstance(time_spent, str):
-            import re
             match = re.match(r'^(\d+):(\d+):(\d+)$', time_spent)
             if not match:
                 raise ValueError("Invalid time format. Expected hh:mm:ss.")
             time_parts = list(map(int, match.groups()))
             time_spent = timedelta(hours=time_parts[0], minutes=time_parts[1], seconds=time_parts[2])
+        return time_spent
+
+    @staticmethod
+    def buffer_event(user, content_id, content_type, time_spent):
+        """
+        Write-behind variant of log_event: only adds the time spent to the redis buffer, page events are written
+        by flush_buffered_events. Content existence is checked when flushing.
+        """
+        if not content_id or not content_type:
+            raise ValueError("content_id and content_type are required.")
+        if content_type not in LogEventUseCase.CONTENT_TYPES:
+            raise ValueError(f"Invalid content_type: {content_type}")
+        try:
+            content_id = int(content_id)
+        except (TypeError, ValueError):
+            raise ValueError("Content not found")
+
+        time_spent = LogEventUseCase._parse_time_spent(time_spent)
+        if not isinstance(time_spent, timedelta):
+            raise ValueError("Invalid time format. Expected hh:mm:ss.")
+        PageEventBuffer.add(
+            user.id, datetime.now().date(), content_type, content_id, int(time_spent.total_seconds())
+        )
+
+    @staticmethod
+    def flush_buffered_events():
+        """
+        Writes the buffered time spent into page events, one batch (transaction) at a time. A batch stays in redis
+        until its transaction is committed, so a failed flush is retried by the next one.
+
+        The flush lock is renewed before every batch, and the flush stops as soon as the lock is lost, so a slow
+        flush never applies batches alongside the next one.
+        """
+        lock = PageEventBuffer.flush_lock()
+        if not lock.acquire():
+            logger.info("Page event flush already running, skipping")
+            return 0
+
+        flushed = 0
+        try:
+            PageEventBuffer.seal_pending()
+            for batch_key, entries in PageEventBuffer.iter_batches():
+                # Resets the lock timeout, raises LockNotOwnedError if it expired meanwhile
+                lock.reacquire()
+                with transaction.atomic():
+                    PageEventRepository.bulk_add_time_spent(
+                        LogEventUseCase._get_time_spent_by_page_event_key(entries),
+                        batch_size=settings.PAGE_EVENT_FLUSH_BATCH_SIZE
+                    )
+                PageEventBuffer.delete_batch(batch_key)
+                flushed += len(entries)
+        except LockNotOwnedError:
+            logger.warning("Page event flush lost its lock, leaving the remaining batches to the next flush")
+        finally:
+            try:
+                lock.release()
+            except LockNotOwnedError:
+                pass
+        return flushed
+
+    @staticmethod
+    def _get_time_spent_by_page_event_key(entries):
+        ids_by_content_type = defaultdict(set)
+        for (_, _, content_type, content_id) in entries:
+            ids_by_content_type[content_type].add(content_id)
+        existing_ids = {
+            "reading": UploadRepository.get_existing_reading_resource_ids(ids_by_content_type["reading"]),
+            "video": UploadVideoRepository.get_existing_video_resource_ids(ids_by_content_type["video"]),
+            "recording": MeetingRepository.get_existing_meeting_ids(ids_by_content_type["recording"]),
+        }
+
+        time_spent_by_key = defaultdict(timedelta)
+        for (user_id, current_date, content_type, content_id), seconds in entries.items():
+            if content_id not in existing_ids.get(content_type, ()):
+                logger.warning(f"Dropping buffered time spent for missing {content_type} {content_id} of user {user_id}")
+                continue
+            key = (
+                user_id,
+                current_date,
+                content_id if content_type == "reading" else None,
+                content_id if content_type == "video" else None,
+                content_id if content_type == "recording" else None,
+            )
+            time_spent_by_key[key] += timedelta(seconds=seconds)
+        return time_spent_by_key
+
+    @staticmethod
+    def log_event(user, content_id, content_type, time_spent):
+        if not content_id or not content_type:
+            raise ValueError("content_id and content_type are required.")
+
+        current_date = datetime.now().date()
+        time_spent = LogEventUseCase._parse_time_spent(time_spent)
 
         handlers = {
             "reading": LogEventUseCase._handle_reading_event,
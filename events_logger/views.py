@@ -14,6 +14,7 @@ from accounts.permissions import (
 from accounts.authentication import FirebaseAuthentication
 from accounts.models import User
 from datetime import datetime, timedelta
+from django.conf import settings
 from .usecases import LogEventUseCase
 
 
@@ -25,6 +26,18 @@ class LogEvent(APIView):
     def post(self, request):
         try:
             user=request.user
+            if settings.PAGE_EVENT_WRITE_BEHIND_ENABLED:
+                # Written to the page event by the periodic flush, so there is no event id yet
+                LogEventUseCase.buffer_event(
+                    user=user,
+                    content_id=request.data.get('content_id'),
+                    content_type=request.data.get('content_type'),
+                    time_spent=request.data.get('time_spent')
+                )
+                return Response(
+                    {"message": "Event start entry logged.", "event_id": None},
+                    status=status.HTTP_201_CREATED
+                )
             # user = User.objects.get(id=46)  # This should be replaced with authenticated user
             event = LogEventUseCase.log_event(
                 user=user,
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0002_attendancerecord_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(fields=["series", "start_date"], name="meeting_series_start_date_idx"),
+        ),
+    ]
@@ -154,7 +154,8 @@ class Meeting(models.Model):
         # Get all students from associated batches
         batch_allocations = self.series.course_enrollments.all()
         for allocation in batch_allocations:
-            students = allocation.batch.students.all()
+            # student_set.all() is served from a prefetch, Batch.students.all() would clone it and query again
+            students = allocation.batch.student_set.all()
             participants.update([student.student for student in students])
 
             # Add the lecturer
@@ -166,6 +167,10 @@ class Meeting(models.Model):
     class Meta:
         verbose_name = "Live Class"
         verbose_name_plural = "Live Classes"
+        indexes = [
+            # Calendar queries filter the meetings of series by date range
+            models.Index(fields=["series", "start_date"], name="meeting_series_start_date_idx"),
+        ]
 
 
 class AttendanceRecord(models.Model):
@@ -175,6 +180,7 @@ class AttendanceRecord(models.Model):
     attendance_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE)
     attendance = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Attendance Record"
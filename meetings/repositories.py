@@ -84,10 +84,72 @@ class MeetingRepository:
     @staticmethod
     def get_meeting_by_id(id) -> Meeting:
         return Meeting.objects.get(id=id)
+
+    @staticmethod
+    def get_existing_meeting_ids(meeting_ids):
+        return set(Meeting.objects.filter(id__in=meeting_ids).values_list('id', flat=True))
     
     def get_no_of_meetings_occured_in_course(course_id,batch_id,date):
         return Meeting.objects.filter(series__course_enrollments__batch__course_id=course_id,series__course_enrollments__batch__id=batch_id,start_date__lte=date).count()
 
+    @staticmethod
+    def get_no_of_meetings_occured_by_batch(batch_ids, date):
+        """
+        Get number of meetings occured up to the date for each of the batches, in a single grouped query
+
+        Returns:
+            dict: batch_id -> number of meetings
+        """
+        counts = Meeting.objects.filter(
+            series__course_enrollments__batch_id__in=batch_ids,
+            start_date__lte=date
+        ).values(
+            'series__course_enrollments__batch_id'
+        ).annotate(
+            count=Count('id')
+        ).order_by()
+        return {row['series__course_enrollments__batch_id']: row['count'] for row in counts}
+
+    @staticmethod
+    def get_meetings_with_batch_allocations(meeting_ids):
+        """
+        Get meetings along with the batches (and their courses) their series is allocated to, one row per
+        meeting and batch allocation.
+
+        Args:
+            meeting_ids: The meetings to get
+
+        Returns:
+            QuerySet: dicts with meeting id, effective title and duration, batch id and course id
+        """
+        return Meeting.objects.filter(series__course_enrollments__isnull=False, id__in=meeting_ids).values(
+            'id',
+            'start_date',
+            'title_override',
+            'duration_override',
+            'series__title',
+            'series__duration',
+            batch_id=F('series__course_enrollments__batch_id'),
+            course_id=F('series__course_enrollments__batch__course_id'),
+        )
+
+    @staticmethod
+    def get_batches_with_meetings_between(start_date_after, end_date):
+        """
+        Returns (batch_id, course_id) of batches which have meetings after start_date_after (all meetings when
+        None) up to end_date
+        """
+        meetings = Meeting.objects.filter(
+            series__course_enrollments__isnull=False,
+            start_date__lte=end_date
+        )
+        if start_date_after is not None:
+            meetings = meetings.filter(start_date__gt=start_date_after)
+        return meetings.values_list(
+            'series__course_enrollments__batch_id',
+            'series__course_enrollments__batch__course_id'
+        ).distinct()
+
     @staticmethod
     def get_meetings_of_series_in_period(series_id, start_date, end_date):
         return Meeting.objects.filter(
@@ -329,6 +391,16 @@ class AttendaceRecordRepository:
     def get_attendance_record_by_user_and_meeting_id(user_id,meeting_id):
         return AttendanceRecord.objects.filter(user_id_id=user_id,meeting_id=meeting_id).first()
 
+    @staticmethod
+    def get_attendance_records_of_students_updated_between(since, until):
+        """
+        Attendance records of students changed after since (all records when None) and up to until
+        """
+        records = AttendanceRecord.objects.filter(updated_at__lte=until, user_id__is_student=True)
+        if since is not None:
+            records = records.filter(updated_at__gt=since)
+        return records.values('user_id_id', 'meeting_id', 'attendance').order_by('id')
+
     @staticmethod
     def mark_attendance(attendance_record):
         attendance_record.attendance = True
@@ -485,13 +557,18 @@ class AttendaceRecordRepository:
         meetings = Meeting.objects.filter(
             series__course_enrollments__isnull=False,
             start_date=target_date
-        ).select_related('series').distinct()
+        ).select_related('series').prefetch_related(
+            'series__course_enrollments__batch__student_set__student',
+            'series__course_enrollments__batch__lecturer',
+        ).distinct()
         
         # Get existing attendance records
         existing_records = AttendanceRecord.objects.filter(
             meeting__series__course_enrollments__isnull=False,
             meeting__start_date=target_date
-        ).select_related('meeting', 'meeting__series').distinct()
+        ).select_related('meeting', 'meeting__series').prefetch_related(
+            'meeting__series__course_enrollments'
+        ).distinct()
         
         # Create a map of (meeting_id, user_id) to attendance record
         attendance_map = {(record.meeting_id, record.user_id_id): record for record in existing_records}
@@ -5,10 +5,7 @@ from typing import Dict, Any, Optional
 from django.core.cache import cache
 from django.conf import settings
 from .base import BaseConferencePlatformService, MeetingDetails, Presenter
-from storage_service.azure_storage import AzureStorageService
-import os
-import subprocess
-import tempfile
+from .recording_pipeline import RecordingPart, RecordingPipeline
 
 class MSTeamsConferencePlatformService(BaseConferencePlatformService):
     AUTH_URL = f"https://login.microsoftonline.com/{settings.MS_TEAMS_TENANT_ID}/oauth2/v2.0/token"
@@ -316,82 +313,42 @@ class MSTeamsConferencePlatformService(BaseConferencePlatformService):
             str: The uploaded blob URL.
         """
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                recording_files = []
-
-                # Fetch all recordings and save to temp files
-                for index, recording_data in enumerate(recording_metadata):
-                    logger.info(f"Fetching recording {index + 1}...")
-                    download_url = recording_data.get("@microsoft.graph.downloadUrl")
-
-                    # Try to download content from metadata, fallback to Graph API
-                    if download_url:
-                        try:
-                            response = requests.get(download_url, stream=True)
-                            response.raise_for_status()
-                            file_content = response.content
-                        except requests.exceptions.HTTPError as e:
-                            if e.response.status_code in (401, 403):
-                                logger.info("Download URL expired, generating new one")
-                                file_content = self.download_meeting_recording_using_graph_api(recording_data)
-                            else:
-                                raise
-                    else:
-                        file_content = self.download_meeting_recording_using_graph_api(recording_data)
-
-                    # Generate a unique filename for each recording
-                    local_path = os.path.join(temp_dir, f"recording_{meeting_id}_index{index}.mp4")
-
-                    with open(local_path, "wb") as f:
-                        f.write(file_content)
-
-                    recording_files.append(local_path)
-
-                # Create input.txt for ffmpeg
-                input_file_path = os.path.join(temp_dir, f"input_recording_files_{meeting_id}.txt")
-                with open(input_file_path, "w") as input_file:
-                    for recording in recording_files:
-                        input_file.write(f"file '{recording}'\n")
-
-                # Generate unique merged output filename
-                unique_output_filename = f"merged_recording_{meeting_id}.mp4"
-                output_file = os.path.join(temp_dir, unique_output_filename)
-
-                # Merge recordings using ffmpeg
-                subprocess.run(["ffmpeg", "-f", "concat", "-safe", "0", "-i", input_file_path, "-c", "copy", output_file], check=True)
-
-                # Upload merged recording to Azure
-                blob_name = f"recordings/{meeting_id}/{unique_output_filename}"
-                storage_service = AzureStorageService()
-                with open(output_file, "rb") as merged_file:
-                    blob_url = storage_service.upload_blob(container_name=container_name, blob_name=blob_name, content=merged_file, overwrite=True)
-
-                logger.info(f"Merged recording uploaded to: {blob_url}")
-
-                return blob_url
+            parts = []
+            for recording_data in recording_metadata:
+                download_url = recording_data.get("@microsoft.graph.downloadUrl")
+                refresh = lambda recording_data=recording_data: self.get_graph_api_recording_request(recording_data)
+                if download_url:
+                    parts.append(RecordingPart(url=download_url, refresh=refresh))
+                else:
+                    url, headers = self.get_graph_api_recording_request(recording_data)
+                    parts.append(RecordingPart(url=url, headers=headers, refresh=refresh))
+
+            blob_name = f"recordings/{meeting_id}/merged_recording_{meeting_id}.mp4"
+            blob_url = RecordingPipeline().run(parts, meeting_id, container_name, blob_name)
+
+            logger.info(f"Merged recording uploaded to: {blob_url}")
+
+            return blob_url
 
         except Exception as e:
             logger.error(f"Error downloading/uploading recording: {str(e)}")
             raise
 
 
-    def download_meeting_recording_using_graph_api(self, recording_metadata: dict) -> bytes:
+    def get_graph_api_recording_request(self, recording_metadata: dict) -> tuple:
         """
-        Downloads recording using Graph API as fallback method
+        Returns url and headers to download a recording using Graph API, used as fallback method when the
+        pre-signed download url is missing or expired
         """
         access_token = self._get_access_token()
         
         headers = {
             "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
         }
         
         file_id = recording_metadata["id"]
         drive_id = recording_metadata["parentReference"]["driveId"]
         graph_api_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/content"
         
-        response = requests.get(graph_api_url, headers=headers, stream=True)
-        response.raise_for_status()
-        
-        return response.content
+        return graph_api_url, headers
 
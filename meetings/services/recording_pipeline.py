@@ -0,0 +1,164 @@
+import logging
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+
+from storage_service.azure_storage import AzureStorageService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RecordingPart:
+    """
+    A single recording file to be fetched.
+
+    refresh is called when the url stops working (expired pre-signed url / token) and returns a fresh
+    (url, headers) pair to resume the download from.
+    """
+
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    refresh: Optional[Callable[[], Tuple[str, Dict[str, str]]]] = None
+
+
+class RecordingPipeline:
+    """
+    Downloads recording parts in parallel straight to disk, concatenates them with ffmpeg and pipes the ffmpeg
+    output directly into a chunked block upload. Only one download/upload chunk per part is held in memory at a
+    time, so memory stays bounded regardless of the recording length.
+    """
+
+    EXPIRED_URL_STATUS_CODES = (401, 403)
+
+    def __init__(self, storage_service: AzureStorageService = None):
+        self.storage_service = storage_service or AzureStorageService()
+        self.chunk_size = settings.AZURE_STORAGE_CHUNK_SIZE
+        self.download_concurrency = settings.RECORDING_DOWNLOAD_CONCURRENCY
+        self.max_download_attempts = settings.RECORDING_DOWNLOAD_MAX_ATTEMPTS
+        # The read timeout applies between two chunks, a stalled connection is dropped and resumed
+        self.download_timeout = (
+            settings.RECORDING_DOWNLOAD_CONNECT_TIMEOUT_SECONDS,
+            settings.RECORDING_DOWNLOAD_READ_TIMEOUT_SECONDS,
+        )
+
+    def download_part(self, part: RecordingPart, file_path: str):
+        """
+        Streams a part to file_path. If the url expires or the connection drops midway, the download is resumed
+        from the bytes already on disk with a range request.
+        """
+        url, headers = part.url, dict(part.headers)
+        for attempt in range(1, self.max_download_attempts + 1):
+            downloaded = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+            request_headers = dict(headers)
+            if downloaded:
+                request_headers["Range"] = f"bytes={downloaded}-"
+            try:
+                with requests.get(
+                    url, headers=request_headers, stream=True, timeout=self.download_timeout
+                ) as response:
+                    response.raise_for_status()
+                    # Server ignored the range header, start over
+                    mode = "ab" if downloaded and response.status_code == 206 else "wb"
+                    with open(file_path, mode) as fil:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            fil.write(chunk)
+                return
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 416:
+                    # Requested range not satisfiable, file is already complete
+                    return
+                if (
+                    e.response is None
+                    or e.response.status_code not in self.EXPIRED_URL_STATUS_CODES
+                    or part.refresh is None
+                    or attempt == self.max_download_attempts
+                ):
+                    raise
+                logger.info("Download URL expired, generating new one")
+                url, headers = part.refresh()
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ReadTimeout,
+                requests.exceptions.ChunkedEncodingError,
+            ):
+                if attempt == self.max_download_attempts:
+                    raise
+                logger.info(
+                    f"Connection dropped while downloading recording, resuming. Attempt {attempt}"
+                )
+
+    def download_parts(self, parts: List[RecordingPart], temp_dir: str, prefix: str) -> List[str]:
+        file_paths = [
+            os.path.join(temp_dir, f"{prefix}_index{index}.mp4") for index in range(len(parts))
+        ]
+        with ThreadPoolExecutor(max_workers=self.download_concurrency) as executor:
+            futures = [
+                executor.submit(self.download_part, part, file_path)
+                for part, file_path in zip(parts, file_paths)
+            ]
+            for future in futures:
+                future.result()
+        return file_paths
+
+    def concat_and_upload(self, file_paths: List[str], temp_dir: str, container_name: str, blob_name: str) -> str:
+        input_file_path = os.path.join(temp_dir, "input_recording_files.txt")
+        with open(input_file_path, "w") as input_file:
+            for file_path in file_paths:
+                input_file.write(f"file '{file_path}'\n")
+
+        # A pipe is not seekable, so the mp4 is written fragmented (moov atom up front) instead of being patched
+        # at the end. stderr goes to a file, a full stderr pipe would block ffmpeg while we only read stdout.
+        stderr_file = tempfile.TemporaryFile(dir=temp_dir)
+        process = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-loglevel",
+                "error",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                input_file_path,
+                "-c",
+                "copy",
+                "-movflags",
+                "frag_keyframe+empty_moov",
+                "-f",
+                "mp4",
+                "pipe:1",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        try:
+            blob_url = self.storage_service.upload_from_stream(
+                container_name=container_name,
+                blob_name=blob_name,
+                stream=process.stdout,
+                content_type="video/mp4",
+                overwrite=True,
+            )
+        finally:
+            process.stdout.close()
+            process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+            stderr_file.close()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args, stderr=stderr)
+        return blob_url
+
+    def run(self, parts: List[RecordingPart], meeting_id: str, container_name: str, blob_name: str) -> str:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger.info(f"Fetching {len(parts)} recording part(s) for meeting {meeting_id}")
+            file_paths = self.download_parts(parts, temp_dir, prefix=f"recording_{meeting_id}")
+            return self.concat_and_upload(file_paths, temp_dir, container_name, blob_name)
@@ -8,10 +8,7 @@ from typing import Dict, Any, Optional
 from django.core.cache import cache
 from django.conf import settings
 from .base import BaseConferencePlatformService, MeetingDetails, Presenter
-from storage_service.azure_storage import AzureStorageService
-import os
-import subprocess
-import tempfile
+from .recording_pipeline import RecordingPart, RecordingPipeline
 
 
 class ZoomConferencePlatformService(BaseConferencePlatformService):
@@ -325,7 +322,6 @@ class ZoomConferencePlatformService(BaseConferencePlatformService):
             str: The uploaded blob URL.
         """
         try:
-            access_token = self._get_access_token()
             recording_metadata = next(
                 (
                     r
@@ -334,79 +330,36 @@ class ZoomConferencePlatformService(BaseConferencePlatformService):
                 ),
                 None,
             )
-            with tempfile.TemporaryDirectory() as temp_dir:
-                recording_files = []
-
-                # Fetch all recordings and save to temp files
-                for index, recording_data in enumerate(recording_metadata):
-                    logger.info(f"Fetching recording {index + 1}...")
-                    # Get the download URL from the recording metadata
-                    download_url = recording_metadata.get("download_url")
-
-                    if not download_url:
-                        raise ValueError("No download URL found in recording metadata")
-
-                    # For Zoom, we need to append access token as query parameter
-                    download_url = f"{download_url}?access_token={access_token}"
-
-                    # Download the recording
-                    response = requests.get(download_url, stream=True)
-                    response.raise_for_status()
-                    file_content = response.content
+            if not recording_metadata:
+                raise ValueError("No shared screen recording found in recording metadata")
 
-                    # Generate a unique filename for each recording
-                    local_path = os.path.join(
-                        temp_dir, f"recording_{meeting_id}_index{index}.mp4"
-                    )
+            # Get the download URL from the recording metadata
+            download_url = recording_metadata.get("download_url")
+            if not download_url:
+                raise ValueError("No download URL found in recording metadata")
 
-                    with open(local_path, "wb") as f:
-                        f.write(file_content)
+            def get_download_request():
+                # For Zoom, we need to append access token as query parameter
+                return f"{download_url}?access_token={self._get_access_token()}", {}
 
-                    recording_files.append(local_path)
+            def refresh_download_request():
+                cache.delete(settings.ZOOM_ACCESS_TOKEN_CACHE_KEY)
+                return get_download_request()
 
-                # Create input.txt for ffmpeg
-                input_file_path = os.path.join(
-                    temp_dir, f"input_recording_files_{meeting_id}.txt"
-                )
-                with open(input_file_path, "w") as input_file:
-                    for recording in recording_files:
-                        input_file.write(f"file '{recording}'\n")
-
-                # Generate unique merged output filename
-                unique_output_filename = f"merged_recording_{meeting_id}.mp4"
-                output_file = os.path.join(temp_dir, unique_output_filename)
-
-                # Merge recordings using ffmpeg
-                subprocess.run(
-                    [
-                        "ffmpeg",
-                        "-f",
-                        "concat",
-                        "-safe",
-                        "0",
-                        "-i",
-                        input_file_path,
-                        "-c",
-                        "copy",
-                        output_file,
-                    ],
-                    check=True,
-                )
+            url, headers = get_download_request()
+            parts = [
+                RecordingPart(url=url, headers=headers, refresh=refresh_download_request)
+            ]
 
-                # Upload merged recording to Azure
-                blob_name = f"recordings/{meeting_id}/{unique_output_filename}"
-                storage_service = AzureStorageService()
-                with open(output_file, "rb") as merged_file:
-                    blob_url = storage_service.upload_blob(
-                        container_name=container_name,
-                        blob_name=blob_name,
-                        content=merged_file,
-                        overwrite=True,
-                    )
+            # Upload merged recording to Azure
+            blob_name = f"recordings/{meeting_id}/merged_recording_{meeting_id}.mp4"
+            blob_url = RecordingPipeline().run(
+                parts, meeting_id, container_name, blob_name
+            )
 
-                logger.info(f"Merged recording uploaded to: {blob_url}")
+            logger.info(f"Merged recording uploaded to: {blob_url}")
 
-                return blob_url
+            return blob_url
 
         except Exception as e:
             logger.error(f"Error downloading/uploading recording: {str(e)}")
@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from config import settings
-from course.repositories import CourseRepository, BatchRepository
+from course.repositories import BatchRepository
 from events_logger.repositories import PageEventRepository
 from accounts.repositories import StudentRepository, CourseProviderRepository
 from custom_auth.repositories import UserProfileRepository
@@ -16,118 +16,85 @@ import json
 from datetime import datetime
 
 User = get_user_model()
-# Optimized function to get all required data at once
+
+
 def fetch_all_required_data():
+    """
+    Fetches everything the report sheets need in one pass, with the related rows prefetched.
+    Test users aren't copied into separate lists, the returned is_test_user predicate is
+    evaluated per row while the sheets are populated.
+    """
     date = datetime.now().date()
     excluded_emails = settings.TEST_EMAILS
 
-    # Fetch all students
-    students = StudentRepository.get_all_students()
-    user_ids = [student.student.id for student in students]
-    email_map = {student.student.id: student.student.email for student in students}
-
-    feedback_responses = FeedbackResponseRepository.get_feedback_responses_by_user_ids(user_ids)
-    user_profiles = UserProfileRepository.get_all_profiles_for_user_ids(user_ids)
-    courses = CourseRepository.get_all_courses()
-    batches = BatchRepository.get_all_batches()
-
-    activity_data = DailyAggregationRepository.get_aggregations_by_date(date)
-    meetings_data = AttendaceRecordRepository.get_attendance_records_by_date(date)
-    assessments_data = AssessmentAttemptRepository.fetch_assessments_attempts_data_by_date(date)
-    course_providers_data = CourseProviderRepository.get_all_course_providers()
-
-    # Maps for quick lookup
-    user_profiles_map = {profile.user_id_id: profile for profile in user_profiles}
-    course_map = {course.get('id'): course for course in courses}
-    batch_map = {batch.id: batch for batch in batches}
-
-    # Build user_course_batch_map
+    # Student batches and their courses are prefetched, instead of a query per student
     user_course_batch_map = {}
-    for student in students:
-        batches_for_student = list(student.batches.all())
-        user_course_batch_map[student.student.id] = []
-
-        for batch in batches_for_student:
-            if batch.id in batch_map:
-                course = batch_map[batch.id].course
-                user_course_batch_map[student.student.id].append({
-                    "course_name": course.title,
-                    "batch_id": batch.id,
-                    "course_id": course.id,
-                    "course_provider_id": course.course_provider_id,
-                    "enrolled date": batch.created_at
-                })
-    reports_data = UserCourseReportRepository.get_reports_data()
-    # Filtering if ECF
-    if settings.DEPLOYMENT_TYPE == "ECF":
-        filtered_students = [s for s in students if s.student.email not in excluded_emails]
-        filtered_user_ids = {s.student.id for s in filtered_students}
-        filtered_user_profiles_map = {
-            uid: profile for uid, profile in user_profiles_map.items() if uid in filtered_user_ids
-        }
-        filtered_feedback_responses = [
-            fr for fr in feedback_responses if fr.user_id in filtered_user_ids
+    email_map = {}
+    for student in StudentRepository.get_all_students_with_batches().iterator(chunk_size=2000):
+        user = student.student
+        email_map[user.id] = user.email
+        user_course_batch_map[user.id] = [
+            {
+                "course_name": batch.course.title,
+                "batch_id": batch.id,
+                "course_id": batch.course.id,
+                "course_provider_id": batch.course.course_provider_id,
+                "enrolled date": batch.created_at
+            }
+            for batch in student.batches.all()
         ]
-        filtered_user_course_batch_map = {
-            uid: data for uid, data in user_course_batch_map.items() if uid in filtered_user_ids
-        }
 
-        filtered_activity_data = [
-            a for a in activity_data if a.user_id in filtered_user_ids
-        ]
-        filtered_meetings_data = [
-            m for m in meetings_data if m.user_id_id in filtered_user_ids
-        ]
-        filtered_assessments_data = [
-            a for a in assessments_data if a.user_id_id in filtered_user_ids
-        ]
-        filtered_reports_data=[
-            r for r in reports_data if r.user_id in filtered_user_ids
-        ]
-    else:
-        filtered_students = students
-        filtered_user_profiles_map = user_profiles_map
-        filtered_feedback_responses = feedback_responses
-        filtered_user_course_batch_map = user_course_batch_map
-        filtered_activity_data = activity_data
-        filtered_meetings_data = meetings_data
-        filtered_assessments_data = assessments_data
-        filtered_reports_data=reports_data
+    def is_test_user(user_id):
+        # Only rows of students with a non test email make it to the sheet without test users
+        email = email_map.get(user_id)
+        return email is None or email in excluded_emails
+
+    user_ids = list(email_map)
+    user_profiles = UserProfileRepository.get_all_profiles_for_user_ids(user_ids)
 
     return {
-        'students': students,
-        'user_profiles_map': user_profiles_map,
-        'course_map': course_map,
-        'batch_map': batch_map,
+        'user_profiles_map': {profile.user_id_id: profile for profile in user_profiles},
+        'batches': BatchRepository.get_all_batches_with_student_count(),
         'user_course_batch_map': user_course_batch_map,
-        'activity_data': activity_data,
-        'meetings_data': meetings_data,
-        'assessments_data': assessments_data,
-        'course_providers_data': course_providers_data,
-        'feedback_responses': feedback_responses,
-        'reports_data':reports_data,
-
-        # Filtered values
-        'filtered_students': filtered_students,
-        'filtered_user_profiles_map': filtered_user_profiles_map,
-        'filtered_feedback_responses': filtered_feedback_responses,
-        'filtered_user_course_batch_map': filtered_user_course_batch_map,
-        'filtered_activity_data': filtered_activity_data,
-        'filtered_meetings_data': filtered_meetings_data,
-        'filtered_assessments_data': filtered_assessments_data,
-        'filtered_reports_data':filtered_reports_data
+        'activity_data': DailyAggregationRepository.get_aggregations_by_date(date),
+        'meetings_data': AttendaceRecordRepository.get_attendance_records_by_date(date),
+        'assessments_data': AssessmentAttemptRepository.fetch_assessments_attempts_data_by_date(date),
+        'course_providers_data': CourseProviderRepository.get_all_course_providers(),
+        'feedback_responses': FeedbackResponseRepository.get_feedback_responses_by_user_ids(user_ids),
+        'reports_data': list(UserCourseReportRepository.get_reports_data()),
+        'is_test_user': is_test_user,
     }
 
+
+class ReportSheetRows:
+    """
+    Rows of every report sheet, for the full report and optionally for the report without
+    test users. Each row is built once and shared by both reports.
+    """
+
+    def __init__(self, is_test_user=None):
+        self.is_test_user = is_test_user
+        self.rows = {}
+        self.rows_without_test_users = {}
+
+    def extend(self, sheet_name, user_rows):
+        """
+        Collects (user_id, row) pairs, rows without a user go to both reports
+        """
+        rows = self.rows.setdefault(sheet_name, [])
+        rows_without_test_users = self.rows_without_test_users.setdefault(sheet_name, [])
+        for user_id, row in user_rows:
+            rows.append(row)
+            if self.is_test_user and (user_id is None or not self.is_test_user(user_id)):
+                rows_without_test_users.append(row)
+
+
 def populate_course_provider_sheet(data):
-    course_providersdata=data['course_providers_data']
-    final_data=[]
-    for data in course_providersdata:
-        final_data.append({'CourseProviderId':data.id,'CourseProviderName':data.name})
-    return final_data
+    for course_provider in data['course_providers_data']:
+        yield None, {'CourseProviderId':course_provider.id,'CourseProviderName':course_provider.name}
 
 # Function for Sheet 1 - Populate user data
 def populate_lms_users_reporting_data(data):
-    student_data = []
     for user_id, user_profile in data['user_profiles_map'].items():
         user = user_profile.user_id
         # Get list of course info for this user
@@ -161,7 +128,7 @@ def populate_lms_users_reporting_data(data):
                     "Batch ID": course_info.get("batch_id"),
                     "Enrollment DateTIme": course_info.get("enrolled date")
                 })
-                student_data.append(entry)
+                yield user.id, entry
         else:
             # If no courses, add entry with None for course fields
             entry = base_user_info.copy()
@@ -172,26 +139,21 @@ def populate_lms_users_reporting_data(data):
                 "Course Provider ID":None,
                 "Enrolled Date": None
             })
-            student_data.append(entry)
-
-    return student_data
+            yield user.id, entry
 
 
 def populate_lms_batch_reporting_data(data):
-    batch_data = []
-    for batch_id, batch in data['batch_map'].items():
-        batch_data.append({
+    for batch in data['batches']:
+        yield None, {
             "Batch ID": batch.id,
             "Course ID": batch.course_id,
             "Course Provider ID":batch.course.course_provider_id,
             "Course Name": batch.course.title,
             "Start Date": batch.created_at.date(),
-            "Number of Students": len(batch.students)
-        })
-    return batch_data
+            "Number of Students": batch.student_count
+        }
 
 def populate_AFH_reporting_data(data):
-    profile_data = []
     for user_id, user_profile in data['user_profiles_map'].items():
         user = user_profile.user_id
         dob_value = UserProfileRepository.fetch_value_from_form('dob', user_profile.user_data)
@@ -241,7 +203,7 @@ def populate_AFH_reporting_data(data):
                     "Batch ID": course_info.get("batch_id"),
                     "Enrollment Date (DD/MM/YY)":  course_info.get("enrolled date").date().strftime("%d/%m/%y")
                 })
-                profile_data.append(entry)
+                yield user.id, entry
 
         else:
             # If no courses, add entry with None for course fields
@@ -253,20 +215,15 @@ def populate_AFH_reporting_data(data):
                 "Batch ID": None,
                 "Enrollment Date (DD/MM/YY)": None
             })
-            profile_data.append(entry)
-
-
-    return profile_data
+            yield user.id, entry
 
 def populate_course_provider_reporting_data(data):
-    final_data = []
-    reports_data=data['reports_data']
-    for report in reports_data:
+    for report in data['reports_data']:
         user_profile = data['user_profiles_map'].get(report.user_id)
         course_info_list = data['user_course_batch_map'].get(report.user_id, [])
         course_info =  next((info for info in course_info_list if info['course_id'] == report.course_id), {})
         user = report.user  # User object is accessible directly from the report
-        final_data.append({
+        yield user.id, {
             'Student ID': user.id,
             'First Name': user.first_name,  # From User model
             'Last Name': user.last_name,  # From User model
@@ -290,19 +247,15 @@ def populate_course_provider_reporting_data(data):
             'Number of classes attended': report.classes_attended,
             'Number of classes missed': report.total_classes - report.classes_attended,
             'Attendance %': (report.classes_attended / (report.classes_attended + (report.total_classes - report.classes_attended))) * 100 if report.total_classes else 0
-        })
-    return final_data
+        }
 
 def populate_lms_time_spent_reporting_data(data):
-    final_data = []
-    reports_data = data['reports_data']
-
-    for report in reports_data:
+    for report in data['reports_data']:
         user_profile = data['user_profiles_map'].get(report.user_id)
         course_info_list = data['user_course_batch_map'].get(report.user_id, [])
         course_info =  next((info for info in course_info_list if info['course_id'] == report.course_id), {})
         user = report.user  # User object is accessible directly from the report
-        final_data.append({
+        yield user.id, {
             'Student ID': user.id,
             "Email": user.email,
             "Phone Number": user_profile.phone if user_profile.phone else UserProfileRepository.fetch_value_from_form('Phone', user_profile.user_data),  # From UserProfile
@@ -317,18 +270,14 @@ def populate_lms_time_spent_reporting_data(data):
             'Total Learning Time (in mins)': round(report.total_time_spent.total_seconds()/60),
             'Number of classes attended': report.classes_attended,
             'Number of classes missed': report.total_classes - report.classes_attended
-        })
-    return final_data
+        }
 
 def populate_lms_activity_logs_data(data):
-    activities=data['activity_data']
     user_course_batch_map=data['user_course_batch_map']
-    final_data=[]
-    
-    for activity in activities:
+    for activity in data['activity_data'].iterator():
         user_course_data=next((entry for entry in user_course_batch_map.get(activity.user_id, []) if entry['course_id'] == activity.course_id), None)
         batch_id=user_course_data.get('batch_id') if user_course_data else None
-        final_data.append({
+        yield activity.user_id, {
             'Student ID':activity.user_id,
             'Batch ID': batch_id,
             'Resource ID': activity.reference_id,
@@ -336,30 +285,25 @@ def populate_lms_activity_logs_data(data):
             'Resource Type':activity.type_of_aggregation,
             'Accessed On':activity.date,
             'Duration':activity.time_spent
-            
-        })
-    return final_data
+        }
 
 def populate_lms_live_classes_logs_data(data):
-    meetings_data=data['meetings_data']
-    final_data=[]
-    for record in meetings_data:
+    for record in data['meetings_data']:
         meeting = record.meeting 
         series = meeting.series
-        final_data.append({
+        # Allocations are prefetched, first() would query them again
+        first_allocation = min(series.course_enrollments.all(), key=lambda allocation: allocation.id)
+        yield record.user_id_id, {
             'Student ID': record.user_id_id,
-            'Batch ID':series.course_enrollments.first().batch_id, 
+            'Batch ID':first_allocation.batch_id, 
             'Class ID':meeting.id,
             'Date Time':meeting.start_time,
             'Class Duration':meeting.duration,
             'Attendance':record.attendance
-        })
-    return final_data
+        }
 
 def populate_lms_assessments_logs_data(data):
-    assessments_data = data['assessments_data']
-    final_data = []
-    for record in assessments_data:
+    for record in data['assessments_data'].iterator():
         # Get the assessment type
         assessment_type = record.assessment_generation_config_id.assessment_type
         # Initialize the grade/score and comments
@@ -389,8 +333,7 @@ def populate_lms_assessments_logs_data(data):
                 # Use the total score for quantitative assessments
                 grade_or_score = percentage
         
-        # Append the final data for each record
-        final_data.append({
+        yield record.user_id_id, {
             'Student ID': record.user_id_id,
             'Assessment ID': record.assessment_id,
             'DateTime': record.updated_at,
@@ -400,14 +343,10 @@ def populate_lms_assessments_logs_data(data):
             'Max Score':max_score,
             'Report Link': None,
             'Comments': comments
-        })
-    return final_data
+        }
 
 def populate_lms_feedback_responses_data(data):
-    
-    final_data = []
-    feedback_responses=data['feedback_responses']
-    for response in feedback_responses:
+    for response in data['feedback_responses'].iterator():
         user_profile = data['user_profiles_map'].get(response.user_id)
         user = user_profile.user_id if user_profile else None
         
@@ -426,96 +365,41 @@ def populate_lms_feedback_responses_data(data):
                 value = field.get('value', '')
                 if label:  # Only add if label exists
                     response_data[label] = value
-        
-        final_data.append(response_data)
-    
-    return final_data
+
+        yield response.user_id, response_data
     
 def report_sheet_generator():
     # Fetch all data once
     all_data = fetch_all_required_data()
-
-    # Call functions to populate data for each sheet
-    # Populate data for each reporting type
-    lms_course_provider_data=populate_course_provider_sheet(all_data)
-    lms_users_reporting_data = populate_lms_users_reporting_data(all_data)
-    lms_batch_reporting_data = populate_lms_batch_reporting_data(all_data)
-    afh_reporting_data = populate_AFH_reporting_data(all_data)
-    course_provider_reporting_data = populate_course_provider_reporting_data(all_data)
-    lms_time_spent_reporting_data = populate_lms_time_spent_reporting_data(all_data)
-    lms_activity_logs_data = populate_lms_activity_logs_data(all_data)
-    lms_live_class_logs_data = populate_lms_live_classes_logs_data(all_data)  # Assuming you have this function
-    lms_assessment_logs_data = populate_lms_assessments_logs_data(all_data)  # Assuming you have this function
-    lms_feedback_data=populate_lms_feedback_responses_data(all_data)
-
-    # Initialize GDWrapper
-    gd_wrapper = GDWrapper(speadsheet_id=settings.REPORT_SPEADSHEET_ID)
-
-    # Update the Google Sheets with the populated data
-    gd_wrapper.smart_update_sheet('LMS Course Providers', lms_course_provider_data,key_fields=['CourseProviderId','CourseProviderName'])
-    gd_wrapper.update_sheet('LMS Users Reporting', lms_users_reporting_data)
-    gd_wrapper.update_sheet('LMS Batch Reporting', lms_batch_reporting_data)
-    gd_wrapper.update_sheet('AFH Reporting', afh_reporting_data)
-    gd_wrapper.update_sheet('Course Provider Reporting', course_provider_reporting_data)
-    gd_wrapper.update_sheet('LMS Time Spent Reporting', lms_time_spent_reporting_data)
-    gd_wrapper.append_to_sheet('LMS Activity Logs', lms_activity_logs_data)
-    gd_wrapper.append_to_sheet('LMS Live Class Logs', lms_live_class_logs_data)
-    gd_wrapper.append_to_sheet('LMS Assessment Logs', lms_assessment_logs_data)
-    gd_wrapper.update_sheet('LMS Feedback',lms_feedback_data)
-    if settings.DEPLOYMENT_TYPE == "ECF":
+    is_ecf = settings.DEPLOYMENT_TYPE == "ECF"
+
+    # Populate the rows of both reports in a single traversal of the data
+    sheet_rows = ReportSheetRows(is_test_user=all_data['is_test_user'] if is_ecf else None)
+    sheet_rows.extend('LMS Course Providers', populate_course_provider_sheet(all_data))
+    sheet_rows.extend('LMS Users Reporting', populate_lms_users_reporting_data(all_data))
+    sheet_rows.extend('LMS Batch Reporting', populate_lms_batch_reporting_data(all_data))
+    sheet_rows.extend('AFH Reporting', populate_AFH_reporting_data(all_data))
+    sheet_rows.extend('Course Provider Reporting', populate_course_provider_reporting_data(all_data))
+    sheet_rows.extend('LMS Time Spent Reporting', populate_lms_time_spent_reporting_data(all_data))
+    sheet_rows.extend('LMS Activity Logs', populate_lms_activity_logs_data(all_data))
+    sheet_rows.extend('LMS Live Class Logs', populate_lms_live_classes_logs_data(all_data))
+    sheet_rows.extend('LMS Assessment Logs', populate_lms_assessments_logs_data(all_data))
+    sheet_rows.extend('LMS Feedback', populate_lms_feedback_responses_data(all_data))
+
+    if is_ecf:
         new_spreadsheet_name = (
             f"ORBIT/ECF LMS Reporting - {Utils.format_datetime(datetime.utcnow())}"
         )
-        generate_sheet_without_test_users(all_data)
     else:
         new_spreadsheet_name = (
             f"LMS Reporting - {Utils.format_datetime(datetime.utcnow())}"
         )
-    gd_wrapper.rename_spreadsheet(new_spreadsheet_name)
-
+    upload_report_sheets(settings.REPORT_SPEADSHEET_ID, sheet_rows.rows, new_spreadsheet_name)
+    if is_ecf:
+        generate_sheet_without_test_users(sheet_rows.rows_without_test_users)
 
 
-def generate_sheet_without_test_users(all_data):
-    filtered_data={
-        'students': all_data.get('filtered_students',[]),
-        'user_profiles_map': all_data.get('filtered_user_profiles_map',{}),
-        'course_map': all_data.get('course_map',{}),
-        'batch_map': all_data.get('batch_map',{}),
-        'user_course_batch_map': all_data.get('filtered_user_course_batch_map',{}),
-        'activity_data': all_data.get('filtered_activity_data',[]),
-        'meetings_data': all_data.get('filtered_meetings_data',[]),
-        'assessments_data': all_data.get('filtered_assessments_data',[]),
-        'course_providers_data': all_data.get('course_providers_data',[]),
-        'feedback_responses': all_data.get('filtered_feedback_responses',[]),
-        'reports_data':all_data.get('filtered_reports_data',[]),
-    }    
-    # Call functions to populate data for each sheet
-    # Populate data for each reporting type
-    lms_course_provider_data=populate_course_provider_sheet(filtered_data)
-    lms_users_reporting_data = populate_lms_users_reporting_data(filtered_data)
-    lms_batch_reporting_data = populate_lms_batch_reporting_data(filtered_data)
-    afh_reporting_data = populate_AFH_reporting_data(filtered_data)
-    course_provider_reporting_data = populate_course_provider_reporting_data(filtered_data)
-    lms_time_spent_reporting_data = populate_lms_time_spent_reporting_data(filtered_data)
-    lms_activity_logs_data = populate_lms_activity_logs_data(filtered_data)
-    lms_live_class_logs_data = populate_lms_live_classes_logs_data(filtered_data)  # Assuming you have this function
-    lms_assessment_logs_data = populate_lms_assessments_logs_data(filtered_data)  # Assuming you have this function
-    lms_feedback_data=populate_lms_feedback_responses_data(filtered_data)
-
-    # Initialize GDWrapper
-    gd_wrapper = GDWrapper(speadsheet_id=settings.REPORT_SPEADSHEET_ID_WITHOUT_TEST_EMAILS)
-
-    # Update the Google Sheets with the populated data
-    gd_wrapper.smart_update_sheet('LMS Course Providers', lms_course_provider_data,key_fields=['CourseProviderId','CourseProviderName'])
-    gd_wrapper.update_sheet('LMS Users Reporting', lms_users_reporting_data)
-    gd_wrapper.update_sheet('LMS Batch Reporting', lms_batch_reporting_data)
-    gd_wrapper.update_sheet('AFH Reporting', afh_reporting_data)
-    gd_wrapper.update_sheet('Course Provider Reporting', course_provider_reporting_data)
-    gd_wrapper.update_sheet('LMS Time Spent Reporting', lms_time_spent_reporting_data)
-    gd_wrapper.append_to_sheet('LMS Activity Logs', lms_activity_logs_data)
-    gd_wrapper.append_to_sheet('LMS Live Class Logs', lms_live_class_logs_data)
-    gd_wrapper.append_to_sheet('LMS Assessment Logs', lms_assessment_logs_data)
-    gd_wrapper.update_sheet('LMS Feedback',lms_feedback_data)
+def generate_sheet_without_test_users(rows):
     if settings.DEPLOYMENT_TYPE == "ECF":
         new_spreadsheet_name = (
             f"ORBIT/ECF LMS Reporting (WITHOUT TEST USERS) - {Utils.format_datetime(datetime.utcnow())}"
@@ -524,4 +408,23 @@ def generate_sheet_without_test_users(all_data):
         new_spreadsheet_name = (
             f"LMS Reporting (WITHOUT TEST USERS) - {Utils.format_datetime(datetime.utcnow())}"
         )
-    gd_wrapper.rename_spreadsheet(new_spreadsheet_name)
\ No newline at end of file
+    upload_report_sheets(settings.REPORT_SPEADSHEET_ID_WITHOUT_TEST_EMAILS, rows, new_spreadsheet_name)
+
+
+def upload_report_sheets(spreadsheet_id, rows, new_spreadsheet_name):
+    # Initialize GDWrapper
+    gd_wrapper = GDWrapper(speadsheet_id=spreadsheet_id)
+
+    # Update the Google Sheets with the populated data
+    gd_wrapper.smart_update_sheet('LMS Course Providers', rows['LMS Course Providers'],key_fields=['CourseProviderId','CourseProviderName'])
+    # Only changed and new rows are written, the sheet is rewritten when rows are gone from the data
+    gd_wrapper.sync_sheet('LMS Users Reporting', rows['LMS Users Reporting'], key_fields=['StudentID', 'Batch ID'], keep_missing_rows=False)
+    gd_wrapper.sync_sheet('LMS Batch Reporting', rows['LMS Batch Reporting'], key_fields=['Batch ID'], keep_missing_rows=False)
+    gd_wrapper.sync_sheet('AFH Reporting', rows['AFH Reporting'], key_fields=['Email ID', 'Batch ID'], keep_missing_rows=False)
+    gd_wrapper.sync_sheet('Course Provider Reporting', rows['Course Provider Reporting'], key_fields=['Student ID', 'Course Name', 'Batch ID'], keep_missing_rows=False)
+    gd_wrapper.sync_sheet('LMS Time Spent Reporting', rows['LMS Time Spent Reporting'], key_fields=['Student ID', 'Course ID', 'Batch ID'], keep_missing_rows=False)
+    gd_wrapper.append_to_sheet('LMS Activity Logs', rows['LMS Activity Logs'])
+    gd_wrapper.append_to_sheet('LMS Live Class Logs', rows['LMS Live Class Logs'])
+    gd_wrapper.append_to_sheet('LMS Assessment Logs', rows['LMS Assessment Logs'])
+    gd_wrapper.sync_sheet('LMS Feedback', rows['LMS Feedback'], key_fields=['Student ID', 'Batch ID', 'Submitted Date'], keep_missing_rows=False)
+    gd_wrapper.rename_spreadsheet(new_spreadsheet_name)
@@ -37,6 +37,15 @@ class UserCourseReport(models.Model):
         ]
         
         
+class ReportingWatermark(models.Model):
+    """
+    High-water mark up to which source rows have been folded into the reports by an incremental job
+    """
+    name = models.CharField(max_length=100, unique=True)
+    processed_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+
 class DailyAggregation(models.Model):
     """
     Stores daily aggregation of time spent by a user on different types of fields
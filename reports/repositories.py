@@ -1,4 +1,6 @@
-from reports.models import UserCourseReport,DailyAggregation
+from datetime import timedelta
+from django.db.models import Count, Q, Sum
+from reports.models import UserCourseReport,DailyAggregation,ReportingWatermark
 
 class UserCourseReportRepository:
     @staticmethod
@@ -20,11 +22,63 @@ class UserCourseReportRepository:
     
     @staticmethod
     def get_reports_data():
-        return UserCourseReport.objects.all()
+        return UserCourseReport.objects.select_related('user')
     
     @staticmethod
     def get_reports_data_by_user_id(user_id):
         return UserCourseReport.objects.filter(user_id=user_id)
+
+    @staticmethod
+    def bulk_upsert(reports, batch_size):
+        """
+        Inserts the reports, overwriting the existing report of the same user and course
+        """
+        return UserCourseReport.objects.bulk_create(
+            reports,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['user', 'course'],
+            update_fields=[
+                'assessment_time',
+                'resource_time_video',
+                'resource_time_reading',
+                'time_spent_in_live_classes',
+                'time_spent_in_recording_classes',
+                'total_classes',
+                'classes_attended',
+                'total_time_spent',
+                'last_updated',
+            ]
+        )
+
+    @staticmethod
+    def get_reports_for_update(user_ids, course_ids):
+        return UserCourseReport.objects.select_for_update().filter(user_id__in=user_ids, course_id__in=course_ids)
+
+    @staticmethod
+    def get_report_keys(user_ids):
+        """
+        Returns set of (user_id, course_id) of the users having a report
+        """
+        return set(UserCourseReport.objects.filter(user_id__in=user_ids).values_list('user_id', 'course_id'))
+
+    @staticmethod
+    def bulk_create_missing(reports, batch_size):
+        """
+        Inserts the reports, skipping those whose user and course already have a report
+        """
+        return UserCourseReport.objects.bulk_create(reports, batch_size=batch_size, ignore_conflicts=True)
+
+    @staticmethod
+    def bulk_update(reports, fields, batch_size):
+        return UserCourseReport.objects.bulk_update(reports, fields, batch_size=batch_size)
+
+    @staticmethod
+    def set_total_classes_for_batch(batch_id, course_id, total_classes):
+        return UserCourseReport.objects.filter(
+            user__student__batches=batch_id,
+            course_id=course_id
+        ).update(total_classes=total_classes)
     
     
     
@@ -58,9 +112,51 @@ class DailyAggregationRepository:
     def get_aggregations_by_user(user_id,course_id):
         # Fetch all daily aggregations for the specified user, grouped by date
         return DailyAggregation.objects.filter(user_id=user_id,course_id=course_id)
+
+    @staticmethod
+    def get_aggregation_totals_by_users(user_ids):
+        """
+        Total time spent per user, course and type of aggregation, along with the number of aggregations
+        with non zero time spent (attended live classes).
+        """
+        return DailyAggregation.objects.filter(
+            user_id__in=user_ids
+        ).values(
+            'user_id', 'course_id', 'type_of_aggregation'
+        ).annotate(
+            total_time_spent=Sum('time_spent'),
+            non_zero_count=Count('id', filter=~Q(time_spent=timedelta(0)))
+        ).order_by()
+
+    @staticmethod
+    def get_aggregations_for_update(user_ids, types_of_aggregation, reference_ids):
+        return DailyAggregation.objects.select_for_update().filter(
+            user_id__in=user_ids,
+            type_of_aggregation__in=types_of_aggregation,
+            reference_id__in=reference_ids
+        ).order_by('date')
+
+    @staticmethod
+    def bulk_create_daily_aggregations(aggregations, batch_size):
+        return DailyAggregation.objects.bulk_create(aggregations, batch_size=batch_size)
+
+    @staticmethod
+    def bulk_update_daily_aggregations(aggregations, batch_size):
+        return DailyAggregation.objects.bulk_update(aggregations, ['time_spent', 'resource_name'], batch_size=batch_size)
     
     def get_aggregations_by_date(date):
         return DailyAggregation.objects.filter(date=date)
     
     def get_all_aggregations_data():
-        return DailyAggregation.objects.all()
\ No newline at end of file
+        return DailyAggregation.objects.all()
+
+
+class ReportingWatermarkRepository:
+    @staticmethod
+    def get_processed_until(name):
+        watermark = ReportingWatermark.objects.filter(name=name).first()
+        return watermark.processed_until if watermark else None
+
+    @staticmethod
+    def set_processed_until(name, processed_until):
+        ReportingWatermark.objects.update_or_create(name=name, defaults={'processed_until': processed_until})
@@ -1,11 +1,12 @@
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
 import logging
 
 from reports.management.generate_report_sheet.report_sheet_generator import report_sheet_generator
-from .usecases import GenerateUserCourseReportsUseCase,DailyAggregationUsecase
+from .usecases import BulkReportingUsecase,IncrementalReportingUsecase,chunked
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 logger = logging.getLogger(__name__)  # Setup logger
 User = get_user_model()
@@ -14,32 +15,55 @@ User = get_user_model()
 def generate_report_sheet():
     report_sheet_generator()
 
-@shared_task(queue='reporting_queue') 
-def process_reports():
-    student_users=User.objects.filter(is_student=True)
-    for user in student_users:
-        generate_student_report.delay(user.id)
+def _get_student_id_chunks():
+    student_ids = User.objects.filter(is_student=True).order_by('id').values_list('id', flat=True)
+    return chunked(student_ids.iterator(), settings.REPORTS_BULK_CHUNK_SIZE)
 
 @shared_task(queue='reporting_queue') 
-def generate_student_report(user_id):
+def process_reports():
+    # Time spent and attendance are applied to the reports incrementally by process_aggregation, which only creates
+    # the reports of students with activity. Enrolled students without any get an empty report here.
     current_date = datetime.now().date()
-    GenerateUserCourseReportsUseCase.generate_report(user_id)
-    logger.info(f"started daily report creation for user {user_id}")
-    
+    created_count = 0
+    for student_ids in _get_student_id_chunks():
+        created_count += IncrementalReportingUsecase.create_missing_reports(student_ids, current_date)
+    logger.info(f"created {created_count} missing course reports")
+    count = IncrementalReportingUsecase.refresh_total_classes(current_date)
+    logger.info(f"refreshed total classes of reports for {count} batches")
 
 @shared_task(queue='reporting_queue')
-def process_aggregation():
-    student_users=User.objects.filter(is_student=True)
+def rebuild_reports():
+    """
+    Recomputes all reports from the stored daily aggregations, for reconciliation. Seeds the reporting watermarks
+    once every chunk is done, so it is also the first step of incremental reporting (see process_aggregation).
+    """
+    rebuilt_at = timezone.now()
     current_date = datetime.now().date()
-    for user in student_users:
-        generate_user_activites_aggregation.delay(user.id,current_date)
+    header = [
+        generate_student_reports_bulk.si(student_ids, current_date.isoformat())
+        for student_ids in _get_student_id_chunks()
+    ]
+    if not header:
+        seed_reporting_watermarks(rebuilt_at.isoformat())
+        return
+    chord(header)(seed_reporting_watermarks.si(rebuilt_at.isoformat()))
 
-@shared_task(queue='reporting_queue') 
-def generate_user_activites_aggregation(user_id,current_date):
-    DailyAggregationUsecase.create_daily_aggregation_entries_for_user(user_id,current_date)
-    
+@shared_task(queue='reporting_queue')
+def seed_reporting_watermarks(rebuilt_at):
+    IncrementalReportingUsecase.seed_watermarks(datetime.fromisoformat(rebuilt_at))
+    logger.info(f"seeded reporting watermarks from the rebuild started at {rebuilt_at}")
 
+@shared_task(queue='reporting_queue')
+def generate_student_reports_bulk(student_ids, current_date):
+    count = BulkReportingUsecase.generate_reports(student_ids, date.fromisoformat(current_date))
+    logger.info(f"generated {count} course reports for {len(student_ids)} students")
 
-    
-    
-    
+@shared_task(queue='reporting_queue')
+def process_aggregation():
+    if not IncrementalReportingUsecase.is_seeded():
+        # Deltas are applied on top of the report totals, which have to be rebuilt once before the first run
+        logger.warning("reporting watermark is not seeded, rebuilding reports instead of applying changes")
+        rebuild_reports.delay()
+        return
+    count = IncrementalReportingUsecase.process_changes()
+    logger.info(f"applied {count} changed daily aggregations to reports")
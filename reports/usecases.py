@@ -1,178 +1,426 @@
 # reports/usecases/generate_user_course_reports.py
 
+from collections import defaultdict
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from accounts.repositories import StudentRepository
 from evaluation.repositories import AssessmentAttemptRepository
 from meetings.repositories import AttendaceRecordRepository, MeetingRepository
 from events_logger.repositories import PageEventRepository
-from .repositories import UserCourseReportRepository, DailyAggregationRepository
+from .models import DailyAggregation, UserCourseReport
+from .repositories import UserCourseReportRepository, DailyAggregationRepository, ReportingWatermarkRepository
 from evaluation.repositories import AssessmentAttemptRepository
 from meetings.repositories import AttendaceRecordRepository
 from events_logger.repositories import PageEventRepository
 
 User = get_user_model()
 
-class GenerateUserCourseReportsUseCase:
+class BulkReportingUsecase:
+    """
+    Computes UserCourseReport entries for a whole chunk of students at once from their DailyAggregation totals,
+    with a handful of grouped queries per chunk instead of a set of queries per student and course.
+    """
+
     @staticmethod
-    def generate_report(user_id):
+    def get_student_course_batches(memberships):
         """
-        Generate or update UserCourseReport records for all courses associated with a user.
-        
-        Args:
-            user_id: The ID of the user to generate reports for
-            
-        Returns:
-            list: List of (UserCourseReport object, created boolean) tuples
+        Returns user_id -> {course_id: batch_id} from (student_id, batch_id, course_id) batch memberships
         """
-        user = User.objects.get(id=user_id)
-        date=datetime.now().date()
+        student_course_batches = defaultdict(dict)
+        for user_id, batch_id, course_id in memberships:
+            student_course_batches[user_id][course_id] = batch_id
+        return student_course_batches
+
+    @staticmethod
+    def generate_reports(user_ids, date):
+        student_course_batches = BulkReportingUsecase.get_student_course_batches(
+            StudentRepository.get_batch_memberships_by_student_ids(user_ids)
+        )
+        batch_ids = {batch_id for course_batches in student_course_batches.values() for batch_id in course_batches.values()}
+        meetings_by_batch = MeetingRepository.get_no_of_meetings_occured_by_batch(batch_ids, date)
+
+        totals = defaultdict(dict)
+        for row in DailyAggregationRepository.get_aggregation_totals_by_users(user_ids):
+            totals[(row['user_id'], row['course_id'])][row['type_of_aggregation']] = row
+
         reports = []
+        for user_id, course_batches in student_course_batches.items():
+            for course_id, batch_id in course_batches.items():
+                reports.append(
+                    BulkReportingUsecase._build_course_report(
+                        user_id,
+                        course_id,
+                        totals.get((user_id, course_id), {}),
+                        meetings_by_batch.get(batch_id, 0)
+                    )
+                )
 
-        if not user.is_student:
-            return reports
-
-        courses = GenerateUserCourseReportsUseCase._get_user_courses(user_id)
-        batch_to_course_mapping = GenerateUserCourseReportsUseCase._get_mapping_of_batch_to_course(user_id)
-        print("batch_to_course_mapping",batch_to_course_mapping)
-        for course in courses:
-            batch_id = batch_to_course_mapping.get(course.id)
-            print("batch_id",batch_id,"date",date,"course_id",course.id)
-            no_of_meetings = MeetingRepository.get_no_of_meetings_occured_in_course(course.id,batch_id,date)
-            print("no_of_meetings",no_of_meetings)
-            activites = DailyAggregationRepository.get_aggregations_by_user(user_id,course.id)
-            report=GenerateUserCourseReportsUseCase._create_or_update_course_report(user,activites,course,no_of_meetings)
-            reports.append(report)
-
-        return reports
-
-    def _get_user_courses(user_id):
-        student = StudentRepository.get_student_by_student_id(user_id)
-        if not student:
-            return []
-            
-        batches = student.batches.all()
-        return [batch.course for batch in batches]
-    
-    def _get_mapping_of_batch_to_course(user_id):
-        student = StudentRepository.get_student_by_student_id(user_id)
-        if not student:
-            return []
-            
-        batches = student.batches.all()
-        return {batch.course_id:batch.id for batch in batches}
-
-    def _create_or_update_course_report(user, daily_activites,course,no_of_meetings):
-        assessment_time=timedelta(0)
-        resource_reading_time=timedelta(0)
-        resource_video_time=timedelta(0)
-        time_spent_live_classes=timedelta(0)
-        time_spent_recording_classes=timedelta(0)
-        total_classes=no_of_meetings
-        total_classes_attended=0
-        
-        for activity in daily_activites:
-            if activity.type_of_aggregation=="assessment":
-                assessment_time=assessment_time+activity.time_spent
-            elif activity.type_of_aggregation=="resource_reading":
-                resource_reading_time=resource_reading_time+activity.time_spent
-            elif activity.type_of_aggregation=="resource_video":
-                resource_video_time=resource_video_time+activity.time_spent
-            elif activity.type_of_aggregation=="live_class":
-                if activity.time_spent != timedelta(0):
-                    #Here time zero means that the class was not attended hence we are not counting it for attendance
-                    time_spent_live_classes=time_spent_live_classes+activity.time_spent
-                    total_classes_attended+=1;
-                else:
-                    pass
-            elif activity.type_of_aggregation=="resource_recording":
-                time_spent_recording_classes=time_spent_recording_classes+activity.time_spent
-                    
-            
-
-        defaults = {
-            'assessment_time': assessment_time,
-            'resource_time_reading': resource_reading_time,
-            'resource_time_video':resource_video_time,
-            'total_classes': total_classes,
-            'classes_attended': total_classes_attended,
-            'time_spent_in_live_classes':time_spent_live_classes,
-            'time_spent_in_recording_classes':time_spent_recording_classes,
-            'total_time_spent': time_spent_live_classes + resource_reading_time+resource_video_time+time_spent_recording_classes+assessment_time
-        }
+        UserCourseReportRepository.bulk_upsert(reports, batch_size=settings.REPORTS_BULK_WRITE_BATCH_SIZE)
+        return len(reports)
+
+    @staticmethod
+    def _build_course_report(user_id, course_id, totals, no_of_meetings):
+        def time_spent(type_of_aggregation):
+            row = totals.get(type_of_aggregation)
+            return row['total_time_spent'] if row and row['total_time_spent'] else timedelta(0)
+
+        live_class = totals.get('live_class')
+        assessment_time = time_spent('assessment')
+        resource_reading_time = time_spent('resource_reading')
+        resource_video_time = time_spent('resource_video')
+        time_spent_live_classes = time_spent('live_class')
+        time_spent_recording_classes = time_spent('resource_recording')
 
-        return UserCourseReportRepository.get_or_create(
-            user_id=user.id,
-            course=course,
-            defaults=defaults
+        return UserCourseReport(
+            user_id=user_id,
+            course_id=course_id,
+            assessment_time=assessment_time,
+            resource_time_reading=resource_reading_time,
+            resource_time_video=resource_video_time,
+            total_classes=no_of_meetings,
+            classes_attended=live_class['non_zero_count'] if live_class else 0,
+            time_spent_in_live_classes=time_spent_live_classes,
+            time_spent_in_recording_classes=time_spent_recording_classes,
+            total_time_spent=time_spent_live_classes + resource_reading_time + resource_video_time
+            + time_spent_recording_classes + assessment_time
         )
 
 
-class DailyAggregationUsecase:
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class IncrementalReportingUsecase:
+    """
+    Keeps DailyAggregation and UserCourseReport up to date by processing only the PageEvent, AttendanceRecord and
+    AssessmentAttempt rows changed since the last run (tracked by a ReportingWatermark).
+
+    Every changed source row is turned into its DailyAggregation, and the difference to the aggregation stored
+    before is applied to the running totals of the UserCourseReport. Since deltas are computed against the stored
+    aggregations, processing a row twice is a no-op, which lets each run overlap the previous one by
+    REPORTS_WATERMARK_OVERLAP_SECONDS to pick up rows committed late.
+    """
+
+    AGGREGATIONS_WATERMARK = 'daily_aggregations'
+    TOTAL_CLASSES_WATERMARK = 'total_classes'
+
+    REPORT_FIELD_BY_TYPE = {
+        'assessment': 'assessment_time',
+        'resource_reading': 'resource_time_reading',
+        'resource_video': 'resource_time_video',
+        'live_class': 'time_spent_in_live_classes',
+        'resource_recording': 'time_spent_in_recording_classes',
+    }
+
     @staticmethod
-    def create_daily_aggregation_entries_for_user(user_id, date):
-        courses = GenerateUserCourseReportsUseCase._get_user_courses(user_id)
+    def is_seeded():
+        return ReportingWatermarkRepository.get_processed_until(
+            IncrementalReportingUsecase.AGGREGATIONS_WATERMARK
+        ) is not None
 
-        for course in courses:
-            DailyAggregationUsecase._aggregate_assessments(user_id, course.id, date)
-            DailyAggregationUsecase._aggregate_meetings(user_id, course.id, date)
-            DailyAggregationUsecase._aggregate_resources(user_id, course.id, date)
+    @staticmethod
+    def seed_watermarks(rebuilt_at):
+        """
+        Called once every report was recomputed from the stored daily aggregations (rebuild_reports), which is what
+        the deltas of incremental runs are applied on. The first incremental run re-reads the rows changed during
+        the last REPORTS_WATERMARK_SEED_LOOKBACK_SECONDS, rows already aggregated before are no-ops.
+        """
+        ReportingWatermarkRepository.set_processed_until(
+            IncrementalReportingUsecase.AGGREGATIONS_WATERMARK,
+            rebuilt_at - timedelta(seconds=settings.REPORTS_WATERMARK_SEED_LOOKBACK_SECONDS)
+        )
+        ReportingWatermarkRepository.set_processed_until(
+            IncrementalReportingUsecase.TOTAL_CLASSES_WATERMARK,
+            timezone.make_aware(datetime.combine(timezone.localdate(rebuilt_at), datetime.min.time()))
+        )
 
     @staticmethod
-    def _aggregate_assessments(user_id, course_id, date):
-        attempts = AssessmentAttemptRepository.fetch_daily_assessments_with_time_spent(user_id=user_id, course_id=course_id, date=date)
-        for attempt in attempts:
-            DailyAggregationRepository.get_or_create_daily_aggregation(
-                user_id=user_id,
-                date=date,
-                course_id=course_id,
-                type_of_aggregation='assessment',
-                time_spent=attempt.get('test_duration'),
-                reference_id=attempt.get('assessment_id'),
-                resource_name=attempt.get('assessment_generation_config_id__assessment_display_name')
+    def process_changes():
+        processed_until = ReportingWatermarkRepository.get_processed_until(
+            IncrementalReportingUsecase.AGGREGATIONS_WATERMARK
+        )
+        if processed_until is None:
+            raise ValueError("Reporting watermark is not seeded, run rebuild_reports first")
+        # A run never covers more than REPORTS_WATERMARK_MAX_WINDOW_SECONDS, a backlog is caught up over several runs
+        until = min(timezone.now(), processed_until + timedelta(seconds=settings.REPORTS_WATERMARK_MAX_WINDOW_SECONDS))
+        since = processed_until - timedelta(seconds=settings.REPORTS_WATERMARK_OVERLAP_SECONDS)
+
+        sources = [
+            (
+                PageEventRepository.get_resources_consumption_of_students_updated_between(since, until),
+                'user_id',
+                IncrementalReportingUsecase._get_resource_aggregations,
+            ),
+            (
+                AttendaceRecordRepository.get_attendance_records_of_students_updated_between(since, until),
+                'user_id_id',
+                IncrementalReportingUsecase._get_meeting_aggregations,
+            ),
+            (
+                AssessmentAttemptRepository.fetch_completed_assessments_of_students_updated_between(since, until),
+                'user_id_id',
+                IncrementalReportingUsecase._get_assessment_aggregations,
+            ),
+        ]
+        chunk_size = settings.REPORTS_BULK_CHUNK_SIZE
+        count = 0
+        for rows, user_field, get_aggregations in sources:
+            for chunk in chunked(rows.iterator(chunk_size=chunk_size), chunk_size):
+                user_ids = {row[user_field] for row in chunk}
+                student_course_batches = BulkReportingUsecase.get_student_course_batches(
+                    StudentRepository.get_batch_memberships_by_student_ids(user_ids)
+                )
+                aggregations = get_aggregations(chunk, student_course_batches)
+                count += IncrementalReportingUsecase._apply_aggregations(aggregations, student_course_batches)
+
+        ReportingWatermarkRepository.set_processed_until(IncrementalReportingUsecase.AGGREGATIONS_WATERMARK, until)
+        return count
+
+    @staticmethod
+    def _get_resource_aggregations(rows, student_course_batches):
+        recording_ids = {row['recording_id'] for row in rows if row['recording_id'] is not None}
+        recordings = {}
+        recording_courses = defaultdict(set)
+        if recording_ids:
+            for meeting in MeetingRepository.get_meetings_with_batch_allocations(meeting_ids=recording_ids):
+                recordings[meeting['id']] = meeting['title_override'] or meeting['series__title']
+                recording_courses[meeting['id']].add(meeting['course_id'])
+
+        aggregations = []
+        for row in rows:
+            if row['pdf_id'] is not None:
+                type_of_aggregation, reference_id, resource_name = 'resource_reading', row['pdf_id'], row['pdf__title']
+                course_ids = {row['pdf__course_id']}
+            elif row['video_id'] is not None:
+                type_of_aggregation, reference_id, resource_name = 'resource_video', row['video_id'], row['video__title']
+                course_ids = {row['video__course_id']}
+            elif row['recording_id'] is not None:
+                type_of_aggregation, reference_id = 'resource_recording', row['recording_id']
+                resource_name = recordings.get(reference_id)
+                course_ids = recording_courses.get(reference_id, set())
+            else:
+                raise ValueError("Resource must have either a pdf_id, video_id, or recording_id")
+
+            for course_id in course_ids & student_course_batches.get(row['user_id'], {}).keys():
+                aggregations.append(DailyAggregation(
+                    user_id=row['user_id'],
+                    date=row['date'],
+                    course_id=course_id,
+                    type_of_aggregation=type_of_aggregation,
+                    time_spent=row['time_spent'],
+                    reference_id=reference_id,
+                    resource_name=resource_name
+                ))
+        return aggregations
+
+    @staticmethod
+    def _get_meeting_aggregations(rows, student_course_batches):
+        meetings = {}
+        meeting_courses = defaultdict(set)
+        for meeting in MeetingRepository.get_meetings_with_batch_allocations(meeting_ids={row['meeting_id'] for row in rows}):
+            meetings[meeting['id']] = (
+                meeting['start_date'],
+                meeting['title_override'] or meeting['series__title'],
+                meeting['duration_override'] or meeting['series__duration'],
             )
+            meeting_courses[meeting['id']].add(meeting['course_id'])
+
+        aggregations = []
+        for row in rows:
+            if row['meeting_id'] not in meetings:
+                continue
+            start_date, title, duration = meetings[row['meeting_id']]
+            # Attendance False means the class was not attended
+            time_spent = duration if row['attendance'] else timedelta(0)
+            for course_id in meeting_courses[row['meeting_id']] & student_course_batches.get(row['user_id_id'], {}).keys():
+                aggregations.append(DailyAggregation(
+                    user_id=row['user_id_id'],
+                    date=start_date,
+                    course_id=course_id,
+                    type_of_aggregation='live_class',
+                    time_spent=time_spent,
+                    reference_id=row['meeting_id'],
+                    resource_name=title
+                ))
+        return aggregations
 
     @staticmethod
-    def _aggregate_meetings(user_id, course_id, date):
-        live_classes = AttendaceRecordRepository.get_attended_meetings_for_user_on_day(user_id=user_id, course_id=course_id, date=date)
-        for meeting in live_classes:
-            DailyAggregationRepository.get_or_create_daily_aggregation(
-                user_id=user_id,
-                date=date,
-                course_id=course_id,
-                type_of_aggregation='live_class',
-                time_spent=meeting.get('duration'),
-                reference_id=meeting.get('meeting_id'),
-                resource_name=meeting.get('meeting_title')
-                
+    def _get_assessment_aggregations(rows, student_course_batches):
+        aggregations = []
+        for row in rows:
+            if row['course_id'] not in student_course_batches.get(row['user_id_id'], {}):
+                continue
+            aggregations.append(DailyAggregation(
+                user_id=row['user_id_id'],
+                date=timezone.localdate(row['updated_at']),
+                course_id=row['course_id'],
+                type_of_aggregation='assessment',
+                time_spent=row['test_duration'],
+                reference_id=row['assessment_id'],
+                resource_name=row['assessment_generation_config_id__assessment_display_name']
+            ))
+        return aggregations
+
+    @staticmethod
+    def _get_match_key(aggregation):
+        # Resources get one aggregation per day, meetings and assessments a single one regardless of the date
+        date = aggregation.date if aggregation.type_of_aggregation.startswith('resource') else None
+        return (aggregation.user_id, aggregation.course_id, aggregation.type_of_aggregation, aggregation.reference_id, date)
+
+    @staticmethod
+    def _apply_aggregations(aggregations, student_course_batches):
+        if not aggregations:
+            return 0
+        get_match_key = IncrementalReportingUsecase._get_match_key
+        batch_size = settings.REPORTS_BULK_WRITE_BATCH_SIZE
+
+        with transaction.atomic():
+            existing = {}
+            for aggregation in DailyAggregationRepository.get_aggregations_for_update(
+                {aggregation.user_id for aggregation in aggregations},
+                {aggregation.type_of_aggregation for aggregation in aggregations},
+                {aggregation.reference_id for aggregation in aggregations},
+            ):
+                # Ordered by date, so the latest one is kept if there are several
+                existing[get_match_key(aggregation)] = aggregation
+
+            to_create, to_update = {}, {}
+            time_deltas = defaultdict(lambda: defaultdict(timedelta))
+            attended_deltas = defaultdict(int)
+            for aggregation in aggregations:
+                key = get_match_key(aggregation)
+                stored = existing.get(key)
+                if stored is None:
+                    to_create[key] = aggregation
+                    existing[key] = aggregation
+                    previous_time_spent = timedelta(0)
+                else:
+                    if stored.time_spent == aggregation.time_spent and stored.resource_name == aggregation.resource_name:
+                        continue
+                    previous_time_spent = stored.time_spent
+                    stored.time_spent = aggregation.time_spent
+                    stored.resource_name = aggregation.resource_name
+                    if key not in to_create:
+                        to_update[key] = stored
+
+                report_key = (aggregation.user_id, aggregation.course_id)
+                time_deltas[report_key][aggregation.type_of_aggregation] += aggregation.time_spent - previous_time_spent
+                if aggregation.type_of_aggregation == 'live_class':
+                    # A live class with zero time spent was not attended
+                    attended_deltas[report_key] += (
+                        (aggregation.time_spent != timedelta(0)) - (previous_time_spent != timedelta(0))
+                    )
+
+            DailyAggregationRepository.bulk_create_daily_aggregations(list(to_create.values()), batch_size=batch_size)
+            DailyAggregationRepository.bulk_update_daily_aggregations(list(to_update.values()), batch_size=batch_size)
+            IncrementalReportingUsecase._apply_report_deltas(time_deltas, attended_deltas, student_course_batches)
+
+        return len(to_create) + len(to_update)
+
+    @staticmethod
+    def _get_reports_for_update(report_keys):
+        return {
+            (report.user_id, report.course_id): report
+            for report in UserCourseReportRepository.get_reports_for_update(
+                {user_id for user_id, _ in report_keys}, {course_id for _, course_id in report_keys}
             )
+        }
 
     @staticmethod
-    def _aggregate_resources(user_id, course_id, date):
-        resources = PageEventRepository.get_daily_resources_consumption_by_date_course_user(user_id=user_id, course_id=course_id, date=date)
-        
-        for resource in resources:
-            if resource.pdf_id is not None:
-                type_of_aggregation = 'resource_reading'
-                reference_id = resource.pdf_id
-                resource_name=resource.pdf.title
-            elif resource.video_id is not None:
-                type_of_aggregation = 'resource_video'
-                reference_id = resource.video_id
-                resource_name=resource.video.title
-            elif resource.recording_id is not None:
-                type_of_aggregation = 'resource_recording'
-                reference_id = resource.recording_id
-                resource_name=resource.recording.title
-            else:
-                raise ValueError("Resource must have either a pdf_id, video_id, or recording_id")
+    def _apply_report_deltas(time_deltas, attended_deltas, student_course_batches):
+        if not time_deltas:
+            return
+        reports = IncrementalReportingUsecase._get_reports_for_update(time_deltas)
+        new_report_keys = [key for key in time_deltas if key not in reports]
+        if new_report_keys:
+            # Created empty first, so a report created meanwhile by process_reports gets the deltas too
+            IncrementalReportingUsecase._create_empty_reports(new_report_keys, student_course_batches, timezone.localdate())
+            reports = IncrementalReportingUsecase._get_reports_for_update(time_deltas)
 
-            DailyAggregationRepository.get_or_create_daily_aggregation(
-                user_id=user_id,
-                date=date,
-                course_id=course_id,
-                type_of_aggregation=type_of_aggregation,
-                time_spent=resource.time_spent,
-                reference_id=reference_id,
-                resource_name=resource_name
-            )
\ No newline at end of file
+        now = timezone.now()
+        for (user_id, course_id), report_time_deltas in time_deltas.items():
+            report = reports[(user_id, course_id)]
+            for type_of_aggregation, field in IncrementalReportingUsecase.REPORT_FIELD_BY_TYPE.items():
+                delta = report_time_deltas.get(type_of_aggregation, timedelta(0))
+                setattr(report, field, getattr(report, field) + delta)
+                report.total_time_spent += delta
+            report.classes_attended += attended_deltas.get((user_id, course_id), 0)
+            report.last_updated = now
+
+        UserCourseReportRepository.bulk_update(
+            [report for key, report in reports.items() if key in time_deltas],
+            list(IncrementalReportingUsecase.REPORT_FIELD_BY_TYPE.values())
+            + ['total_time_spent', 'classes_attended', 'last_updated'],
+            batch_size=settings.REPORTS_BULK_WRITE_BATCH_SIZE
+        )
+
+    @staticmethod
+    def create_missing_reports(user_ids, date):
+        """
+        Creates empty reports for the courses the students are enrolled in without a report yet, so students
+        without any activity are reported too. Returns the number of reports created.
+        """
+        student_course_batches = BulkReportingUsecase.get_student_course_batches(
+            StudentRepository.get_batch_memberships_by_student_ids(user_ids)
+        )
+        existing_report_keys = UserCourseReportRepository.get_report_keys(user_ids)
+        missing_report_keys = [
+            (user_id, course_id)
+            for user_id, course_batches in student_course_batches.items()
+            for course_id in course_batches
+            if (user_id, course_id) not in existing_report_keys
+        ]
+        IncrementalReportingUsecase._create_empty_reports(missing_report_keys, student_course_batches, date)
+        return len(missing_report_keys)
+
+    @staticmethod
+    def _create_empty_reports(report_keys, student_course_batches, date):
+        if not report_keys:
+            return
+        meetings_by_batch = MeetingRepository.get_no_of_meetings_occured_by_batch(
+            {student_course_batches[user_id][course_id] for user_id, course_id in report_keys}, date
+        )
+        UserCourseReportRepository.bulk_create_missing(
+            [
+                UserCourseReport(
+                    user_id=user_id,
+                    course_id=course_id,
+                    total_classes=meetings_by_batch.get(student_course_batches[user_id][course_id], 0)
+                )
+                for user_id, course_id in report_keys
+            ],
+            batch_size=settings.REPORTS_BULK_WRITE_BATCH_SIZE
+        )
+
+    @staticmethod
+    def refresh_total_classes(date):
+        """
+        Updates total classes of the reports of batches which had meetings since the last run
+        """
+        processed_until = ReportingWatermarkRepository.get_processed_until(
+            IncrementalReportingUsecase.TOTAL_CLASSES_WATERMARK
+        )
+        batches = list(MeetingRepository.get_batches_with_meetings_between(
+            processed_until.date() if processed_until else None, date
+        ))
+        meetings_by_batch = MeetingRepository.get_no_of_meetings_occured_by_batch(
+            {batch_id for batch_id, _ in batches}, date
+        )
+        for batch_id, course_id in batches:
+            UserCourseReportRepository.set_total_classes_for_batch(batch_id, course_id, meetings_by_batch.get(batch_id, 0))
+
+        ReportingWatermarkRepository.set_processed_until(
+            IncrementalReportingUsecase.TOTAL_CLASSES_WATERMARK,
+            timezone.make_aware(datetime.combine(date, datetime.min.time()))
+        )
+        return len(batches)
@@ -1,4 +1,5 @@
 import datetime
+import os
 
 from django.conf import settings
 
@@ -23,9 +24,15 @@ class AzureStorageService(StorageServiceInterface):
     """
 
     def __init__(self):
+        self.chunk_size = settings.AZURE_STORAGE_CHUNK_SIZE
+        self.max_concurrency = settings.AZURE_STORAGE_MAX_CONCURRENCY
         self.blob_service_client = BlobServiceClient(
             account_url=f"https://{settings.STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
             credential=settings.STORAGE_ACCOUNT_KEY,
+            max_block_size=self.chunk_size,
+            max_single_put_size=self.chunk_size,
+            max_chunk_get_size=self.chunk_size,
+            max_single_get_size=self.chunk_size,
         )
 
     def get_blob_details(self, container_name, blob_name):
@@ -65,9 +72,120 @@ class AzureStorageService(StorageServiceInterface):
         )
         return blob_client.url
 
+    def upload_from_path(
+        self,
+        *,
+        container_name: str,
+        blob_name: str,
+        file_path: str,
+        overwrite=True,
+        content_type=None,
+        max_concurrency=None,
+    ):
+        """
+        Upload a local file to a blob, streaming it in blocks of AZURE_STORAGE_CHUNK_SIZE.
+
+        Parameters:
+            container_name (str): The name of the container.
+            blob_name (str): The name of the blob.
+            file_path (str): Path of the local file to upload.
+            max_concurrency (int, optional): Number of blocks uploaded in parallel.
+
+        Returns:
+            str: The url of the blob.
+        """
+        with open(file_path, "rb") as fil:
+            return self.upload_from_stream(
+                container_name=container_name,
+                blob_name=blob_name,
+                stream=fil,
+                length=os.path.getsize(file_path),
+                overwrite=overwrite,
+                content_type=content_type,
+                max_concurrency=max_concurrency,
+            )
+
+    def upload_from_stream(
+        self,
+        *,
+        container_name: str,
+        blob_name: str,
+        stream,
+        length=None,
+        overwrite=True,
+        content_type=None,
+        max_concurrency=None,
+    ):
+        """
+        Upload a file-like object or an iterable of bytes to a blob as a chunked block upload, without reading it
+        all into memory.
+
+        Parameters:
+            container_name (str): The name of the container.
+            blob_name (str): The name of the blob.
+            stream: File-like object (can be non seekable, e.g. a pipe) or iterable of bytes.
+            length (int, optional): Size of the content, if known.
+            max_concurrency (int, optional): Number of blocks uploaded in parallel.
+
+        Returns:
+            str: The url of the blob.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container_name, blob_name
+        )
+        blob_client.upload_blob(
+            stream,
+            length=length,
+            overwrite=overwrite,
+            content_settings=ContentSettings(content_type=content_type),
+            max_concurrency=max_concurrency or self.max_concurrency,
+        )
+        return blob_client.url
+
     def download_blob(self, *, container_name: str, blob_name: str, file_path: str):
+        self.download_to_path(
+            container_name=container_name, blob_name=blob_name, file_path=file_path
+        )
+
+    def download_to_path(
+        self, *, container_name: str, blob_name: str, file_path: str, max_concurrency=None
+    ):
+        """
+        Download a blob to a local file, streaming it in chunks of AZURE_STORAGE_CHUNK_SIZE.
+
+        Parameters:
+            container_name (str): The name of the container.
+            blob_name (str): The name of the blob.
+            file_path (str): Path of the local file to write to.
+            max_concurrency (int, optional): Number of chunks downloaded in parallel.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container_name, blob_name
+        )
+        download_stream = blob_client.download_blob(
+            max_concurrency=max_concurrency or self.max_concurrency
+        )
         with open(file_path, "wb") as fil:
-            fil.write(self.read_blob(container_name, blob_name))
+            return download_stream.readinto(fil)
+
+    def iter_blob_chunks(self, container_name: str, blob_name: str):
+        """
+        Iterate over the content of a blob in chunks of AZURE_STORAGE_CHUNK_SIZE.
+
+        Parameters:
+            container_name (str): The name of the container.
+            blob_name (str): The name of the blob.
+
+        Yields:
+            bytes: The next chunk of the blob.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container_name, blob_name
+        )
+        yield from blob_client.download_blob().chunks()
 
     def _generate_sas_url(
         self,
@@ -16,6 +16,19 @@ class StorageServiceInterface(ABC):
     def download_blob(self, *, container_name:str, blob_name:str, file_path:str):
         pass
 
+    @abstractmethod
+    def download_to_path(self, *, container_name:str, blob_name:str, file_path:str, max_concurrency=None):
+        pass
+
+    @abstractmethod
+    def upload_from_path(self, *, container_name:str, blob_name:str, file_path:str, overwrite=True,
+                         content_type=None, max_concurrency=None):
+        pass
+
+    @abstractmethod
+    def iter_blob_chunks(self, container_name, blob_name):
+        pass
+
     @abstractmethod
     def generate_blob_access_url(self, container_name, blob_name, expiry_time, allow_read, allow_write):
         pass